@@ -1,7 +1,7 @@
 # accounts/admin.py
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import Profile, PointHistory
+from .models import Profile, PointHistory, RevokedToken
 
 
 # ✅ Profile 관리자 설정
@@ -58,7 +58,18 @@ class PointHistoryAdmin(admin.ModelAdmin):
     autocomplete_fields = ("user", "challenge")  # ForeignKey 검색 편하게
 
 
+# ✅ RevokedToken (로그아웃 폐기 jti) 관리자 설정
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ("jti", "user", "revoked_at", "expires_at")
+    search_fields = ("jti", "user__email")
+    ordering = ("-revoked_at",)
+    readonly_fields = ("revoked_at",)
+    autocomplete_fields = ("user",)
+
+
 # ✅ 관리자 페이지에서 더 깔끔하게 보이도록
 admin.site.site_header = "Challink Admin"
 admin.site.site_title = "Challink Admin"
 admin.site.index_title = "관리자 페이지"
+
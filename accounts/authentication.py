@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import Profile
+from .revocation import revocation_list
+
+# JWT 사용자 캐시 + 폐기 토큰 확인 (accounts.revocation)
+# - 키: 사용자 id, 값: Profile (토큰의 ver 클레임과 token_version이 같을 때만 유효)
+# - Profile 저장/삭제가 커밋되면 무효화 (apply_points로 잔액이 바뀔 때 포함)
+# - 워커별 로컬 캐시면 다른 워커는 TTL 동안 이전 값을 볼 수 있음
+#   → 잔액을 읽거나 바꾸는 뷰는 select_fresh_user로 DB를 직접 읽어야 함
+USER_CACHE_KEY = "auth:user:{user_id}"
+TOKEN_VERSION_CLAIM = "ver"
+
+
+def _cache_ttl():
+    return getattr(settings, "AUTH_USER_CACHE_TTL", 60)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication + 짧은 TTL 사용자 캐시 (인증된 요청마다의 Profile 조회 제거)"""
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        jti = token.get(api_settings.JTI_CLAIM)
+        if jti and revocation_list.is_revoked(jti):
+            raise AuthenticationFailed("Token has been revoked.", code="token_not_valid")
+        return token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return super().get_user(validated_token)  # simplejwt의 에러 응답 그대로
+        version = validated_token.get(TOKEN_VERSION_CLAIM, 0)
+
+        key = USER_CACHE_KEY.format(user_id=user_id)
+        user = cache.get(key)
+        if user is not None and user.token_version == version:
+            user.from_auth_cache = True  # select_fresh_user가 DB를 다시 읽어야 하는지 판단
+        else:
+            user = super().get_user(validated_token)  # 없는/비활성 사용자는 여기서 AuthenticationFailed
+            if user.token_version != version:
+                # 비밀번호 변경 등으로 token_version이 오르면 이전에 발급된 토큰 전부 무효
+                raise AuthenticationFailed("Token has been invalidated.", code="token_not_valid")
+            cache.set(key, user, _cache_ttl())
+        return user
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id=user_id))
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def _invalidate_on_change(sender, instance, **kwargs):
+    # 커밋 후에 삭제: 트랜잭션 중에 지우면 그 사이 다른 요청이 커밋 전 Profile(이전 잔액/token_version)을
+    # 다시 캐시해서 AUTH_USER_CACHE_TTL 동안 남음 (트랜잭션 밖이면 on_commit이 바로 실행)
+    pk = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(pk))
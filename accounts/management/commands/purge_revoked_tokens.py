@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from accounts.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = "Delete revoked-token rows whose JWT has already expired (expired tokens fail signature validation anyway)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--dry-run", action="store_true", help="삭제 대상 건수만 출력하고 지우지 않음")
+
+    def handle(self, *args, **opts):
+        qs = RevokedToken.objects.filter(expires_at__lte=timezone.now())
+        if opts.get("dry_run"):
+            self.stdout.write(self.style.NOTICE(f"Dry run: expired={qs.count()}"))
+            return
+        deleted, _ = qs.delete()
+        # 워커의 Bloom 필터에서는 다음 전체 재구성(REVOCATION_REBUILD_SECONDS) 때 빠짐
+        self.stdout.write(self.style.SUCCESS(f"Done. deleted={deleted}, at={timezone.now()}"))
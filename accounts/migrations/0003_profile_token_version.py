@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="token_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -32,6 +32,7 @@ class Profile(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(unique=True, db_index=True)
     name = models.CharField(max_length=100, blank=True)
     point_balance = models.IntegerField(default=0)  # 현재 포인트 잔액
+    token_version = models.PositiveIntegerField(default=0)  # JWT ver 클레임과 비교, 올리면 기존 토큰 전부 무효
 
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
@@ -55,6 +56,12 @@ class Profile(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return f"{self.name or ''}<{self.email}>"
 
+    def set_password(self, raw_password):
+        super().set_password(raw_password)
+        # 기존 계정의 비밀번호 변경 → 이전에 발급한 토큰 무효화 (accounts.authentication)
+        if self.pk is not None:
+            self.token_version += 1
+
     # 안전한 적립/차감 헬퍼 (정산/참가/충전 시 사용)
     def apply_points(self, delta: int, description: str = "", challenge=None, history_type: str = None):
         """
@@ -114,3 +121,21 @@ class PointHistory(models.Model):
     def __str__(self):
         sign = "+" if self.amount >= 0 else ""
         return f"[{self.get_type_display()}] {sign}{self.amount} → {self.balance_after} ({self.user.email})"
+
+
+class RevokedToken(models.Model):
+    """
+    로그아웃 등으로 폐기된 JWT (jti 기준 denylist)
+    - 인증 경로는 이 테이블이 아니라 메모리 Bloom 필터를 먼저 봄 (accounts.revocation)
+    - 만료된 행은 purge_revoked_tokens로 정리 (만료 토큰은 서명 검증 단계에서 이미 거부)
+    """
+    jti = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey("accounts.Profile", on_delete=models.CASCADE, related_name="revoked_tokens")
+    expires_at = models.DateTimeField(db_index=True)   # 토큰 exp (이후엔 보관할 필요 없음)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)  # 증분 로딩 기준
+
+    class Meta:
+        db_table = "accounts_revoked_token"
+
+    def __str__(self):
+        return f"{self.jti} (user={self.user_id}, exp={self.expires_at})"
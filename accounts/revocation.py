@@ -0,0 +1,128 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken
+
+# JWT 폐기 목록 (로그아웃)
+# - 영속: RevokedToken 테이블 (jti)
+# - 인증 경로: 프로세스 메모리의 Bloom 필터만 확인 → 유효한 토큰은 DB 조회 없음
+#   · 필터 적중(실제 폐기 또는 오탐)일 때만 DB로 확정
+# - 다른 워커에서 폐기된 토큰은 다음 증분 갱신(REVOCATION_REFRESH_SECONDS) 전까지 통과할 수 있음
+#   · 같은 워커에서의 폐기는 즉시 필터에 반영
+# - 전체 재구성(REVOCATION_REBUILD_SECONDS): 만료 행을 빼고 현재 건수에 맞게 필터 크기 재계산
+_REFRESH_OVERLAP = timedelta(seconds=5)  # 커밋 지연/시계 오차로 놓치는 행이 없게 증분 구간을 겹침
+
+
+class BloomFilter:
+    """비트 배열 + 이중 해싱 (blake2b 128비트를 두 64비트 해시로 나눠 k개 위치 생성)"""
+
+    def __init__(self, capacity: int, fp_rate: float):
+        capacity = max(1, int(capacity))
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationList:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._refreshed_at = 0.0   # monotonic
+        self._rebuilt_at = 0.0     # monotonic
+        self._since = None         # 다음 증분 로딩의 revoked_at 하한
+
+    # ── 설정 ──
+    @staticmethod
+    def _fp_rate():
+        return getattr(settings, "REVOCATION_BLOOM_FP_RATE", 0.001)
+
+    @staticmethod
+    def _min_capacity():
+        return getattr(settings, "REVOCATION_BLOOM_MIN_CAPACITY", 10_000)
+
+    # ── 필터 관리 ──
+    def reset(self):
+        """빈 필터를 '방금 로드됨' 상태로 (테스트: DB도 비어 있거나 롤백되는 경우)"""
+        with self._lock:
+            self._filter = BloomFilter(self._min_capacity(), self._fp_rate())
+            self._refreshed_at = self._rebuilt_at = time.monotonic()
+            self._since = timezone.now()
+
+    def rebuild(self):
+        """만료되지 않은 jti 전체로 필터 재구성 (크기는 건수의 2배 이상)"""
+        started = timezone.now()
+        jtis = list(RevokedToken.objects.filter(expires_at__gt=started).values_list("jti", flat=True))
+        bloom = BloomFilter(max(self._min_capacity(), len(jtis) * 2), self._fp_rate())
+        for jti in jtis:
+            bloom.add(jti)
+        with self._lock:
+            self._filter = bloom
+            self._refreshed_at = self._rebuilt_at = time.monotonic()
+            self._since = started - _REFRESH_OVERLAP
+        return bloom
+
+    def _refresh(self):
+        """마지막 로딩 이후 폐기된 jti만 추가"""
+        started = timezone.now()
+        jtis = list(RevokedToken.objects.filter(revoked_at__gte=self._since).values_list("jti", flat=True))
+        with self._lock:
+            for jti in jtis:
+                self._filter.add(jti)
+            self._refreshed_at = time.monotonic()
+            self._since = started - _REFRESH_OVERLAP
+
+    def _current(self):
+        now = time.monotonic()
+        bloom = self._filter
+        if (bloom is None or bloom.count > bloom.capacity
+                or now - self._rebuilt_at >= getattr(settings, "REVOCATION_REBUILD_SECONDS", 600)):
+            return self.rebuild()
+        if now - self._refreshed_at >= getattr(settings, "REVOCATION_REFRESH_SECONDS", 10):
+            self._refresh()
+        return self._filter
+
+    # ── 공개 API ──
+    def is_revoked(self, jti: str) -> bool:
+        if jti not in self._current():
+            return False  # Bloom 필터는 거짓 음성이 없음 → DB 조회 생략
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, token, user) -> None:
+        jti = token.get(api_settings.JTI_CLAIM)
+        if not jti:
+            return
+        expires_at = datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc)
+        # 중복 로그아웃은 무시 (IntegrityError로 요청 트랜잭션을 깨지 않게 INSERT 한 번으로)
+        RevokedToken.objects.bulk_create(
+            [RevokedToken(jti=jti, user=user, expires_at=expires_at)], ignore_conflicts=True,
+        )
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+
+revocation_list = RevocationList()
@@ -5,6 +5,16 @@ from django.db.models import QuerySet
 def is_email_taken(email: str) -> bool:
     return Profile.objects.filter(email=email).exists()   # 이메일 중복 여부 확인
 
+def select_fresh_user(user, *, for_update: bool = False) -> Profile:
+    """
+    캐시된 request.user 대신 DB의 최신 Profile (잔액을 보여주거나 바꾸는 뷰에서 명시적으로 사용)
+    - for_update: 잔액 변경용 행 잠금 (transaction.atomic 안에서)
+    """
+    if not for_update and not getattr(user, "from_auth_cache", False):
+        return user  # 이번 요청에서 이미 DB에서 읽은 인스턴스
+    qs = Profile.objects.select_for_update() if for_update else Profile.objects
+    return qs.get(pk=user.pk)
+
 def select_wallet_history(user, ph_type=None, since=None, until=None, challenge_id=None):
     qs = PointHistory.objects.filter(user=user).order_by("-occurred_at", "-point_history_id")
 
@@ -8,6 +8,7 @@ def authenticate_by_email_password(email: str, password: str) -> Profile | None:
 
 def issue_access_token(user: Profile) -> tuple[str, int]:
     refresh = RefreshToken.for_user(user)
+    refresh["ver"] = user.token_version  # access 토큰으로 복사됨 (CachedJWTAuthentication에서 비교)
     access = refresh.access_token
     expires_in = int(settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds())
     return str(access), expires_in
@@ -1,3 +1,171 @@
-from django.test import TestCase
+import pytest
+from django.test import override_settings
 
-# Create your tests here.
+
+# ─────────────────────────────────────────────────────────────────
+# 엔드포인트별 쿼리 예산 (pytest, 시드: conftest.py)
+# ─────────────────────────────────────────────────────────────────
+@pytest.mark.django_db
+def test_budget_signup(seed, api, query_budget):
+    with query_budget("POST /auth/signup/", 3):
+        res = api().post("/auth/signup/", {
+            "email": "new@seed.test", "name": "new",
+            "password": seed.password, "password_confirm": seed.password,
+        }, format="json")
+    assert res.status_code == 201, res.content
+
+
+@pytest.mark.django_db
+def test_budget_login(seed, api, query_budget):
+    with query_budget("POST /auth/login/", 1):
+        res = api().post("/auth/login/", {"email": "user0@seed.test", "password": seed.password}, format="json")
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_budget_logout(seed, api, query_budget):
+    with query_budget("POST /auth/logout/", 2):  # 인증 + 폐기 jti INSERT
+        res = api(seed.owner_id).post("/auth/logout/")
+    assert res.status_code == 204
+
+
+@pytest.mark.django_db
+def test_budget_me(seed, api, query_budget):
+    with query_budget("GET /users/me/", 2):
+        res = api(seed.owner_id).get("/users/me/")
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_budget_wallet_history(seed, api, query_budget):
+    with query_budget("GET /wallet/history/", 3):
+        res = api(seed.owner_id).get("/wallet/history/", {"page_size": 50})
+    assert res.status_code == 200
+    assert len(res.json()["results"]) == 50
+
+
+# ─────────────────────────────────────────────────────────────────
+# JWT 사용자 캐시 (accounts.authentication)
+# ─────────────────────────────────────────────────────────────────
+@pytest.mark.django_db
+def test_cached_auth_skips_profile_lookup(seed, api, query_budget):
+    client = api(seed.owner_id)
+    assert client.get("/wallet/history/").status_code == 200
+    with query_budget("GET /wallet/history/ (auth cached)", 2):
+        res = client.get("/wallet/history/", {"page_size": 50})
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_me_reads_fresh_balance_after_cache_warm(seed, api):
+    from accounts.models import Profile
+
+    client = api(seed.owner_id)
+    assert client.get("/users/me/").status_code == 200
+    # 캐시를 거치지 않는 갱신 (다른 워커의 쓰기 흉내)
+    Profile.objects.filter(pk=seed.owner_id).update(point_balance=123)
+    res = client.get("/users/me/")
+    assert res.status_code == 200
+    assert res.json()["point_balance"] == 123
+
+
+@pytest.mark.django_db
+def test_profile_save_invalidates_cache(seed, api, django_capture_on_commit_callbacks):
+    from django.core.cache import cache
+
+    from accounts.authentication import USER_CACHE_KEY
+    from accounts.models import Profile
+
+    client = api(seed.owner_id)
+    assert client.get("/users/me/").status_code == 200
+    key = USER_CACHE_KEY.format(user_id=seed.owner_id)
+    assert cache.get(key) is not None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user = Profile.objects.get(pk=seed.owner_id)
+        user.name = "renamed"
+        user.save(update_fields=["name"])
+        # 커밋 전: 아직 지우지 않음 → 그 사이 다른 요청이 커밋 전 값을 다시 캐시해도
+        assert cache.get(key) is not None
+        cache.set(key, Profile.objects.get(pk=seed.owner_id))
+    # 커밋 후 삭제되므로 남지 않음
+    assert cache.get(key) is None
+
+
+@pytest.mark.django_db
+def test_password_change_revokes_issued_tokens(seed, api, django_capture_on_commit_callbacks):
+    from accounts.models import Profile
+
+    client = api(seed.owner_id)
+    assert client.get("/users/me/").status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user = Profile.objects.get(pk=seed.owner_id)
+        user.set_password("changed-password-1")
+        user.save()
+    assert client.get("/users/me/").status_code == 401
+
+
+# ─────────────────────────────────────────────────────────────────
+# 로그아웃 토큰 폐기 (accounts.revocation)
+# ─────────────────────────────────────────────────────────────────
+def test_bloom_filter_has_no_false_negatives():
+    from accounts.revocation import BloomFilter
+
+    bloom = BloomFilter(1000, 0.01)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300  # 설계 1% 기준 여유
+
+
+@pytest.mark.django_db
+def test_logout_revokes_only_current_token(seed, api):
+    client, other = api(seed.owner_id), api(seed.owner_id)
+    assert client.post("/auth/logout/").status_code == 204
+    assert client.get("/users/me/").status_code == 401
+    assert other.get("/users/me/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_filter_hit_is_confirmed_against_db(seed, api, query_budget):
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from accounts.revocation import revocation_list
+
+    client = api(seed.owner_id)
+    token = AccessToken(client._credentials["HTTP_AUTHORIZATION"].split()[1])
+    revocation_list._filter.add(token["jti"])  # DB에 없는 jti의 필터 적중 (오탐)
+    with query_budget("GET /users/me/ (bloom false positive)", 3):
+        res = client.get("/users/me/")
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+@override_settings(REVOCATION_REFRESH_SECONDS=0)
+def test_revocation_from_other_worker_loaded_on_refresh(seed, api):
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from accounts.models import Profile
+    from accounts.revocation import RevocationList
+
+    client = api(seed.owner_id)
+    token = AccessToken(client._credentials["HTTP_AUTHORIZATION"].split()[1])
+    # 다른 워커의 로그아웃: 이 프로세스의 필터를 거치지 않고 DB에만 기록
+    RevocationList().revoke(token, Profile.objects.get(pk=seed.owner_id))
+    assert client.get("/users/me/").status_code == 401
+
+
+@pytest.mark.django_db
+def test_profiling_header_rejects_revoked_staff_token(seed, api, tmp_path):
+    from accounts.models import Profile
+
+    Profile.objects.filter(pk=seed.owner_id).update(is_staff=True)
+    with override_settings(PROFILING_ENABLED=True, PROFILING_DIR=str(tmp_path)):
+        client = api(seed.owner_id)
+        assert client.get("/users/me/", HTTP_X_PROFILE="1").has_header("X-Profile-Id")
+        assert client.post("/auth/logout/").status_code == 204
+        # 폐기된 토큰으로는 강제 프로파일도 불가 (샘플링 비율 0 → 프로파일 없음)
+        assert not client.get("/users/me/", HTTP_X_PROFILE="1").has_header("X-Profile-Id")
@@ -9,9 +9,12 @@ from .serializers import (
     SignupSerializer,
     LoginSerializer, MeSerializer, PointHistorySerializer,
 )
-from .selectors import is_email_taken, select_wallet_history
+from main.utils.db_router import replica_reads
+
+from .selectors import is_email_taken, select_fresh_user, select_wallet_history
 from .services import authenticate_by_email_password, issue_access_token
 from .models import Profile
+from .revocation import revocation_list
 
 class SignupView(APIView):
     permission_classes = [AllowAny]
@@ -76,6 +79,9 @@ class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        # 현재 access 토큰의 jti를 폐기 목록에 등록 (이후 같은 토큰은 401)
+        if request.auth is not None:
+            revocation_list.revoke(request.auth, request.user)
         return Response(status=204)
 
 
@@ -83,7 +89,8 @@ class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        ser = MeSerializer(request.user)
+        # request.user는 인증 캐시일 수 있으므로 잔액은 DB에서 다시 읽음
+        ser = MeSerializer(select_fresh_user(request.user))
         return Response(ser.data, status=200)
 
 
@@ -91,6 +98,7 @@ class WalletHistoryView(APIView, PageNumberPagination):
     permission_classes = [IsAuthenticated]
     page_size = 20
 
+    @replica_reads()
     def get(self, request):
         ph_type = request.query_params.get("type")
         since = request.query_params.get("since")
@@ -1,3 +1,32 @@
 from django.contrib import admin
+from .models import BackfillCheckpoint, ProofUpload, ResumableUpload
 
-# Register your models here.
+
+# ✅ 백필 체크포인트
+@admin.register(BackfillCheckpoint)
+class BackfillCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "last_id", "processed", "updated", "errors", "updated_at", "finished_at")
+    search_fields = ("name",)
+    ordering = ("-updated_at",)
+    readonly_fields = ("started_at", "updated_at")
+
+
+# ✅ 직접 업로드 / 검증 대기열
+@admin.register(ProofUpload)
+class ProofUploadAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "challenge", "status", "attempts", "size", "complete_image", "updated_at")
+    list_filter = ("status",)
+    search_fields = ("file_sha1", "staging_key")
+    raw_id_fields = ("user", "challenge", "challenge_member", "complete_image")
+    ordering = ("-updated_at",)
+    readonly_fields = ("created_at", "updated_at")
+
+
+# ✅ 이어받기 업로드
+@admin.register(ResumableUpload)
+class ResumableUploadAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "challenge", "offset", "size", "complete_image", "expires_at", "updated_at")
+    search_fields = ("file_sha1", "storage_key")
+    raw_id_fields = ("user", "challenge", "challenge_member", "complete_image")
+    ordering = ("-updated_at",)
+    readonly_fields = ("created_at", "updated_at")
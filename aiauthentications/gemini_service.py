@@ -1,12 +1,24 @@
 # aiauthentications/gemini_service.py
-from google import genai
-import os, json, re, base64, io, mimetypes, logging
-from PIL import Image
-from pillow_heif import register_heif_opener
-register_heif_opener()
+import os, json, re, base64, io, mimetypes, logging, time, threading
+from django.conf import settings
+
+from .utils.image_codecs import open_image
 
 logger = logging.getLogger(__name__) 
-client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+
+# google.genai는 import만 수백 ms → 첫 판정 요청 때 클라이언트와 함께 로드
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from google import genai
+                _client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+    return _client
 
 MODELS = ["gemini-2.0-flash-lite"]
 # 우선 정식→프리뷰 순으로 재시도
@@ -42,7 +54,7 @@ def _resize_to_b64_inline(uploaded_file) -> dict:
 
     # ③ 이미지 로드 (HEIC 포함)
     uploaded_file.seek(0)
-    img = Image.open(uploaded_file).convert("RGB")
+    img = open_image(uploaded_file).convert("RGB")
 
     # ④ 크기 축소 및 JPEG 변환
     img.thumbnail((1024, 1024))
@@ -129,7 +141,17 @@ def _fallback_from_raw(raw: str) -> dict | None:
         reasons = ["Did not meet the rules."]
     return {"approved": approved, "reasons": reasons, "uncertain": True}
 
+def _stub_verdict() -> dict:
+    # 부하 테스트/로컬 개발용: 네트워크 호출 없이 지정 지연 후 승인 (settings.AI_JUDGE_STUB)
+    latency_ms = getattr(settings, "AI_JUDGE_STUB_LATENCY_MS", 0)
+    if latency_ms:
+        time.sleep(latency_ms / 1000)
+    return {"approved": True, "reasons": [], "uncertain": False, "raw": '{"approved": true, "reasons": []}'}
+
 def judge_image(ai_condition: str, uploaded_file) -> dict:
+    if getattr(settings, "AI_JUDGE_STUB", False):
+        return _stub_verdict()
+
     raw = ""
     try:
         # 0) 이미지 준비
@@ -151,7 +173,7 @@ def judge_image(ai_condition: str, uploaded_file) -> dict:
         res = None
         for model_name in MODELS:
             try:
-                tmp = client.models.generate_content(
+                tmp = get_client().models.generate_content(
                     model=model_name,
                     contents=[{"role": "user", "parts": [{"text": prompt}, image_part]}],
                     config={
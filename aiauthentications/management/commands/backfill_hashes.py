@@ -1,3 +1,8 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 from django.core.management.base import BaseCommand, CommandParser
 from django.db import models
 from django.utils import timezone
@@ -7,80 +12,209 @@ from challenges.models import CompleteImage
 
 # 해시 유틸은 aiauthentications 쪽 것을 사용
 from aiauthentications.utils.image_hashing import calc_sha1, calc_phash
+from aiauthentications.models import BackfillCheckpoint
+
+
+def _init_worker():
+    # spawn 방식(macOS 등)에서는 워커에서 Django 초기화 필요
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def _hash_chunk(rows):
+    """
+    워커 프로세스: (id, image_name, need_sha1, need_phash) 목록 → (id, sha1, phash, error) 목록
+    - DB에는 접근하지 않고 스토리지에서 파일만 읽음 (쓰기는 부모가 chunk 단위 bulk_update)
+    """
+    storage = CompleteImage._meta.get_field("image").storage
+    out = []
+    for pk, name, need_sha1, need_phash in rows:
+        sha1, ph, errors = None, None, []
+        try:
+            with storage.open(name, "rb") as f:
+                if need_sha1:
+                    try:
+                        sha1 = calc_sha1(f)
+                    except Exception as e:
+                        errors.append(f"SHA-1 error: {e}")
+                if need_phash:
+                    try:
+                        ph = calc_phash(f)
+                    except Exception as e:
+                        errors.append(f"pHash error: {e}")
+        except Exception as e:
+            errors.append(f"open error: {e}")
+        out.append((pk, sha1, ph, "; ".join(errors) or None))
+    return out
 
 
 class Command(BaseCommand):
-    help = "Fill file_sha1 and phash for existing CompleteImage rows (backfill)."
+    help = "Fill file_sha1 and phash for existing CompleteImage rows (parallel, resumable backfill)."
 
     def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument("--limit", type=int, default=0, help="최대 처리 건수 (0은 제한 없음)")
         parser.add_argument("--challenge", type=int, default=0, help="특정 challenge_id만 처리")
-        parser.add_argument("--only-missing", action="store_true", help="해시가 비어있는 행만 처리(기본)")
+        parser.add_argument("--only-missing", action="store_true", help="해시가 비어있는 행만 처리(기본, --force-recalc가 없으면 항상 적용)")
         parser.add_argument("--force-recalc", action="store_true", help="기존 값이 있어도 강제 재계산")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="해시 워커 프로세스 수 (1이면 단일 프로세스)")
+        parser.add_argument("--chunk-size", type=int, default=500, help="워커 1회 작업 단위(id 범위 크기)")
+        parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 다시 실행")
 
     def handle(self, *args, **opts):
         limit = int(opts.get("limit") or 0)
         challenge_id = int(opts.get("challenge") or 0)
-        only_missing = bool(opts.get("only_missing") or True)
         force_recalc = bool(opts.get("force_recalc") or False)
+        only_missing = not force_recalc
+        workers = max(1, int(opts.get("workers") or 1))
+        chunk_size = max(1, int(opts.get("chunk_size") or 500))
 
-        qs = CompleteImage.objects.all().order_by("id")
-
+        qs = CompleteImage.objects.all()
         if challenge_id:
-            qs = qs.filter(challenge_member__challenge_id=challenge_id)
-
-        if only_missing and not force_recalc:
+            qs = qs.filter(challenge_id=challenge_id)
+        if only_missing:
             qs = qs.filter(models.Q(file_sha1__isnull=True) | models.Q(phash__isnull=True))
 
+        # 옵션 조합별 체크포인트 (중단 후 같은 옵션으로 다시 실행하면 이어서 처리)
+        ckpt_name = f"backfill_hashes:challenge={challenge_id or 'ALL'}:{'missing' if only_missing else 'recalc'}"
+        ckpt, _ = BackfillCheckpoint.objects.get_or_create(name=ckpt_name)
+        # 끝난 체크포인트도 last_id부터 이어감 → 그 뒤에 생긴 행만 처리 (처음부터는 --restart)
+        # 단, only-missing 모드는 last_id 이하에서 아직 해시가 비어있는 행(이전 실행의 실패분)을 먼저 재시도
+        if opts.get("restart"):
+            ckpt.last_id, ckpt.processed, ckpt.updated, ckpt.errors = 0, 0, 0, 0
+            ckpt.finished_at = None
+            ckpt.save()
+
+        start_id = ckpt.last_id
+        max_id = qs.aggregate(m=models.Max("id"))["m"] or 0
+        retry_qs = qs.filter(id__lte=start_id) if only_missing and start_id else qs.none()
+        total = qs.filter(id__gt=start_id).count() + retry_qs.count()
         if limit > 0:
-            qs = qs[:limit]
-
-        processed = 0
-        updated = 0
-        errors = 0
+            total = min(total, limit)
 
         self.stdout.write(self.style.NOTICE(
-            f"Start backfill: count≈{qs.count() if hasattr(qs, 'count') else 'unknown'} "
+            f"Start backfill: count≈{total} from id>{start_id} "
             f"(limit={limit}, challenge={challenge_id or 'ALL'}, "
-            f"{'only-missing' if only_missing and not force_recalc else 'recalc-all'})"
+            f"{'only-missing' if only_missing else 'recalc-all'}, workers={workers}, chunk={chunk_size})"
         ))
 
-        for ci in qs.iterator(chunk_size=200):
-            try:
-                changed = []
-
-                # SHA-1
-                if force_recalc or not ci.file_sha1:
-                    try:
-                        sha1 = calc_sha1(ci.image)
-                        if sha1 and sha1 != ci.file_sha1:
-                            ci.file_sha1 = sha1
-                            changed.append("file_sha1")
-                    except Exception as e:
-                        self.stderr.write(f"[id={ci.id}] SHA-1 error: {e}")
-
-                # pHash
-                if force_recalc or not ci.phash:
-                    try:
-                        ph = calc_phash(ci.image)
-                        if ph and ph != ci.phash:
-                            ci.phash = ph
-                            changed.append("phash")
-                    except Exception as e:
-                        self.stderr.write(f"[id={ci.id}] pHash error: {e}")
-
-                if changed:
-                    ci.save(update_fields=changed)
-                    updated += 1
-
-                processed += 1
-                if processed % 200 == 0:
-                    self.stdout.write(f"  processed={processed}, updated={updated}")
-
-            except Exception as e:
-                errors += 1
-                self.stderr.write(f"[id={getattr(ci, 'id', '?')}] row error: {e}")
-
+        exhausted = False
+
+        def chunks():
+            # id 범위 단위로 작업 생성 (부모는 id/파일명만 읽음)
+            nonlocal exhausted
+            fed = 0
+            # 재시도분: 체크포인트는 그대로 두고 id 순으로 chunk_size씩
+            after = 0
+            while True:
+                rows = list(
+                    retry_qs.filter(id__gt=after)
+                    .order_by("id")
+                    .values_list("id", "image", "file_sha1", "phash")[:chunk_size]
+                )
+                if limit > 0:
+                    rows = rows[:max(0, limit - fed)]
+                if not rows:
+                    break
+                after = rows[-1][0]
+                fed += len(rows)
+                yield start_id, [(pk, name, not sha1, ph is None) for pk, name, sha1, ph in rows]
+                if limit > 0 and fed >= limit:
+                    return
+            for lo in range(start_id + 1, max_id + 1, chunk_size):
+                hi = lo + chunk_size - 1
+                rows = list(
+                    qs.filter(id__gte=lo, id__lte=hi)
+                    .order_by("id")
+                    .values_list("id", "image", "file_sha1", "phash")
+                )
+                if limit > 0 and fed + len(rows) > limit:
+                    # limit에서 잘리면 체크포인트도 실제 처리한 마지막 id까지만
+                    rows = rows[:max(0, limit - fed)]
+                    hi = rows[-1][0] if rows else lo - 1
+                fed += len(rows)
+                yield hi, [
+                    (pk, name, force_recalc or not sha1, force_recalc or ph is None)
+                    for pk, name, sha1, ph in rows
+                ]
+                if limit > 0 and fed >= limit:
+                    return
+            exhausted = True
+
+        started = time.monotonic()
+        run_processed = 0
+
+        def apply(hi, results):
+            nonlocal run_processed
+            changed, errors = [], 0
+            for pk, sha1, ph, err in results:
+                if err:
+                    errors += 1
+                    self.stderr.write(f"[id={pk}] {err}")
+                if sha1 is None and ph is None:
+                    continue
+                ci = CompleteImage(id=pk, file_sha1=sha1, phash=ph)
+                changed.append(ci)
+
+            # chunk 단위로 한 번에 쓰기 (None인 컬럼은 건드리지 않도록 분리)
+            sha_rows = [c for c in changed if c.file_sha1 is not None]
+            ph_rows = [c for c in changed if c.phash is not None]
+            if sha_rows:
+                CompleteImage.objects.bulk_update(sha_rows, ["file_sha1"], batch_size=500)
+            if ph_rows:
+                CompleteImage.objects.bulk_update(ph_rows, ["phash"], batch_size=500)
+
+            # 체크포인트 전진 (chunk는 제출 순서대로 반영되므로 last_id는 항상 연속 구간)
+            run_processed += len(results)
+            ckpt.last_id = hi
+            ckpt.processed += len(results)
+            ckpt.updated += len(changed)
+            ckpt.errors += errors
+            ckpt.save(update_fields=["last_id", "processed", "updated", "errors", "updated_at"])
+
+            if results:
+                elapsed = max(time.monotonic() - started, 1e-6)
+                rate = run_processed / elapsed
+                remain = max(total - run_processed, 0)
+                eta = remain / rate if rate > 0 else 0
+                self.stdout.write(
+                    f"  processed={ckpt.processed}, updated={ckpt.updated}, errors={ckpt.errors}, "
+                    f"last_id={hi}, {rate:.1f} rows/s, ETA {eta:.0f}s"
+                )
+
+        if workers == 1:
+            for hi, rows in chunks():
+                apply(hi, _hash_chunk(rows) if rows else [])
+        else:
+            # 워커는 DB에 접근하지 않음 (fork로 물려받은 커넥션도 쓰지 않고, 읽기/쓰기는 모두 부모가 담당)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                # 진행 중인 작업 수를 workers*2로 제한하고, 제출 순서대로 결과 반영
+                pending = deque()
+                for hi, rows in chunks():
+                    pending.append((hi, pool.submit(_hash_chunk, rows) if rows else None))
+                    if len(pending) >= workers * 2:
+                        h, fut = pending.popleft()
+                        apply(h, fut.result() if fut else [])
+                while pending:
+                    h, fut = pending.popleft()
+                    apply(h, fut.result() if fut else [])
+
+        elapsed = time.monotonic() - started
+        if not exhausted:
+            # --limit에서 멈춤 → 완료로 기록하지 않음 (다음 실행이 last_id부터 이어감)
+            if ckpt.finished_at:
+                ckpt.finished_at = None
+                ckpt.save(update_fields=["finished_at", "updated_at"])
+            self.stdout.write(self.style.NOTICE(
+                f"Stopped at limit. last_id={ckpt.last_id}, processed={ckpt.processed}, "
+                f"elapsed={elapsed:.1f}s (run again with the same options to resume)"
+            ))
+            return
+
+        ckpt.finished_at = timezone.now()
+        ckpt.save(update_fields=["finished_at", "updated_at"])
         self.stdout.write(self.style.SUCCESS(
-            f"Done. processed={processed}, updated={updated}, errors={errors}, at={timezone.now()}"
+            f"Done. processed={ckpt.processed}, updated={ckpt.updated}, errors={ckpt.errors}, "
+            f"elapsed={elapsed:.1f}s, at={timezone.now()}"
         ))
@@ -0,0 +1,93 @@
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from django.core.files import File
+from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.core.management.base import BaseCommand, CommandParser
+
+from aiauthentications.utils.image_hashing import _calc_sha1_chunked, calc_sha1
+from aiauthentications.utils.upload_handlers import HashingTemporaryFileUploadHandler
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark: legacy 8KB SHA-1 loop vs mmap / in-memory buffer / upload-handler tee paths."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--sizes", default="2,20", help="합성 파일 크기(MB), 콤마 구분")
+        parser.add_argument("--file", action="append", default=[], help="실제 HEIC 파일 경로 (여러 번 지정 가능)")
+        parser.add_argument("--repeat", type=int, default=7, help="경로별 반복 횟수 (중앙값 보고)")
+
+    def _time(self, fn, repeat):
+        samples = []
+        result = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = fn()
+            samples.append(time.perf_counter() - t0)
+        return statistics.median(samples), result
+
+    def handle(self, *args, **opts):
+        repeat = max(1, int(opts["repeat"]))
+        tmpdir = tempfile.mkdtemp(prefix="bench_sha1_")
+        try:
+            files = list(opts["file"])
+            # 해시 비용은 내용과 무관하므로 지정 크기의 랜덤 바이트를 .heic로 생성
+            for mb in [s for s in opts["sizes"].split(",") if s.strip()]:
+                path = os.path.join(tmpdir, f"synthetic_{mb.strip()}MB.heic")
+                with open(path, "wb") as f:
+                    f.write(os.urandom(int(float(mb) * 1024 * 1024)))
+                files.append(path)
+
+            for path in files:
+                size = os.path.getsize(path)
+                with open(path, "rb") as f:
+                    data = f.read()
+                self.stdout.write(self.style.NOTICE(f"{os.path.basename(path)} ({size / 1024 / 1024:.1f} MB)"))
+
+                def legacy():
+                    with open(path, "rb") as f:
+                        return _calc_sha1_chunked(File(f), 8192)
+
+                def mmap_path():
+                    # TemporaryUploadedFile / FileSystemStorage 파일과 동일한 경로
+                    with open(path, "rb") as f:
+                        fobj = File(f)
+                        fobj.temporary_file_path = lambda: path
+                        return calc_sha1(fobj)
+
+                def memory_buffer():
+                    up = InMemoryUploadedFile(io.BytesIO(data), "image", "x.heic", "image/heic", size, None)
+                    return calc_sha1(up)
+
+                def handler_tee():
+                    # 업로드 수신(64KB 청크 → 임시파일 쓰기)과 해시를 한 번에 (수신 비용 포함)
+                    h = HashingTemporaryFileUploadHandler()
+                    h.new_file("image", "x.heic", "image/heic", size)
+                    view = memoryview(data)
+                    for start in range(0, size, 64 * 1024):
+                        h.receive_data_chunk(view[start:start + 64 * 1024], start)
+                    up = h.file_complete(size)
+                    try:
+                        return calc_sha1(up)
+                    finally:
+                        up.close()
+
+                base, expected = self._time(legacy, repeat)
+                for label, fn in (
+                    ("legacy 8KB loop", legacy),
+                    ("mmap (on disk)", mmap_path),
+                    ("in-memory buffer", memory_buffer),
+                    ("handler tee (incl. receive)", handler_tee),
+                ):
+                    sec, digest = self._time(fn, repeat)
+                    if digest != expected:
+                        self.stderr.write(f"  digest mismatch in {label}: {digest} != {expected}")
+                    self.stdout.write(
+                        f"  {label:<28} {sec * 1000:8.2f} ms  {size / 1024 / 1024 / sec:8.1f} MB/s  x{base / sec:.2f}"
+                    )
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
@@ -0,0 +1,55 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+from django.utils import timezone
+
+from aiauthentications.models import ProofUpload
+from aiauthentications.services import expire_issued_uploads, process_upload, requeue_stale_uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify finalized direct uploads (JPEG conversion, pHash duplicate check, AI judgement). "
+        "Polls the ProofUpload table; run several workers in parallel if needed."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--once", action="store_true", help="대기열을 한 번 비우고 종료 (기본: 계속 폴링)")
+        parser.add_argument("--batch", type=int, default=20, help="한 번에 가져올 대기 건수")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="대기열이 비었을 때 쉬는 시간(초)")
+        parser.add_argument("--stale-seconds", type=int, default=300, help="이 시간 넘게 processing인 행은 다시 대기열로")
+        parser.add_argument("--expire-grace", type=int, default=60, help="URL 만료 후 이 시간(초)이 지난 미확정 업로드 정리")
+
+    def _housekeeping(self, opts):
+        requeued = requeue_stale_uploads(timedelta(seconds=opts["stale_seconds"]))
+        expired = expire_issued_uploads(timedelta(seconds=opts["expire_grace"]))
+        if requeued or expired:
+            self.stdout.write(self.style.NOTICE(f"requeued={requeued}, expired={expired}"))
+
+    def handle(self, *args, **opts):
+        batch = max(1, int(opts["batch"]))
+        processed = 0
+        self._housekeeping(opts)
+        last_housekeeping = time.monotonic()
+        while True:
+            ids = list(
+                ProofUpload.objects
+                .filter(status=ProofUpload.Status.QUEUED)
+                .order_by("updated_at")
+                .values_list("id", flat=True)[:batch]
+            )
+            for pk in ids:
+                # 다른 워커가 먼저 잡은 행은 claim 실패로 건너뜀
+                if process_upload(pk):
+                    processed += 1
+            if opts["once"] and not ids:
+                break
+            if not ids:
+                close_old_connections()
+                time.sleep(opts["poll_interval"])
+            if time.monotonic() - last_housekeeping > opts["stale_seconds"] / 2:
+                self._housekeeping(opts)
+                last_housekeeping = time.monotonic()
+        self.stdout.write(self.style.SUCCESS(f"Done. processed={processed}, at={timezone.now()}"))
@@ -0,0 +1,61 @@
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from aiauthentications.models import ResumableUpload
+from aiauthentications.utils import resumable
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired resumable uploads (partial or finalized) together with their chunk files, "
+        "and sweep orphaned chunk directories left on disk."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--dry-run", action="store_true", help="삭제 대상 건수만 출력하고 지우지 않음")
+
+    def _orphans(self):
+        """행이 없는 조각 디렉터리 + 중단된 요청이 남긴 .chunk (AIAUTH_RESUMABLE_TTL보다 오래된 것만)"""
+        root = resumable.part_path("resumable")
+        if not os.path.isdir(root):
+            return []
+        live = {os.path.dirname(k) for k in ResumableUpload.objects.values_list("storage_key", flat=True)}
+        cutoff = time.time() - settings.AIAUTH_RESUMABLE_TTL
+        orphans = []
+        for entry in os.scandir(root):
+            if entry.stat().st_mtime >= cutoff:
+                continue
+            if f"resumable/{entry.name}" not in live:
+                orphans.append(entry.path)
+            elif entry.is_dir():
+                orphans += [
+                    chunk.path for chunk in os.scandir(entry.path)
+                    if chunk.name.endswith(resumable.CHUNK_SUFFIX) and chunk.stat().st_mtime < cutoff
+                ]
+        return orphans
+
+    def handle(self, *args, **opts):
+        now = timezone.now()
+        expired = list(ResumableUpload.objects.filter(expires_at__lte=now).values_list("id", "storage_key"))
+        orphans = self._orphans()
+        if opts.get("dry_run"):
+            self.stdout.write(self.style.NOTICE(f"Dry run: expired={len(expired)}, orphans={len(orphans)}"))
+            return
+
+        deleted = 0
+        for pk, key in expired:
+            # 그 사이 조각을 받아 만료가 연장된 행은 건너뜀
+            if ResumableUpload.objects.filter(id=pk, expires_at__lte=now).delete()[0]:
+                resumable.discard(pk, key)
+                deleted += 1
+        for path in orphans:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.exists(path):
+                os.remove(path)
+        self.stdout.write(self.style.SUCCESS(f"Done. deleted={deleted}, orphans={len(orphans)}, at={timezone.now()}"))
@@ -1,3 +1,113 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+# ✅ 백필 체크포인트 (중단된 backfill_hashes 재개용)
+class BackfillCheckpoint(models.Model):
+    # 실행 옵션 조합별 키 (예: "backfill_hashes:challenge=3:missing")
+    name = models.CharField(max_length=100, unique=True)
+    last_id = models.BigIntegerField(default=0)     # 여기까지(포함) 처리 완료된 CompleteImage.id
+    processed = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "aiauthentications_backfill_checkpoint"
+
+    def __str__(self):
+        return f"{self.name} @ id={self.last_id}"
+
+
+# ✅ 직접 업로드(사전 서명 URL) 기록 + 검증 대기열
+class ProofUpload(models.Model):
+    class Status(models.TextChoices):
+        ISSUED     = "issued", "URL 발급"
+        QUEUED     = "queued", "검증 대기"
+        PROCESSING = "processing", "검증 중"
+        DONE       = "done", "완료"
+        FAILED     = "failed", "실패"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="proof_uploads",
+    )
+    challenge = models.ForeignKey("challenges.Challenge", on_delete=models.CASCADE, related_name="+")
+    challenge_member = models.ForeignKey("challenges.ChallengeMember", on_delete=models.CASCADE, related_name="+")
+
+    # 업로드마다 고유한 스테이징 키 (확정 전에는 내용 주소 이름을 쓰지 않음 → 남의 blob 선점 불가)
+    staging_key = models.CharField(max_length=255, unique=True)
+    file_sha1 = models.CharField(max_length=40)      # 클라이언트가 선언한 값, 확정 시 스토리지 체크섬과 대조
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100)
+
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.ISSUED)
+    error = models.TextField(blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    complete_image = models.ForeignKey(
+        "challenges.CompleteImage",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    expires_at = models.DateTimeField()               # 업로드 URL 만료 시각
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "aiauthentications_proof_upload"
+        indexes = [
+            # 워커: 대기열 조회 / 오래된 processing 재시도 / 만료된 issued 정리
+            models.Index(fields=["status", "updated_at"], name="pu_status_updated_idx"),
+        ]
+
+    def __str__(self):
+        return f"Upload #{self.id} by user#{self.user_id} ({self.status})"
+
+
+# ✅ 이어받기(resumable) 업로드: 생성 → 조각 PATCH(offset) → 확정
+class ResumableUpload(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="resumable_uploads",
+    )
+    challenge = models.ForeignKey("challenges.Challenge", on_delete=models.CASCADE, related_name="+")
+    challenge_member = models.ForeignKey("challenges.ChallengeMember", on_delete=models.CASCADE, related_name="+")
+
+    storage_key = models.CharField(max_length=255, unique=True)  # 스테이징 디렉터리 기준 조각 파일 경로
+    size = models.PositiveBigIntegerField()                       # 선언한 전체 크기
+    offset = models.PositiveBigIntegerField(default=0)            # 지금까지 받은 바이트 (다음 PATCH 시작 위치)
+    content_type = models.CharField(max_length=100)
+    file_sha1 = models.CharField(max_length=40, blank=True, default="")  # 클라이언트가 선언한 값(선택), 확정 시 대조
+
+    complete_image = models.ForeignKey(
+        "challenges.CompleteImage",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    expires_at = models.DateTimeField()  # 마지막 조각 이후 AIAUTH_RESUMABLE_TTL, 지나면 purge_resumable_uploads가 정리
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "aiauthentications_resumable_upload"
+        indexes = [
+            models.Index(fields=["expires_at"], name="ru_expires_idx"),
+        ]
+
+    @property
+    def completed(self) -> bool:
+        return self.complete_image_id is not None
+
+    def __str__(self):
+        return f"Resumable #{self.id} by user#{self.user_id} ({self.offset}/{self.size})"
@@ -1,7 +1,52 @@
 from rest_framework import serializers
+from .utils.image_hashing import phash_from_hex
+from .utils.presigned import CONTENT_TYPE_EXTENSIONS
+
 
 class AIVerifyImageSerializer(serializers.Serializer):
      """
      image: 사용자 업로드 이미지 (1장 필수)
+     - 포맷/해상도는 AIAuthUploadHandler가 수신 중 헤더로 판별 (Pillow 전체 디코딩 안 함)
+     """
+     image = serializers.FileField()
+
+     def validate_image(self, value):
+          if not getattr(value, "image_format", None):
+               raise serializers.ValidationError("Upload a valid image.")
+          return value
+
+
+class UploadIssueSerializer(serializers.Serializer):
      """
-     image = serializers.ImageField()
\ No newline at end of file
+     직접 업로드 URL 발급 요청 (바이트 없이 메타데이터만)
+     - sha1/size는 스토리지가 업로드 시 검증하고, 확정 시 한 번 더 대조
+     """
+     sha1 = serializers.RegexField(r"^[0-9a-fA-F]{40}$")
+     size = serializers.IntegerField(min_value=1)
+     content_type = serializers.ChoiceField(choices=list(CONTENT_TYPE_EXTENSIONS))
+
+     def validate_sha1(self, value):
+          return value.lower()
+
+
+class ResumableCreateSerializer(UploadIssueSerializer):
+     """
+     이어받기 업로드 생성 요청
+     - sha1은 선택: 보내면 생성 시 동일 파일 차단 + 확정 시 조립된 파일과 대조
+     """
+     sha1 = serializers.RegexField(r"^[0-9a-fA-F]{40}$", required=False, default="")
+
+
+class UploadPrecheckSerializer(serializers.Serializer):
+     """
+     업로드 전 사전 확인 {sha1, phash?}
+     - phash: 클라이언트가 계산한 64비트 pHash (imagehash.phash 문자열, 16 hex) → DB 저장 형식으로 변환
+     """
+     sha1 = serializers.RegexField(r"^[0-9a-fA-F]{40}$")
+     phash = serializers.RegexField(r"^[0-9a-fA-F]{16}$", required=False)
+
+     def validate_sha1(self, value):
+          return value.lower()
+
+     def validate_phash(self, value):
+          return phash_from_hex(value)
@@ -0,0 +1,552 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+
+from challenges.models import Challenge, ChallengeMember, CompleteImage
+from challenges.services import Conflict, Gone
+from challenges.utils.content_storage import acquire_blobs, register_blob
+from challenges.utils.media_signing import signed_media_url
+
+from .gemini_service import judge_image
+from .models import ProofUpload, ResumableUpload
+from .utils import resumable
+from .utils.image_hashing import calc_phash, hamming_distance64
+from .utils.image_sniff import SNIFF_BYTES, read_size, sniff_format, sniff_size, too_many_pixels
+from .utils.presigned import CONTENT_TYPE_EXTENSIONS, LocalUploadBackend, get_upload_backend, staging_key
+
+PHASH_THRESHOLD = 6  # pHash 해밍거리 임계값(권장 6~8 사이 조정)
+MAX_UPLOAD_SIZE = getattr(settings, "AIAUTH_MAX_UPLOAD_SIZE", 20 * 1024 * 1024)  # 인증 사진 1장 최대 크기
+MAX_VERIFY_ATTEMPTS = 3  # 검증 워커 재시도 한도 (초과 시 failed)
+
+DUPLICATE_REASON = "Duplicate upload: identical file (SHA-1 match)"
+
+
+class PayloadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "파일이 너무 큽니다."
+
+
+class OffsetMismatch(Conflict):
+    """이어받기 업로드의 서버 offset과 요청이 어긋남 → 뷰가 현재 offset을 숫자로 응답"""
+    default_detail = "Upload-Offset does not match the current offset."
+
+    def __init__(self, offset: int, detail=None):
+        super().__init__(detail)
+        self.offset = offset
+
+
+# ─────────────────────────────────────────────────────────────────
+# 공통 검증 (멀티파트 업로드 뷰 / 직접 업로드 워커가 같이 사용)
+# ─────────────────────────────────────────────────────────────────
+def find_similar_images(challenge_id: int, phash_val: int, *, exclude_id=None) -> list:
+    """같은 챌린지의 기존 pHash들과 해밍거리 비교 → 유사 이미지 id (최대 3개)"""
+    similar_ids = []
+    candidates = CompleteImage.objects.filter(challenge_id=challenge_id, phash__isnull=False)
+    if exclude_id is not None:
+        candidates = candidates.exclude(id=exclude_id)
+    candidates = candidates.only("id", "phash")[:500]
+    for other in candidates:
+        if hamming_distance64(phash_val, other.phash) <= PHASH_THRESHOLD:
+            similar_ids.append(other.id)
+            if len(similar_ids) >= 3:  # 충분하면 중단해도 됨
+                break
+    return similar_ids
+
+
+def verify_complete_image(ci: CompleteImage, *, ai_condition: str, image_file) -> dict:
+    """
+    pHash 유사 보류 + AI 판정 → ci 상태 반영
+    - image_file: 판정에 넘길 파일 (업로드 파일 또는 열린 ci.image)
+    - 반환: {approved, reasons, raw, similar_ids}
+    """
+    # [A-2] pHash 계산 및 같은 챌린지 내 유사 보류(flagged_duplicate)
+    phash_val = None
+    try:
+        # 저장된 파일 핸들 기준으로 pHash 계산
+        phash_val = calc_phash(ci.image)
+        ci.phash = phash_val
+        ci.save(update_fields=["phash"])
+    except Exception:
+        phash_val = None  # pHash 실패는 치명적 아님
+
+    similar_ids = find_similar_images(ci.challenge_id, phash_val, exclude_id=ci.id) if phash_val is not None else []
+    if similar_ids:
+        # 보수적 운영: 보류 플래그만 세우고 최종 상태는 AI/사람 검수로 결정
+        ci.flagged_duplicate = True
+        ci.save(update_fields=["flagged_duplicate"])
+
+    # AI 판정
+    verdict = judge_image(ai_condition or "", image_file)
+
+    approved = bool(verdict.get("approved"))
+    reasons = verdict.get("reasons") or []
+    uncertain = bool(verdict.get("uncertain"))
+
+    # 유사 보류를 응답 사유에 표시(원하면 비활성화해도 됨)
+    if ci.flagged_duplicate and "Possible duplicate (pHash)" not in reasons:
+        reasons = ["Possible duplicate (pHash)"] + reasons
+
+    # 상태 결정
+    if uncertain:
+        ci.status = CompleteImage.Status.PENDING
+        ci.reviewed_at = None
+    else:
+        ci.status = CompleteImage.Status.APPROVED if approved else CompleteImage.Status.REJECTED
+        ci.reviewed_at = timezone.now()
+
+    ci.review_reasons = "\n".join(reasons)
+    ci.save(update_fields=["status", "reviewed_at", "review_reasons"])
+    return {"approved": approved, "reasons": reasons, "raw": verdict.get("raw"), "similar_ids": similar_ids}
+
+
+def complete_image_body(ci: CompleteImage, similar_ids=()) -> dict:
+    return {
+        "id": ci.id,
+        "image_url": signed_media_url(ci.converted_image or ci.image,
+                                      challenge_id=ci.challenge_id, user_id=ci.user_id),
+        "status": ci.status,
+        "created_at": ci.created_at,
+        "reviewed_at": ci.reviewed_at,
+        "flagged_duplicate": getattr(ci, "flagged_duplicate", False),
+        "similar_example_ids": list(similar_ids),  # 참고용
+    }
+
+
+def check_image_file(fp) -> tuple:
+    """
+    앞부분 헤더로 포맷/해상도 검사 (AIAuthUploadHandler와 같은 규칙) → ((w, h) 또는 None, 거절 사유 또는 None)
+    - 앞부분에서 크기를 못 찾으면 파일에서 헤더만 다시 읽음 (read_size)
+    """
+    head = fp.read(SNIFF_BYTES)
+    fmt = sniff_format(head)
+    if fmt is None:
+        return None, "Unsupported image format."
+    size = sniff_size(fmt, head) or read_size(fp)
+    if size and too_many_pixels(size):
+        return None, "Image dimensions too large."
+    return size, None
+
+
+def duplicate_body(challenge_id: int, user_id: int) -> dict:
+    """[A-1] 동일 파일(SHA-1) 차단 응답 (같은 유저)"""
+    return {
+        "challenge_id": challenge_id,
+        "user_id": user_id,
+        "approved": False,
+        "reasons": [DUPLICATE_REASON],
+        "raw_ai_response": None,
+        "complete_image": None
+    }
+
+
+def verification_body(ci: CompleteImage, result: dict) -> dict:
+    """동기 판정 응답: {challenge_id, user_id, upload_date, approved, reasons[], complete_image{...}, raw_ai_response}"""
+    return {
+        "challenge_id": ci.challenge_id,
+        "user_id": ci.user_id,
+        "upload_date": str(ci.date),
+        "approved": result["approved"],
+        "reasons": result["reasons"],
+        "raw_ai_response": result["raw"],
+        "complete_image": complete_image_body(ci, result["similar_ids"]),
+    }
+
+
+def store_staged(backend, key: str, *, file_sha1: str, size: int, content_type: str) -> str:
+    """스테이징 객체 → 내용 주소 이름으로 이동 후 그 이름 반환 (CompleteImage.image.name으로 사용)"""
+    storage = CompleteImage._meta.get_field("image").storage
+    name = storage.blob_name(f"complete_images/{file_sha1}{CONTENT_TYPE_EXTENSIONS[content_type]}", file_sha1)
+    # 이동 전에 blob 행을 잠그고 갱신 → GC와 직렬화 (ContentAddressedStorage._save와 같은 순서)
+    with transaction.atomic():
+        register_blob(name, file_sha1, size)
+        backend.promote(key, storage, name)
+    return name
+
+
+def _get_membership(user, challenge_id: int) -> ChallengeMember:
+    if not Challenge.objects.filter(id=challenge_id).exists():
+        raise NotFound("Challenge not found.")
+    try:
+        return ChallengeMember.objects.get(challenge_id=challenge_id, user=user)
+    except ChallengeMember.DoesNotExist:
+        raise ValidationError({"detail": "User is not a member of this challenge."})
+
+
+def _is_duplicate(user_id: int, file_sha1: str) -> bool:
+    # (user, file_sha1) 복합 인덱스 조회
+    return CompleteImage.objects.filter(user_id=user_id, file_sha1=file_sha1).exists()
+
+
+def precheck_upload(*, user, challenge_id: int, file_sha1: str, phash=None) -> dict:
+    """
+    업로드 전 사전 확인 (바이트 없이 SHA-1/pHash만)
+    - duplicate: 같은 유저의 동일 파일 → 업로드해도 [A-1]로 차단되므로 전송 생략
+    - similar_example_ids: 클라이언트 pHash가 있으면 같은 챌린지 유사 이미지 (업로드 시 flagged_duplicate 보류 대상)
+    - 멤버십은 정상 경로에서 한 번의 exists로 확인 (실패 시에만 챌린지 존재 여부 구분)
+    """
+    if not ChallengeMember.objects.filter(challenge_id=challenge_id, user=user).exists():
+        _get_membership(user, challenge_id)  # 404/400 구분해서 예외
+    duplicate = _is_duplicate(user.id, file_sha1)
+    similar_ids = find_similar_images(challenge_id, phash) if phash is not None and not duplicate else []
+    return {
+        "challenge_id": challenge_id,
+        "duplicate": duplicate,
+        "reasons": [DUPLICATE_REASON] if duplicate else [],
+        "flagged_duplicate": bool(similar_ids),
+        "similar_example_ids": similar_ids,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────
+# 직접 업로드: URL 발급 → (클라이언트가 스토리지로 PUT) → 확정 → 검증 대기열
+# ─────────────────────────────────────────────────────────────────
+def issue_upload(*, user, challenge_id: int, file_sha1: str, size: int, content_type: str) -> tuple:
+    """사전 서명 업로드 URL 발급 → (ProofUpload, {method, url, headers})"""
+    cm = _get_membership(user, challenge_id)
+    if size > MAX_UPLOAD_SIZE:
+        raise PayloadTooLarge(f"File too large (max {MAX_UPLOAD_SIZE} bytes).")
+    # 바이트를 보내기 전에 같은 유저의 동일 파일 차단 (확정 시 한 번 더 확인)
+    if _is_duplicate(user.id, file_sha1):
+        raise Conflict(DUPLICATE_REASON)
+
+    ttl = settings.AIAUTH_UPLOAD_URL_TTL
+    key = staging_key(file_sha1, content_type)
+    upload = ProofUpload.objects.create(
+        user=user,
+        challenge_id=challenge_id,
+        challenge_member=cm,
+        staging_key=key,
+        file_sha1=file_sha1,
+        size=size,
+        content_type=content_type,
+        expires_at=timezone.now() + timedelta(seconds=ttl),
+    )
+    target = get_upload_backend().presign(
+        key, sha1=file_sha1, size=size, content_type=content_type, expires_in=ttl,
+    )
+    return upload, target
+
+
+def _fail(upload: ProofUpload, error: str):
+    upload.status = ProofUpload.Status.FAILED
+    upload.error = error
+    upload.save(update_fields=["status", "error", "updated_at"])
+
+
+def finalize_upload(*, user, upload_id: int) -> ProofUpload:
+    """
+    업로드 확정: 스토리지의 크기/SHA-1 대조 → 내용 주소 이름으로 이동 → CompleteImage(pending) 생성 → 대기열
+    - 이미지 바이트는 읽지 않음 (변환/pHash/AI 판정은 process_proof_uploads 워커)
+    - 이미 확정된 업로드는 그대로 반환 (재시도 안전, 동시 확정은 행 잠금으로 한 번만)
+    """
+    with transaction.atomic():
+        try:
+            upload = ProofUpload.objects.select_for_update().get(id=upload_id, user=user)
+        except ProofUpload.DoesNotExist:
+            raise NotFound("Upload not found.")
+        if upload.status != ProofUpload.Status.ISSUED:
+            return upload
+        # 실패 기록(failed)은 커밋하고 예외는 트랜잭션 밖에서
+        error = _finalize_locked(upload)
+    if error is not None:
+        raise error
+    return upload
+
+
+def _finalize_locked(upload: ProofUpload):
+    backend = get_upload_backend()
+    stat = backend.stat(upload.staging_key)
+    if stat is None:
+        return Conflict("Upload has not reached storage yet.")
+    size, stored_sha1 = stat
+    if size != upload.size or stored_sha1 != upload.file_sha1:
+        backend.delete(upload.staging_key)
+        _fail(upload, "Stored object does not match the declared size/SHA-1.")
+        return ValidationError({"detail": upload.error})
+    if _is_duplicate(upload.user_id, upload.file_sha1):
+        backend.delete(upload.staging_key)
+        _fail(upload, DUPLICATE_REASON)
+        return Conflict(DUPLICATE_REASON)
+
+    name = store_staged(
+        backend, upload.staging_key,
+        file_sha1=upload.file_sha1, size=upload.size, content_type=upload.content_type,
+    )
+
+    ci = CompleteImage(
+        challenge_member=upload.challenge_member,
+        challenge_id=upload.challenge_id,
+        user_id=upload.user_id,
+        status=CompleteImage.Status.PENDING,
+        date=timezone.localdate(),
+        file_sha1=upload.file_sha1,
+    )
+    ci.image.name = name
+    ci.save(convert=False)
+    upload.complete_image = ci
+    upload.status = ProofUpload.Status.QUEUED
+    upload.save(update_fields=["complete_image", "status", "updated_at"])
+    return None
+
+
+def upload_body(upload: ProofUpload) -> dict:
+    """확정/상태 조회 응답 (검증이 끝나면 complete_image에 판정 결과)"""
+    ci = upload.complete_image
+    return {
+        "upload_id": upload.id,
+        "challenge_id": upload.challenge_id,
+        "status": upload.status,
+        "error": upload.error or None,
+        "complete_image": complete_image_body(ci) | {
+            "reasons": [r for r in ci.review_reasons.split("\n") if r],
+        } if ci else None,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────
+# 검증 워커 (process_proof_uploads)
+# ─────────────────────────────────────────────────────────────────
+def claim_upload(upload_id: int) -> bool:
+    """queued → processing 원자적 전환 (여러 워커가 같은 행을 잡지 않도록)"""
+    return bool(
+        ProofUpload.objects
+        .filter(id=upload_id, status=ProofUpload.Status.QUEUED)
+        .update(status=ProofUpload.Status.PROCESSING, attempts=F("attempts") + 1, updated_at=timezone.now())
+    )
+
+
+def _reject_file(upload: ProofUpload, ci: CompleteImage, error: str):
+    # 이미지가 아닌 파일은 인증 기록으로 남기지 않음 (post_delete가 blob 참조 해제)
+    upload.complete_image = None
+    upload.status = ProofUpload.Status.FAILED
+    upload.error = error
+    upload.save(update_fields=["complete_image", "status", "error", "updated_at"])
+    ci.delete()
+
+
+def process_upload(upload_id: int) -> bool:
+    """
+    확정된 업로드 1건 검증 (claim 성공 시 True)
+    - 헤더로 포맷/해상도 판별 → JPEG 변환본 생성 → pHash 유사 보류 + AI 판정
+    - 예외 시 MAX_VERIFY_ATTEMPTS까지 queued로 되돌림
+    """
+    if not claim_upload(upload_id):
+        return False
+    upload = ProofUpload.objects.select_related("challenge", "complete_image").get(id=upload_id)
+    ci = upload.complete_image
+    if ci is None:
+        _fail(upload, "Complete image was deleted before verification.")
+        return True
+
+    try:
+        with ci.image.open("rb") as f:
+            size, error = check_image_file(f)
+        if error:
+            _reject_file(upload, ci, error)
+            return True
+        ci.width, ci.height = size or (None, None)
+
+        # 확정 때 미뤄둔 JPEG 변환 (save가 변환본을 만들고, 새 blob 참조는 여기서 증가)
+        # - 재시도 중이면 이미 만든 변환본을 다시 세지 않음
+        needs_conversion = not ci.converted_image
+        ci.save(update_fields=["converted_image", "width", "height"])
+        if needs_conversion:
+            acquire_blobs([ci.converted_image.name])
+
+        with ci.image.open("rb") as f:
+            verify_complete_image(ci, ai_condition=upload.challenge.ai_condition, image_file=f)
+    except Exception as e:
+        upload.refresh_from_db(fields=["attempts"])
+        upload.status = (ProofUpload.Status.QUEUED if upload.attempts < MAX_VERIFY_ATTEMPTS
+                         else ProofUpload.Status.FAILED)
+        upload.error = str(e)
+        upload.save(update_fields=["status", "error", "updated_at"])
+        return True
+
+    upload.status = ProofUpload.Status.DONE
+    upload.error = ""
+    upload.save(update_fields=["status", "error", "updated_at"])
+    return True
+
+
+def expire_issued_uploads(grace: timedelta) -> int:
+    """URL이 만료된 뒤에도 확정되지 않은 업로드 → failed + 스테이징 객체 삭제"""
+    backend = get_upload_backend()
+    expired = ProofUpload.objects.filter(
+        status=ProofUpload.Status.ISSUED, expires_at__lt=timezone.now() - grace,
+    ).values_list("id", "staging_key")
+    count = 0
+    for pk, key in expired:
+        # 그 사이 확정된 행은 건너뜀
+        if ProofUpload.objects.filter(id=pk, status=ProofUpload.Status.ISSUED).update(
+            status=ProofUpload.Status.FAILED, error="Upload URL expired.", updated_at=timezone.now(),
+        ):
+            backend.delete(key)
+            count += 1
+    return count
+
+
+def requeue_stale_uploads(older_than: timedelta) -> int:
+    """processing에서 멈춘 행(워커 종료 등)을 다시 대기열로"""
+    return (
+        ProofUpload.objects
+        .filter(status=ProofUpload.Status.PROCESSING, updated_at__lt=timezone.now() - older_than)
+        .update(status=ProofUpload.Status.QUEUED, updated_at=timezone.now())
+    )
+
+
+# ─────────────────────────────────────────────────────────────────
+# 이어받기 업로드: 생성 → 조각 PATCH(Upload-Offset) → 확정 (확정 시 기존 동기 판정 흐름)
+# ─────────────────────────────────────────────────────────────────
+def _resumable_expiry():
+    return timezone.now() + timedelta(seconds=settings.AIAUTH_RESUMABLE_TTL)
+
+
+def create_resumable(*, user, challenge_id: int, size: int, content_type: str, file_sha1: str = "") -> ResumableUpload:
+    cm = _get_membership(user, challenge_id)
+    if size > MAX_UPLOAD_SIZE:
+        raise PayloadTooLarge(f"File too large (max {MAX_UPLOAD_SIZE} bytes).")
+    if file_sha1 and _is_duplicate(user.id, file_sha1):
+        raise Conflict(DUPLICATE_REASON)
+
+    key = resumable.new_key()
+    resumable.create_part(key)
+    return ResumableUpload.objects.create(
+        user=user,
+        challenge_id=challenge_id,
+        challenge_member=cm,
+        storage_key=key,
+        size=size,
+        content_type=content_type,
+        file_sha1=file_sha1,
+        expires_at=_resumable_expiry(),
+    )
+
+
+def get_resumable(*, user, upload_id: int, for_update: bool = False) -> ResumableUpload:
+    qs = ResumableUpload.objects.select_for_update() if for_update else ResumableUpload.objects
+    try:
+        upload = qs.get(id=upload_id, user=user)
+    except ResumableUpload.DoesNotExist:
+        raise NotFound("Upload not found.")
+    if not upload.completed and upload.expires_at <= timezone.now():
+        raise Gone("Upload expired.")
+    return upload
+
+
+def append_resumable(*, user, upload_id: int, offset: int, length: int, chunks) -> ResumableUpload:
+    """
+    조각 1개 추가 (offset이 서버 값과 다르면 409 + 현재 offset → 클라이언트는 그 위치부터 재전송)
+    - 본문 수신은 잠금 없이 임시파일로, 붙이기만 행 잠금 안에서
+    """
+    upload = get_resumable(user=user, upload_id=upload_id)
+    if upload.completed:
+        raise Conflict("Upload already finalized.")
+    if offset != upload.offset:
+        raise OffsetMismatch(upload.offset)
+    if length > settings.AIAUTH_RESUMABLE_MAX_CHUNK:
+        raise PayloadTooLarge(f"Chunk too large (max {settings.AIAUTH_RESUMABLE_MAX_CHUNK} bytes).")
+    if length <= 0 or offset + length > upload.size:
+        raise ValidationError({"detail": "Chunk must be non-empty and within the declared size."})
+
+    try:
+        tmp_path = resumable.receive_chunk(upload.storage_key, chunks, length=length)
+    except ValueError as e:
+        raise ValidationError({"detail": str(e)})
+
+    with transaction.atomic():
+        upload = get_resumable(user=user, upload_id=upload_id, for_update=True)
+        if upload.completed or upload.offset != offset:
+            # 같은 조각을 다른 요청이 먼저 붙임
+            os.remove(tmp_path)
+            raise OffsetMismatch(upload.offset)
+        upload.offset = resumable.append_chunk(upload.id, upload.storage_key, tmp_path, offset)
+        upload.expires_at = _resumable_expiry()
+        upload.save(update_fields=["offset", "expires_at", "updated_at"])
+    return upload
+
+
+def resumable_body(upload: ResumableUpload) -> dict:
+    return {
+        "upload_id": upload.id,
+        "challenge_id": upload.challenge_id,
+        "offset": upload.offset,
+        "size": upload.size,
+        "max_chunk_size": settings.AIAUTH_RESUMABLE_MAX_CHUNK,
+        "expires_at": upload.expires_at,
+        "completed": upload.completed,
+    }
+
+
+def _drop_resumable(upload: ResumableUpload):
+    resumable.discard(upload.id, upload.storage_key)
+    upload.delete()
+
+
+def finalize_resumable(*, user, upload_id: int) -> dict:
+    """
+    다 받은 조각 파일 → 내용 주소 이름으로 이동 → CompleteImage 생성 + 판정 (ChallengeAIVerifyLiteView와 같은 규칙/응답)
+    - 선언한 SHA-1이 있으면 대조, 동일 파일(같은 유저)이면 [A-1] 차단 응답
+    - 이미 확정된 업로드는 저장된 판정으로 같은 모양의 응답 (재시도 안전)
+    """
+    with transaction.atomic():
+        upload = get_resumable(user=user, upload_id=upload_id, for_update=True)
+        if upload.completed:
+            ci = upload.complete_image
+            return verification_body(ci, {
+                "approved": ci.status == CompleteImage.Status.APPROVED,
+                "reasons": [r for r in ci.review_reasons.split("\n") if r],
+                "raw": None,
+                "similar_ids": [],
+            })
+        if upload.offset != upload.size:
+            raise OffsetMismatch(upload.offset, "Upload is incomplete.")
+
+        file_sha1 = resumable.part_sha1(upload.id, upload.storage_key, upload.size)
+        if upload.file_sha1 and file_sha1 != upload.file_sha1:
+            _drop_resumable(upload)
+            error = ValidationError({"detail": "SHA-1 does not match the declared checksum."})
+        elif _is_duplicate(user.id, file_sha1):
+            _drop_resumable(upload)
+            return duplicate_body(upload.challenge_id, user.id)
+        else:
+            with open(resumable.part_path(upload.storage_key), "rb") as fh:
+                size, error_message = check_image_file(fh)
+            if error_message:
+                _drop_resumable(upload)
+                error = ValidationError({"detail": error_message})
+            else:
+                error = None
+                name = store_staged(
+                    LocalUploadBackend(), upload.storage_key,
+                    file_sha1=file_sha1, size=upload.size, content_type=upload.content_type,
+                )
+                width, height = size or (None, None)
+                ci = CompleteImage(
+                    challenge_member=upload.challenge_member,
+                    challenge_id=upload.challenge_id,
+                    user=user,
+                    status=CompleteImage.Status.PENDING,
+                    date=timezone.localdate(),
+                    file_sha1=file_sha1,
+                    width=width,
+                    height=height,
+                )
+                ci.image.name = name
+                ci.save()  # 멀티파트 업로드와 같이 JPEG 변환본까지 동기 생성
+                upload.complete_image = ci
+                upload.save(update_fields=["complete_image", "updated_at"])
+    if error is not None:
+        raise error
+
+    # 판정은 행 잠금 밖에서 (AI 호출 동안 같은 업로드의 상태 조회를 막지 않도록)
+    with ci.image.open("rb") as f:
+        result = verify_complete_image(ci, ai_condition=upload.challenge.ai_condition, image_file=f)
+    return verification_body(ci, result)
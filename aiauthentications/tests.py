@@ -1,3 +1,413 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
 
-# Create your tests here.
+import pytest
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from aiauthentications.models import ProofUpload, ResumableUpload
+from aiauthentications.utils import resumable
+from challenges.models import CompleteImage, MediaBlob
+
+
+def _png(color):
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+# ─────────────────────────────────────────────────────────────────
+# 엔드포인트별 쿼리 예산 (pytest, 시드: conftest.py, Gemini는 stub)
+# ─────────────────────────────────────────────────────────────────
+@pytest.mark.django_db
+def test_budget_aiauth_upload(seed, api, query_budget, stub_gemini):
+    client = api(seed.member_ids[1])
+    # 원본/변환본 blob 쓰기마다 GC와 직렬화하는 SAVEPOINT/RELEASE 2개씩 포함
+    with query_budget("POST /aiauth/{id}/", 27):
+        res = client.post(
+            f"/aiauth/{seed.challenge_id}/",
+            {"image": SimpleUploadedFile("proof.png", _png((10, 20, 30)))},
+            format="multipart",
+        )
+    assert res.status_code == 200, res.content
+    assert res.json()["approved"] is True
+
+
+@pytest.mark.django_db
+def test_budget_aiauth_duplicate(seed, api, query_budget, stub_gemini):
+    client = api(seed.member_ids[1])
+    data = _png((40, 50, 60))
+    client.post(f"/aiauth/{seed.challenge_id}/", {"image": SimpleUploadedFile("a.png", data)}, format="multipart")
+    with query_budget("POST /aiauth/{id}/ (duplicate)", 4):
+        res = client.post(f"/aiauth/{seed.challenge_id}/", {"image": SimpleUploadedFile("a.png", data)}, format="multipart")
+    assert res.status_code == 200
+    assert res.json()["complete_image"] is None
+
+
+# ─────────────────────────────────────────────────────────────────
+# 수신 중 거절 (AIAuthUploadHandler: 크기/포맷/해상도/동일 파일)
+# ─────────────────────────────────────────────────────────────────
+def _post_image(client, challenge_id, data, name="proof.png"):
+    return client.post(f"/aiauth/{challenge_id}/", {"image": SimpleUploadedFile(name, data)}, format="multipart")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("max_size", [1000, 100_000])  # Content-Length로 즉시 거절 / 수신 중 거절
+def test_upload_rejects_too_large(seed, api, monkeypatch, max_size):
+    monkeypatch.setattr("aiauthentications.views.MAX_UPLOAD_SIZE", max_size)
+    buf = io.BytesIO()
+    Image.frombytes("RGB", (200, 200), os.urandom(200 * 200 * 3)).save(buf, "PNG")
+    res = _post_image(api(seed.member_ids[1]), seed.challenge_id, buf.getvalue())
+    assert res.status_code == 413, res.content
+
+
+@pytest.mark.django_db
+def test_upload_rejects_non_image(seed, api):
+    res = _post_image(api(seed.member_ids[1]), seed.challenge_id, b"not an image\n" * 100, name="proof.jpg")
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Unsupported image format."
+
+
+@pytest.mark.django_db
+def test_upload_rejects_duplicate(seed, api, stub_gemini):
+    from aiauthentications.services import DUPLICATE_REASON
+
+    client, data = api(seed.member_ids[1]), _png((70, 80, 90))
+    assert _post_image(client, seed.challenge_id, data).json()["approved"] is True
+    count = CompleteImage.objects.count()
+    res = _post_image(client, seed.challenge_id, data)
+    assert res.status_code == 200
+    assert res.json()["reasons"] == [DUPLICATE_REASON] and res.json()["complete_image"] is None
+    assert CompleteImage.objects.count() == count
+
+
+@pytest.mark.django_db
+@pytest.mark.filterwarnings("ignore::PIL.Image.DecompressionBombWarning")
+def test_upload_checks_pixels_when_sof_is_past_sniff_window(seed, api, monkeypatch, stub_gemini):
+    from aiauthentications.utils.image_sniff import SNIFF_BYTES
+
+    buf = io.BytesIO()
+    # APP1(EXIF) + APP2(ICC)가 SNIFF_BYTES를 넘겨 SOF가 앞부분 헤더 밖에 있는 JPEG
+    Image.new("RGB", (64, 48), (1, 2, 3)).save(
+        buf, "JPEG", exif=b"Exif\x00\x00" + b"\x00" * 60_000, icc_profile=b"\x00" * 20_000,
+    )
+    data = buf.getvalue()
+    assert data.find(b"\xff\xc0") > SNIFF_BYTES
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 64 * 48 - 1)
+    res = _post_image(api(seed.member_ids[1]), seed.challenge_id, data, name="proof.jpg")
+    assert res.status_code == 400, res.content
+    assert res.json()["detail"] == "Image dimensions too large."
+
+
+# ─────────────────────────────────────────────────────────────────
+# 직접 업로드 (URL 발급 → 로컬 수신 뷰로 PUT → 확정 → 검증 워커)
+# ─────────────────────────────────────────────────────────────────
+def _issue(client, challenge_id, data, **overrides):
+    body = {"sha1": hashlib.sha1(data).hexdigest(), "size": len(data), "content_type": "image/png"}
+    body.update(overrides)
+    return client.post(f"/aiauth/{challenge_id}/uploads/", body, format="json")
+
+
+def _put(client, target, data):
+    return client.put(target["url"], data=data, content_type=target["headers"]["Content-Type"])
+
+
+@pytest.mark.django_db
+def test_direct_upload_flow(seed, api, stub_gemini):
+    client = api(seed.member_ids[1])
+    data = _png((70, 80, 90))
+
+    issued = _issue(client, seed.challenge_id, data)
+    assert issued.status_code == 201, issued.content
+    upload_id, target = issued.json()["upload_id"], issued.json()["upload"]
+    assert _put(APIClient(), target, data).status_code == 200
+
+    res = client.post(f"/aiauth/uploads/{upload_id}/finalize/")
+    assert res.status_code == 202, res.content
+    assert res.json()["status"] == "queued"
+    ci = CompleteImage.objects.get(id=res.json()["complete_image"]["id"])
+    assert ci.status == CompleteImage.Status.PENDING
+    assert not ci.converted_image  # 확정 단계에서는 변환하지 않음
+    assert ci.image.name == ci.image.storage.blob_name("complete_images/x.png", ci.file_sha1)
+    assert not os.path.exists(os.path.join(settings.AIAUTH_UPLOAD_STAGING_DIR, ProofUpload.objects.get(id=upload_id).staging_key))
+
+    call_command("process_proof_uploads", "--once", stdout=io.StringIO())
+
+    res = client.get(f"/aiauth/uploads/{upload_id}/")
+    assert res.json()["status"] == "done"
+    assert res.json()["complete_image"]["status"] == "approved"
+    ci.refresh_from_db()
+    assert ci.converted_image and ci.phash is not None and (ci.width, ci.height) == (64, 48)
+    assert MediaBlob.objects.get(name=ci.image.name).refcount == 1
+    assert MediaBlob.objects.get(name=ci.converted_image.name).refcount >= 1
+
+
+@pytest.mark.django_db
+def test_direct_upload_rejects_body_mismatch(seed, api):
+    client = api(seed.member_ids[1])
+    data = _png((91, 92, 93))
+    issued = _issue(client, seed.challenge_id, data).json()
+
+    tampered = _png((1, 2, 3))
+    tampered = tampered[:len(data)].ljust(len(data), b"\0")
+    assert _put(APIClient(), issued["upload"], tampered).status_code == 400
+    # 스토리지에 남은 객체가 없으므로 확정 불가
+    assert client.post(f"/aiauth/uploads/{issued['upload_id']}/finalize/").status_code == 409
+    # 다른 유저는 남의 업로드를 확정할 수 없음
+    assert api(seed.member_ids[2]).post(f"/aiauth/uploads/{issued['upload_id']}/finalize/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_direct_upload_duplicate_and_membership(seed, api, stub_gemini):
+    client = api(seed.member_ids[1])
+    data = _png((11, 12, 13))
+    client.post(f"/aiauth/{seed.challenge_id}/", {"image": SimpleUploadedFile("a.png", data)}, format="multipart")
+
+    # 같은 유저의 동일 파일은 전송 전에 차단
+    assert _issue(client, seed.challenge_id, data).status_code == 409
+    assert _issue(api(seed.outsider_id), seed.challenge_id, data).status_code == 400
+    assert _issue(client, seed.challenge_id, data, size=10 ** 9).status_code == 413
+    assert _issue(client, seed.challenge_id, data, content_type="text/html").status_code == 400
+
+
+# ─────────────────────────────────────────────────────────────────
+# 이어받기 업로드 (생성 → 조각 PATCH → 확정 / 만료 정리)
+# ─────────────────────────────────────────────────────────────────
+def _patch(client, upload_id, offset, chunk):
+    return client.patch(
+        f"/aiauth/resumable/{upload_id}/", data=chunk,
+        content_type="application/offset+octet-stream", HTTP_UPLOAD_OFFSET=str(offset),
+    )
+
+
+@pytest.mark.django_db
+def test_resumable_upload_flow(seed, api, stub_gemini):
+    client = api(seed.member_ids[1])
+    data = _png((21, 22, 23))
+    created = client.post(
+        f"/aiauth/{seed.challenge_id}/resumable/",
+        {"size": len(data), "content_type": "image/png", "sha1": hashlib.sha1(data).hexdigest()},
+        format="json",
+    )
+    assert created.status_code == 201, created.content
+    upload_id = created.json()["upload_id"]
+    half = len(data) // 2
+
+    assert _patch(client, upload_id, 0, data[:half]).json()["offset"] == half
+    # 끊긴 뒤 재전송: 어긋난 offset은 409 + 현재 offset
+    res = _patch(client, upload_id, 0, data[:half])
+    assert res.status_code == 409 and res.json()["offset"] == half
+    # 다른 워커가 이어받은 경우(해시 상태 없음)에도 디스크에서 따라잡음
+    resumable._hash_states.clear()
+    assert client.get(f"/aiauth/resumable/{upload_id}/")["Upload-Offset"] == str(half)
+    assert _patch(client, upload_id, half, data[half:]).json()["offset"] == len(data)
+
+    res = client.post(f"/aiauth/resumable/{upload_id}/finalize/")
+    assert res.status_code == 200, res.content
+    assert res.json()["approved"] is True
+    ci = CompleteImage.objects.get(id=res.json()["complete_image"]["id"])
+    assert ci.file_sha1 == hashlib.sha1(data).hexdigest() and ci.converted_image
+    assert ci.image.storage.open(ci.image.name).read() == data
+    # 확정 재시도는 같은 결과
+    assert client.post(f"/aiauth/resumable/{upload_id}/finalize/").json()["complete_image"]["id"] == ci.id
+
+
+@pytest.mark.django_db
+def test_resumable_upload_rejects_and_expires(seed, api):
+    client = api(seed.member_ids[1])
+    data = b"not an image" * 10
+    upload_id = client.post(
+        f"/aiauth/{seed.challenge_id}/resumable/", {"size": len(data), "content_type": "image/png"}, format="json",
+    ).json()["upload_id"]
+    assert client.post(f"/aiauth/resumable/{upload_id}/finalize/").status_code == 409  # 아직 덜 받음
+    assert _patch(client, upload_id, 0, data + b"x").status_code == 400                 # 선언 크기 초과
+    assert _patch(client, upload_id, 0, data).status_code == 200
+    assert client.post(f"/aiauth/resumable/{upload_id}/finalize/").status_code == 400  # 이미지 아님
+    assert not ResumableUpload.objects.filter(id=upload_id).exists()
+
+    stale = client.post(
+        f"/aiauth/{seed.challenge_id}/resumable/", {"size": 100, "content_type": "image/png"}, format="json",
+    ).json()["upload_id"]
+    _patch(client, stale, 0, b"\0" * 10)
+    key = ResumableUpload.objects.get(id=stale).storage_key
+    ResumableUpload.objects.filter(id=stale).update(expires_at=timezone.now())
+    assert _patch(client, stale, 10, b"\0" * 10).status_code == 410
+    call_command("purge_resumable_uploads", stdout=io.StringIO())
+    assert not ResumableUpload.objects.filter(id=stale).exists()
+    assert not os.path.exists(resumable.part_path(key))
+
+
+# ─────────────────────────────────────────────────────────────────
+# 업로드 전 사전 확인 (SHA-1 / 클라이언트 pHash)
+# ─────────────────────────────────────────────────────────────────
+@pytest.mark.django_db
+def test_budget_aiauth_precheck(seed, api, query_budget, stub_gemini):
+    client = api(seed.member_ids[1])
+    data = _png((31, 32, 33))
+    sha1 = hashlib.sha1(data).hexdigest()
+    res = client.post(f"/aiauth/{seed.challenge_id}/precheck/", {"sha1": sha1}, format="json")
+    assert res.status_code == 200 and res.json()["duplicate"] is False
+
+    upload = client.post(f"/aiauth/{seed.challenge_id}/", {"image": SimpleUploadedFile("a.png", data)}, format="multipart")
+    phash = format(CompleteImage.objects.get(id=upload.json()["complete_image"]["id"]).phash & (2 ** 64 - 1), "016x")
+    with query_budget("POST /aiauth/{id}/precheck/", 3):
+        res = client.post(f"/aiauth/{seed.challenge_id}/precheck/", {"sha1": sha1.upper()}, format="json")
+    assert res.json()["duplicate"] is True
+
+    # 다른 멤버의 다른 파일이지만 pHash가 같으면 유사 보류 대상으로 안내
+    other = api(seed.member_ids[2]).post(
+        f"/aiauth/{seed.challenge_id}/precheck/", {"sha1": "0" * 40, "phash": phash}, format="json",
+    ).json()
+    assert other["duplicate"] is False and other["flagged_duplicate"] is True
+    assert upload.json()["complete_image"]["id"] in other["similar_example_ids"]
+    assert api(seed.outsider_id).post(
+        f"/aiauth/{seed.challenge_id}/precheck/", {"sha1": sha1}, format="json",
+    ).status_code == 400
+
+
+# ─────────────────────────────────────────────────────────────────
+# backfill_hashes 체크포인트 (--limit 중단 → 재개, 완료 후 재실행은 no-op)
+# ─────────────────────────────────────────────────────────────────
+@pytest.fixture
+def unhashed_images(db):
+    from django.core.files.base import ContentFile
+
+    from accounts.models import Profile
+    from challenges.models import Challenge, ChallengeMember
+
+    user = Profile.objects.create_user("backfill@test.com", "pw12345678", name="backfill")
+    challenge = Challenge.objects.create(title="backfill", owner=user, status="active")
+    member = ChallengeMember.objects.create(challenge=challenge, user=user)
+    ids = []
+    for i in range(3):
+        ci = CompleteImage(challenge_member=member, user=user)
+        ci.image.save(f"b{i}.png", ContentFile(_png((i, 100, 200))), save=False)
+        ci.save()
+        ids.append(ci.id)
+    CompleteImage.objects.filter(id__in=ids).update(file_sha1=None, phash=None)
+    return challenge.id, ids
+
+
+def _backfill(challenge_id, **opts):
+    from aiauthentications.models import BackfillCheckpoint
+
+    call_command("backfill_hashes", challenge=challenge_id, workers=1, stdout=io.StringIO(), **opts)
+    return BackfillCheckpoint.objects.get(name=f"backfill_hashes:challenge={challenge_id}:missing")
+
+
+def _hashed_ids(ids):
+    return set(CompleteImage.objects.filter(id__in=ids, file_sha1__isnull=False).values_list("id", flat=True))
+
+
+def test_backfill_resumes_after_limit(unhashed_images):
+    challenge_id, ids = unhashed_images
+    ckpt = _backfill(challenge_id, limit=2)
+    assert ckpt.finished_at is None and ckpt.last_id == ids[1]
+    assert _hashed_ids(ids) == set(ids[:2])
+
+    ckpt = _backfill(challenge_id)
+    assert ckpt.finished_at is not None
+    assert ckpt.processed == 3 and ckpt.last_id >= ids[2]  # 마지막 chunk의 id 범위 끝
+    assert _hashed_ids(ids) == set(ids)
+
+
+def test_backfill_rerun_after_full_run_is_noop(unhashed_images):
+    challenge_id, ids = unhashed_images
+    done = _backfill(challenge_id)
+    assert (done.processed, done.updated) == (3, 3)
+
+    again = _backfill(challenge_id)
+    assert (again.processed, again.updated, again.last_id) == (3, 3, done.last_id)
+
+
+def test_backfill_retries_failed_rows_on_resume(unhashed_images):
+    import os
+
+    challenge_id, ids = unhashed_images
+    image = CompleteImage.objects.get(id=ids[0]).image
+    path = image.storage.path(image.name)
+    os.rename(path, path + ".bak")  # 첫 실행에서 open error
+    try:
+        ckpt = _backfill(challenge_id)
+    finally:
+        os.rename(path + ".bak", path)
+    assert ckpt.errors == 1 and _hashed_ids(ids) == set(ids[1:])
+
+    # --restart 없이 다시 실행해도 last_id 이전의 실패 행을 재시도
+    ckpt = _backfill(challenge_id)
+    assert _hashed_ids(ids) == set(ids)
+    assert ckpt.processed == 4 and ckpt.updated == 3
+
+
+def test_backfill_with_worker_processes(unhashed_images):
+    from aiauthentications.models import BackfillCheckpoint
+
+    challenge_id, ids = unhashed_images
+    call_command("backfill_hashes", challenge=challenge_id, workers=2, chunk_size=1, stdout=io.StringIO())
+    ckpt = BackfillCheckpoint.objects.get(name=f"backfill_hashes:challenge={challenge_id}:missing")
+    assert ckpt.finished_at is not None and (ckpt.processed, ckpt.updated, ckpt.errors) == (3, 3, 0)
+    assert _hashed_ids(ids) == set(ids)
+    assert CompleteImage.objects.filter(id__in=ids, phash__isnull=True).count() == 0
+
+
+# ─────────────────────────────────────────────────────────────────
+# S3 직접 업로드 백엔드 (botocore Stubber, 네트워크 없음)
+# ─────────────────────────────────────────────────────────────────
+def _s3_storage():
+    from challenges.utils.s3_storage import S3ContentAddressedStorage
+
+    return S3ContentAddressedStorage(
+        bucket_name="proofs", location="media", region_name="us-east-1",
+        access_key="test", secret_key="test",
+    )
+
+
+def test_s3_upload_backend_presign_stat_promote():
+    from botocore.stub import Stubber
+
+    from aiauthentications.utils.presigned import S3UploadBackend, sha1_b64
+
+    storage = _s3_storage()
+    backend = S3UploadBackend(storage)
+    data = _png((91, 92, 93))
+    sha1 = hashlib.sha1(data).hexdigest()
+    key = "uploads/abc/proof.png"
+    name = storage.blob_name(f"complete_images/{sha1}.png", sha1)
+
+    target = backend.presign(key, sha1=sha1, size=len(data), content_type="image/png", expires_in=60)
+    assert target["method"] == "PUT" and key in target["url"]
+    assert target["headers"]["x-amz-checksum-sha1"] == sha1_b64(sha1)
+
+    with Stubber(backend.client) as stub:
+        stub.add_response(
+            "head_object", {"ContentLength": len(data), "ChecksumSHA1": sha1_b64(sha1)},
+            {"Bucket": "proofs", "Key": key, "ChecksumMode": "ENABLED"},
+        )
+        stub.add_client_error("head_object", service_error_code="404", http_status_code=404)
+        # promote: blob 존재 확인(없음) → 같은 버킷 안 서버 측 복사 → 스테이징 삭제
+        stub.add_client_error("head_object", service_error_code="404", http_status_code=404)
+        stub.add_response(
+            "copy_object", {},
+            {"Bucket": "proofs", "Key": f"media/{name}", "CopySource": {"Bucket": "proofs", "Key": key}},
+        )
+        stub.add_response("delete_object", {}, {"Bucket": "proofs", "Key": key})
+
+        assert backend.stat(key) == (len(data), sha1)
+        assert backend.stat("uploads/missing/proof.png") is None
+        backend.promote(key, storage, name)
+        stub.assert_no_pending_responses()
+
+
+def test_s3_upload_backend_requires_s3_media_storage():
+    from django.core.exceptions import ImproperlyConfigured
+
+    from aiauthentications.utils.presigned import S3UploadBackend
+    from challenges.models import complete_image_storage
+
+    with pytest.raises(ImproperlyConfigured):
+        S3UploadBackend(complete_image_storage())
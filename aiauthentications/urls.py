@@ -4,4 +4,15 @@ from .views import *
 
 urlpatterns = [
      path("<int:challenge_id>/",  ChallengeAIVerifyLiteView.as_view()),
+     # 업로드 전 동일 파일(SHA-1)/유사(pHash) 사전 확인
+     path("<int:challenge_id>/precheck/", UploadPrecheckView.as_view()),
+     # 직접 업로드: URL 발급 → 스토리지로 PUT → 확정 → 상태 조회
+     path("<int:challenge_id>/uploads/", ProofUploadIssueView.as_view()),
+     path("uploads/<int:upload_id>/", ProofUploadDetailView.as_view()),
+     path("uploads/<int:upload_id>/finalize/", ProofUploadFinalizeView.as_view()),
+     path("uploads/local/<str:token>/", LocalUploadReceiveView.as_view(), name="aiauth-local-upload"),
+     # 이어받기 업로드: 생성 → 조각 PATCH(Upload-Offset) → 확정
+     path("<int:challenge_id>/resumable/", ResumableUploadCreateView.as_view()),
+     path("resumable/<int:upload_id>/", ResumableUploadView.as_view()),
+     path("resumable/<int:upload_id>/finalize/", ResumableUploadFinalizeView.as_view()),
 ]
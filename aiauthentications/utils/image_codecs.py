@@ -0,0 +1,26 @@
+import threading
+
+# 이미지 코덱 지연 초기화
+# - PIL / pillow_heif는 모듈 import 시점이 아니라 실제로 이미지를 열 때 처음 로드
+#   → 워커 기동, 관리 커맨드, 테스트 실행이 코덱 import 비용을 내지 않음
+_lock = threading.Lock()
+_heif_registered = False
+
+
+def ensure_heif_opener() -> None:
+    """HEIF/HEIC 오프너를 PIL에 한 번만 등록 (스레드 안전)"""
+    global _heif_registered
+    if _heif_registered:
+        return
+    with _lock:
+        if not _heif_registered:
+            from pillow_heif import register_heif_opener
+            register_heif_opener()
+            _heif_registered = True
+
+
+def open_image(fp):
+    """HEIC 포함 PIL Image.open (코덱은 첫 호출 때 로드)"""
+    ensure_heif_opener()
+    from PIL import Image
+    return Image.open(fp)
@@ -1,13 +1,20 @@
 import hashlib
-from PIL import Image
-import imagehash
+import mmap
+import os
 
-def calc_sha1(django_file) -> str:
+from .image_codecs import open_image
+
+# 디스크에 없는(원격 스토리지 등) 파일을 스트리밍으로 읽을 때 블록 크기
+BLOCK_SIZE = 1024 * 1024
+
+
+def _calc_sha1_chunked(django_file, block_size: int = BLOCK_SIZE) -> str:
+    # 기존 방식: 파일 추상화를 통해 블록 단위로 읽기 (fallback 경로)
     pos = django_file.tell() if hasattr(django_file, "tell") else None
     try:
         django_file.seek(0)
         h = hashlib.sha1()
-        for chunk in iter(lambda: django_file.read(8192), b""):
+        for chunk in iter(lambda: django_file.read(block_size), b""):
             h.update(chunk)
         return h.hexdigest()
     finally:
@@ -16,18 +23,75 @@ def calc_sha1(django_file) -> str:
         except Exception:
             pass
 
+def sha1_path(path) -> str:
+    # 디스크 파일은 mmap으로 통째로 한 번에 해시 (파이썬 루프/버퍼 복사 없음)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha1(b"").hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return hashlib.sha1(m).hexdigest()
+
+def _local_path(django_file):
+    # TemporaryUploadedFile(임시파일) 또는 FileSystemStorage에 저장된 FieldFile
+    if hasattr(django_file, "temporary_file_path"):
+        return django_file.temporary_file_path()
+    if getattr(django_file, "_committed", True) is False:
+        return None  # 아직 스토리지에 저장되지 않은 FieldFile
+    try:
+        path = django_file.path
+    except (AttributeError, NotImplementedError, ValueError):
+        return None
+    return path if os.path.isfile(path) else None
+
+def calc_sha1(django_file) -> str:
+    """
+    파일 SHA-1 (가장 싼 경로 우선)
+    1) 업로드 핸들러가 수신 중에 계산해 둔 값(file.sha1)
+    2) 디스크 파일 → mmap
+    3) 메모리 업로드(BytesIO) → 버퍼 복사 없이 한 번에
+    4) 그 외 → 1MB 블록 스트리밍
+    """
+    pre = getattr(django_file, "sha1", None)
+    if isinstance(pre, str) and len(pre) == 40:
+        return pre
+
+    path = _local_path(django_file)
+    if path:
+        return sha1_path(path)
+
+    inner = getattr(django_file, "file", None)
+    if hasattr(inner, "getbuffer"):
+        buf = inner.getbuffer()
+        try:
+            return hashlib.sha1(buf).hexdigest()
+        finally:
+            buf.release()
+
+    return _calc_sha1_chunked(django_file)
+
 def calc_phash(django_file) -> int:
     pos = django_file.tell() if hasattr(django_file, "tell") else None
     try:
         django_file.seek(0)
-        img = Image.open(django_file).convert("RGB")
+        import imagehash  # numpy까지 끌어오므로 실제 계산 때만 로드
+
+        img = open_image(django_file).convert("RGB")
         ph = imagehash.phash(img)  # 64-bit
-        return int(str(ph), 16)
+        return _to_signed64(int(str(ph), 16))
     finally:
         try:
             django_file.seek(pos or 0)
         except Exception:
             pass
 
+def _to_signed64(v: int) -> int:
+    # BigIntegerField(부호 있는 64비트)에 들어가도록 2의 보수로 변환
+    return v - (1 << 64) if v >= (1 << 63) else v
+
+def phash_from_hex(value: str) -> int:
+    # imagehash 문자열(16 hex, 클라이언트 계산값) → DB 저장 형식(부호 있는 64비트)
+    return _to_signed64(int(value, 16))
+
 def hamming_distance64(a: int, b: int) -> int:
-    return (a ^ b).bit_count()
+    # 부호 있는 값이 섞여도 하위 64비트만 비교
+    return ((a ^ b) & 0xFFFFFFFFFFFFFFFF).bit_count()
@@ -0,0 +1,78 @@
+import io
+import struct
+from typing import Optional, Tuple
+
+# 헤더 판별에 쓰는 앞부분 최대 길이 (JPEG은 EXIF 뒤 SOF까지 필요해서 넉넉히)
+# - 이 안에서 크기를 못 찾으면(EXIF/ICC가 더 큰 JPEG 등) 받은 파일에서 read_size로 다시 확인
+SNIFF_BYTES = 64 * 1024
+
+# ISO-BMFF(ftyp) 브랜드 중 HEIF 계열로 받는 것
+HEIF_BRANDS = {b"heic", b"heix", b"hevc", b"hevx", b"heim", b"heis", b"mif1", b"msf1", b"avif"}
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """매직 바이트로 포맷 판별 (지원하지 않으면 None)"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[4:8] == b"ftyp":
+        brands = {head[i:i + 4] for i in range(8, min(len(head), 64), 4)}
+        if brands & HEIF_BRANDS:
+            return "heif"
+    return None
+
+
+def _heif_size(head: bytes) -> Optional[Tuple[int, int]]:
+    # ispe(이미지 공간 크기) 박스: size(4) 'ispe' version/flags(4) width(4) height(4)
+    # 썸네일/타일마다 있으므로 가장 큰 값을 원본 크기로 사용
+    best = None
+    i = head.find(b"ispe")
+    while i != -1 and i + 16 <= len(head):
+        w, h = struct.unpack(">II", head[i + 8:i + 16])
+        if best is None or w * h > best[0] * best[1]:
+            best = (w, h)
+        i = head.find(b"ispe", i + 4)
+    return best
+
+
+def sniff_size(fmt: str, head: bytes) -> Optional[Tuple[int, int]]:
+    """헤더 바이트만으로 (width, height) 추출, 알 수 없으면 None (전체 디코딩 안 함)"""
+    if fmt == "heif":
+        return _heif_size(head)
+    from PIL import Image
+
+    try:
+        # Image.open은 헤더만 읽고 픽셀은 load() 전까지 디코딩하지 않음
+        with Image.open(io.BytesIO(head)) as im:
+            return im.size
+    except Exception:
+        return None
+
+
+def read_size(fp) -> Optional[Tuple[int, int]]:
+    """
+    파일 객체에서 Pillow로 헤더만 읽어 (width, height), 실패하면 None
+    - SOF/ispe가 SNIFF_BYTES 뒤에 있어 sniff_size가 None일 때의 대체 경로 (픽셀은 디코딩하지 않음)
+    """
+    from .image_codecs import open_image
+
+    try:
+        fp.seek(0)
+        with open_image(fp) as im:
+            return im.size
+    except Exception:
+        return None
+    finally:
+        fp.seek(0)
+
+
+def too_many_pixels(size: Tuple[int, int]) -> bool:
+    """Pillow의 MAX_IMAGE_PIXELS(디컴프레션 폭탄 기준)를 넘는 해상도인지"""
+    from PIL import Image  # 첫 업로드 때 한 번만 로드
+
+    return size[0] * size[1] > (Image.MAX_IMAGE_PIXELS or float("inf"))
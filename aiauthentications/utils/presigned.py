@@ -0,0 +1,225 @@
+import base64
+import hashlib
+import os
+import tempfile
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.storage import storages
+from django.urls import reverse
+from django.utils._os import safe_join
+
+# 인증 사진 직접 업로드 (사전 서명 URL → 스토리지로 바로 PUT → 확정 API)
+# - 확정 API는 바이트를 다시 받지 않음: 스토리지에 기록된 크기/체크섬만 대조
+# - AIAUTH_UPLOAD_BACKEND="s3"    → S3 호환 스토리지 presigned PUT (x-amz-checksum-sha1로 스토리지가 해시 검증)
+#   complete_images도 같은 버킷(S3ContentAddressedStorage) → 확정은 서버 측 복사, 앱 워커는 바이트를 받지 않음
+#   AIAUTH_UPLOAD_BACKEND="local" → 서명 토큰 + 로컬 수신 뷰 (테스트/로컬 개발용 대체물, 같은 계약, 본문은 앱 워커가 받음)
+# - 스테이징 키는 업로드마다 고유 → 확정(promote) 때 내용 주소 이름(ContentAddressedStorage.blob_name)으로 이동
+
+# 허용 Content-Type → 스테이징/최종 파일 확장자
+CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/heic": ".heic",
+    "image/heif": ".heif",
+}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadMismatch(Exception):
+    """스토리지에 올라온 바이트가 서명된 크기/SHA-1과 다름"""
+
+
+def staging_key(sha1: str, content_type: str) -> str:
+    return f"uploads/{uuid.uuid4().hex}/{sha1}{CONTENT_TYPE_EXTENSIONS[content_type]}"
+
+
+def sha1_b64(sha1_hex: str) -> str:
+    """hex SHA-1 → S3 ChecksumSHA1 표기(base64)"""
+    return base64.b64encode(bytes.fromhex(sha1_hex)).decode()
+
+
+class LocalUploadBackend:
+    """
+    파일시스템 스테이징 (AIAUTH_UPLOAD_STAGING_DIR, MEDIA_ROOT 밖)
+    - presign: 키/SHA-1/크기를 담은 서명 토큰 URL (AIAUTH_UPLOAD_URL_TTL 초 동안 유효)
+    - receive: 수신 뷰가 요청 본문을 청크로 넘김 → 임시파일에 쓰면서 해시, 불일치면 버림 (스토리지의 체크섬 검증과 같은 동작)
+    - 검증된 SHA-1은 <파일>.sha1 사이드카에 기록 → stat이 다시 읽지 않음
+    """
+
+    salt = "aiauthentications.local-upload"
+
+    def __init__(self, root=None):
+        self.root = str(root or settings.AIAUTH_UPLOAD_STAGING_DIR)
+
+    def _path(self, key):
+        return safe_join(self.root, key)
+
+    def presign(self, key, *, sha1, size, content_type, expires_in):
+        token = signing.dumps({"k": key, "s": sha1, "n": size, "t": content_type}, salt=self.salt)
+        return {
+            "method": "PUT",
+            "url": reverse("aiauth-local-upload", args=[token]),
+            "headers": {"Content-Type": content_type},
+        }
+
+    def unsign(self, token):
+        """토큰 → {"k", "s", "n", "t"} (만료/변조 시 signing.BadSignature)"""
+        return signing.loads(token, salt=self.salt, max_age=settings.AIAUTH_UPLOAD_URL_TTL)
+
+    def receive(self, key, chunks, *, sha1, size):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        digest, received = hashlib.sha1(), 0
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in chunks:
+                    received += len(chunk)
+                    if received > size:
+                        raise UploadMismatch("Body larger than the signed size.")
+                    digest.update(chunk)
+                    out.write(chunk)
+            if received != size:
+                raise UploadMismatch("Body size does not match the signed size.")
+            if digest.hexdigest() != sha1:
+                raise UploadMismatch("SHA-1 does not match the signed checksum.")
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with open(path + ".sha1", "w") as sidecar:
+            sidecar.write(sha1)
+
+    def stat(self, key):
+        """(크기, SHA-1 hex) 또는 None (아직 안 올라왔거나 검증 실패로 버려짐)"""
+        path = self._path(key)
+        try:
+            size = os.path.getsize(path)
+            with open(path + ".sha1") as sidecar:
+                return size, sidecar.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def promote(self, key, storage, name):
+        """스테이징 파일 → 최종 스토리지 이름 (같은 blob이 이미 있으면 스테이징만 삭제)"""
+        try:
+            dest = storage.path(name)
+        except NotImplementedError:
+            # 원격 스토리지(S3 등): 이어받기 업로드처럼 앱이 받은 조각을 스토리지로 올림
+            with open(self._path(key), "rb") as fh:
+                storage.write_if_missing(name, File(fh))
+            self.delete(key)
+            return
+        if os.path.exists(dest):
+            self.delete(key)
+            return
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        # 같은 파일시스템이면 rename, 아니면 복사 (shutil.move 대신: 실패 시 목적지에 반쪽 파일을 남기지 않도록)
+        try:
+            os.replace(self._path(key), dest)
+        except OSError:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dest), prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as out, open(self._path(key), "rb") as src:
+                    while chunk := src.read(CHUNK_SIZE):
+                        out.write(chunk)
+                os.replace(tmp_path, dest)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        if storage.file_permissions_mode is not None:
+            os.chmod(dest, storage.file_permissions_mode)
+        self.delete(key)
+
+    def delete(self, key):
+        path = self._path(key)
+        for p in (path, path + ".sha1"):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+        try:
+            os.rmdir(os.path.dirname(path))  # uploads/<uuid>/ 빈 디렉터리
+        except OSError:
+            pass
+
+
+class S3UploadBackend:
+    """
+    S3 호환 스토리지 (complete_images 스토리지와 같은 버킷/클라이언트 사용)
+    - presign: put_object URL에 ContentLength/ChecksumSHA1 서명 → 다른 바이트는 스토리지가 거절
+    - stat: head_object(ChecksumMode=ENABLED)의 크기/체크섬
+    - promote: 같은 버킷 안 copy_object(서버 측 복사) 후 스테이징 삭제 (blob이 이미 있으면 삭제만)
+    - 스테이징 키(uploads/...)는 media location 밖 → 버킷 수명 주기 규칙으로 오래된 uploads/ 정리 권장
+    """
+
+    def __init__(self, storage=None):
+        storage = storage or storages["complete_images"]
+        if not hasattr(storage, "object_key"):
+            raise ImproperlyConfigured(
+                'AIAUTH_UPLOAD_BACKEND="s3" requires STORAGES["complete_images"] to be '
+                "challenges.utils.s3_storage.S3ContentAddressedStorage."
+            )
+        self.storage = storage
+        self.bucket = storage.bucket_name
+        self.client = storage.connection.meta.client
+
+    def presign(self, key, *, sha1, size, content_type, expires_in):
+        checksum = sha1_b64(sha1)
+        url = self.client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket, "Key": key, "ContentType": content_type,
+                "ContentLength": size, "ChecksumSHA1": checksum,
+            },
+            ExpiresIn=expires_in,
+        )
+        return {
+            "method": "PUT",
+            "url": url,
+            "headers": {"Content-Type": content_type, "x-amz-checksum-sha1": checksum},
+        }
+
+    def stat(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=key, ChecksumMode="ENABLED")
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        checksum = head.get("ChecksumSHA1")
+        return head["ContentLength"], base64.b64decode(checksum).hex() if checksum else None
+
+    def promote(self, key, storage, name):
+        if not storage.exists(name):
+            self.client.copy_object(
+                Bucket=storage.bucket_name,
+                Key=storage.object_key(name),
+                CopySource={"Bucket": self.bucket, "Key": key},
+            )
+        self.delete(key)
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+
+_BACKENDS = {"local": LocalUploadBackend, "s3": S3UploadBackend}
+
+
+def get_upload_backend():
+    try:
+        backend_cls = _BACKENDS[settings.AIAUTH_UPLOAD_BACKEND]
+    except KeyError:
+        raise ImproperlyConfigured(f"Unsupported AIAUTH_UPLOAD_BACKEND: {settings.AIAUTH_UPLOAD_BACKEND!r}")
+    return backend_cls()
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import tempfile
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils._os import safe_join
+
+# 이어받기(resumable) 업로드의 디스크 조각 관리
+# - 조각 파일: AIAUTH_UPLOAD_STAGING_DIR/resumable/<uuid>/data.part (MEDIA_ROOT 밖, 확정 시 내용 주소 이름으로 이동)
+# - PATCH 본문은 먼저 옆의 임시파일(.chunk)로 받음 → 행 잠금은 디스크 append 동안만 (느린 네트워크 수신 중에는 잠그지 않음)
+# - SHA-1은 워커 프로세스별로 (offset, hash 객체)를 들고 이어서 계산
+#   같은 워커가 연속 조각을 받으면 재해시 없음, 다른 워커로 넘어가면 그 offset까지 한 번 다시 읽어 따라잡음
+READ_SIZE = 64 * 1024
+CHUNK_SUFFIX = ".chunk"
+_MAX_HASH_STATES = 1024
+
+_hash_states = OrderedDict()  # upload_id → (offset, sha1 객체)
+
+
+def new_key() -> str:
+    return f"resumable/{uuid.uuid4().hex}/data.part"
+
+
+def part_path(key: str) -> str:
+    return safe_join(str(settings.AIAUTH_UPLOAD_STAGING_DIR), key)
+
+
+def create_part(key: str):
+    path = part_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+
+
+def receive_chunk(key: str, chunks, *, length: int) -> str:
+    """
+    요청 본문 → 임시 조각 파일 경로 (선언한 length와 실제 길이가 다르면 ValueError, 임시파일은 지움)
+    """
+    directory = os.path.dirname(part_path(key))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=CHUNK_SUFFIX)
+    received = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in chunks:
+                received += len(chunk)
+                if received > length:
+                    break
+                out.write(chunk)
+        if received != length:
+            raise ValueError("Chunk body does not match Content-Length.")
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def _hash_until(path: str, offset: int):
+    digest, remaining = hashlib.sha1(), offset
+    with open(path, "rb") as fh:
+        while remaining > 0:
+            block = fh.read(min(READ_SIZE, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest
+
+
+def _state(upload_id: int, path: str, offset: int):
+    state = _hash_states.pop(upload_id, None)
+    if state is None or state[0] != offset:
+        state = (offset, _hash_until(path, offset))
+    return state[1]
+
+
+def append_chunk(upload_id: int, key: str, tmp_path: str, offset: int) -> int:
+    """
+    임시 조각을 offset 위치에 붙이고 새 offset 반환 (호출자가 업로드 행을 잠근 상태에서)
+    - 이전 요청이 append 후 커밋 전에 죽었으면 파일이 offset보다 길 수 있으므로 먼저 잘라냄
+    """
+    path = part_path(key)
+    digest = _state(upload_id, path, offset)
+    try:
+        with open(path, "r+b") as out, open(tmp_path, "rb") as src:
+            out.truncate(offset)
+            out.seek(offset)
+            while block := src.read(READ_SIZE):
+                digest.update(block)
+                out.write(block)
+                offset += len(block)
+    finally:
+        os.remove(tmp_path)
+    _hash_states[upload_id] = (offset, digest)
+    while len(_hash_states) > _MAX_HASH_STATES:
+        _hash_states.popitem(last=False)
+    return offset
+
+
+def part_sha1(upload_id: int, key: str, size: int) -> str:
+    """완성된 조각 파일의 SHA-1 (이 워커가 마지막 조각을 받았으면 재해시 없음)"""
+    return _state(upload_id, part_path(key), size).hexdigest()
+
+
+def discard(upload_id: int, key: str):
+    _hash_states.pop(upload_id, None)
+    path = part_path(key)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    try:
+        os.rmdir(os.path.dirname(path))  # 받다 만 .chunk가 남아 있으면 그대로 둠 (정리 커맨드가 회수)
+    except OSError:
+        pass
@@ -0,0 +1,136 @@
+import hashlib
+
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    SkipFile,
+    StopUpload,
+    TemporaryFileUploadHandler,
+)
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+
+from challenges.models import CompleteImage
+
+from .image_sniff import SNIFF_BYTES, read_size, sniff_format, sniff_size, too_many_pixels
+
+
+class Sha1HashingMixin:
+    """
+    업로드 수신 중(청크가 메모리/임시파일에 쓰이는 동안) SHA-1을 같이 계산
+    - 완료된 UploadedFile에 file.sha1 로 붙여둠 → calc_sha1()이 다시 읽지 않음
+    """
+
+    def new_file(self, *args, **kwargs):
+        # MemoryFileUploadHandler는 super().new_file 안에서 StopFutureHandlers를 던지므로 먼저 초기화
+        self._sha1 = hashlib.sha1()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        rest = super().receive_data_chunk(raw_data, start)
+        if rest is None:
+            # 이 핸들러가 청크를 소비한 경우에만 해시 (비활성 메모리 핸들러는 그대로 통과)
+            self._sha1.update(raw_data)
+        return rest
+
+    def file_complete(self, file_size):
+        f = super().file_complete(file_size)
+        if f is not None:
+            f.sha1 = self._sha1.hexdigest()
+        return f
+
+
+class HashingMemoryFileUploadHandler(Sha1HashingMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(Sha1HashingMixin, TemporaryFileUploadHandler):
+    pass
+
+
+class AIAuthUploadHandler(Sha1HashingMixin, TemporaryFileUploadHandler):
+    """
+    /aiauth 인증 업로드 전용 핸들러 (뷰에서 request.upload_handlers로 교체해 사용)
+    - 수신 중: SHA-1 계산 + 크기 제한 + 앞부분 헤더로 포맷/해상도 판별
+    - 수신 완료: 같은 유저의 동일 파일(SHA-1)이면 즉시 중단
+    - 거절 시 self.rejection = (사유코드, 메시지) 를 남기고 StopUpload → 뷰가 응답으로 변환
+      (Pillow 전체 디코딩/재해시 없이 본문을 다 받기 전에 실패)
+    """
+
+    TOO_LARGE = "too_large"
+    UNSUPPORTED = "unsupported"
+    TOO_MANY_PIXELS = "too_many_pixels"
+    DUPLICATE = "duplicate"
+
+    # 멀티파트 경계/다른 필드 몫으로 Content-Length에 허용하는 여유분
+    MULTIPART_OVERHEAD = 64 * 1024
+
+    def __init__(self, request=None, *, user_id, max_size, field_name="image"):
+        super().__init__(request)
+        self.user_id = user_id
+        self.max_size = max_size
+        self.expected_field = field_name
+        self.rejection = None
+        self.image_format = None
+        self.image_size = None
+
+    def _reject(self, code, message, connection_reset=True):
+        self.rejection = (code, message)
+        raise StopUpload(connection_reset=connection_reset)
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # 선언된 본문 크기만으로 초과가 확실하면 한 바이트도 읽지 않고 종료
+        if content_length and content_length > self.max_size + self.MULTIPART_OVERHEAD:
+            self.rejection = (self.TOO_LARGE, f"File too large (max {self.max_size} bytes).")
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, field_name, *args, **kwargs):
+        if field_name != self.expected_field:
+            raise SkipFile()
+        self._received = 0
+        self._head = bytearray()
+        self._sniffed = False
+        super().new_file(field_name, *args, **kwargs)
+
+    def _sniff(self):
+        self._sniffed = True
+        head = bytes(self._head)
+        self._head = None
+        fmt = sniff_format(head)
+        if fmt is None:
+            self._reject(self.UNSUPPORTED, "Unsupported image format.")
+        size = sniff_size(fmt, head)
+        if size and too_many_pixels(size):
+            self._reject(self.TOO_MANY_PIXELS, "Image dimensions too large.")
+        self.image_format = fmt
+        self.image_size = size
+
+    def receive_data_chunk(self, raw_data, start):
+        self._received += len(raw_data)
+        if self._received > self.max_size:
+            self._reject(self.TOO_LARGE, f"File too large (max {self.max_size} bytes).")
+        if not self._sniffed:
+            self._head += raw_data[:SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= SNIFF_BYTES:
+                self._sniff()
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if not self._sniffed:
+            # SNIFF_BYTES보다 작은 파일
+            self._sniff()
+        if CompleteImage.objects.filter(user_id=self.user_id, file_sha1=self._sha1.hexdigest()).exists():
+            # 본문은 이미 다 받았으므로 남은 입력은 비우고 끝냄
+            self.file.close()
+            self._reject(self.DUPLICATE, "Duplicate upload: identical file (SHA-1 match)", connection_reset=False)
+        f = super().file_complete(file_size)
+        if self.image_size is None:
+            # 앞부분 헤더에서 크기를 못 찾음 (SOF 앞 APP1/APP2가 SNIFF_BYTES보다 큰 JPEG 등)
+            # → 받은 임시파일에서 헤더만 다시 읽어 해상도 검사를 건너뛰지 않게
+            self.image_size = read_size(f)
+            if self.image_size and too_many_pixels(self.image_size):
+                f.close()
+                self._reject(self.TOO_MANY_PIXELS, "Image dimensions too large.", connection_reset=False)
+        f.image_format = self.image_format
+        f.image_size = self.image_size
+        return f
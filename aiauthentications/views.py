@@ -1,16 +1,23 @@
+from django.conf import settings
+from django.core import signing
 from django.utils import timezone
+from rest_framework.exceptions import NotFound
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 
 from challenges.models import Challenge, ChallengeMember, CompleteImage
-from .serializers import AIVerifyImageSerializer
-from .gemini_service import judge_image
-
-# 로컬 중복 판정 유틸 (동일 파일 / pHash 유사)
-from .utils.image_hashing import calc_sha1, calc_phash, hamming_distance64
-
-PHASH_THRESHOLD = 6  # pHash 해밍거리 임계값(권장 6~8 사이 조정)
+from .models import ProofUpload
+from .serializers import (
+    AIVerifyImageSerializer, ResumableCreateSerializer, UploadIssueSerializer, UploadPrecheckSerializer,
+)
+from .services import (
+    MAX_UPLOAD_SIZE, OffsetMismatch, append_resumable, create_resumable, duplicate_body, finalize_resumable,
+    finalize_upload, get_resumable, issue_upload, precheck_upload, resumable_body, upload_body,
+    verification_body, verify_complete_image,
+)
+from .utils.presigned import CHUNK_SIZE, LocalUploadBackend, UploadMismatch
+from .utils.upload_handlers import AIAuthUploadHandler
 
 
 class ChallengeAIVerifyLiteView(APIView):
@@ -23,131 +30,263 @@ class ChallengeAIVerifyLiteView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, challenge_id: int):
-        # 1) 요청 검증 (이미지 필수)
-        ser = AIVerifyImageSerializer(data=request.data)
-        ser.is_valid(raise_exception=True)
-
-        # 2) 챌린지 로드
+        # 1) 챌린지 로드 (본문을 읽기 전에 끝낼 수 있는 검사부터)
         try:
             ch = Challenge.objects.get(id=challenge_id)
         except Challenge.DoesNotExist:
             return Response({"detail": "Challenge not found."}, status=404)
 
-        # 3) 챌린지 멤버십 확인
+        # 2) 챌린지 멤버십 확인
         try:
             cm = ChallengeMember.objects.get(challenge_id=challenge_id, user=request.user)
         except ChallengeMember.DoesNotExist:
             return Response({"detail": "User is not a member of this challenge."}, status=400)
 
-        # 4) 파일 추출
-        file = ser.validated_data["image"]
+        # 3) 업로드 수신 (전용 핸들러: 수신 중 SHA-1/크기 제한/헤더 판별/동일 파일 차단)
+        handler = AIAuthUploadHandler(request._request, user_id=request.user.id, max_size=MAX_UPLOAD_SIZE)
+        request._request.upload_handlers = [handler]
+        data = request.data
 
-        # ─────────────────────────────────────────────────────────────────
-        # [A-1] 동일 파일(SHA-1) 즉시 차단
-        # ─────────────────────────────────────────────────────────────────
-        try:
-            file_sha1 = calc_sha1(file)
-        except Exception as e:
-            return Response({"detail": f"Hash error: {e}"}, status=400)
-
-        # 같은 유저가 동일 파일 업로드 → 즉시 반려
-        if CompleteImage.objects.filter(user=request.user, file_sha1=file_sha1).exists():
-            return Response({
-                "challenge_id": challenge_id,
-                "user_id": request.user.id,
-                "approved": False,
-                "reasons": ["Duplicate upload: identical file (SHA-1 match)"],
-                "raw_ai_response": None,
-                "complete_image": None
-            }, status=200)
+        if handler.rejection:
+            code, message = handler.rejection
+            if code == AIAuthUploadHandler.DUPLICATE:
+                # ─────────────────────────────────────────────────────────
+                # [A-1] 동일 파일(SHA-1) 즉시 차단 (같은 유저)
+                # ─────────────────────────────────────────────────────────
+                return Response(duplicate_body(challenge_id, request.user.id), status=200)
+            status = 413 if code == AIAuthUploadHandler.TOO_LARGE else 400
+            return Response({"detail": message}, status=status)
+
+        # 4) 요청 검증 (이미지 필수) 및 파일 추출
+        ser = AIVerifyImageSerializer(data=data)
+        ser.is_valid(raise_exception=True)
+        file = ser.validated_data["image"]
+        file_sha1 = file.sha1
+        width, height = file.image_size or (None, None)
 
         # 5) 먼저 pending 객체 생성(업로드 기록 보존)
         ci = CompleteImage.objects.create(
             challenge_member=cm,
+            challenge=ch,                      # 비정규화 컬럼
             user=request.user,
             image=file,
             status=CompleteImage.Status.PENDING,
             date=timezone.localdate(),
             file_sha1=file_sha1,               # ← 저장
+            width=width,                       # 헤더에서 읽은 해상도
+            height=height,
+        )
+
+        # 6) pHash 유사 보류 + AI 판정 → 상태 결정
+        result = verify_complete_image(ci, ai_condition=ch.ai_condition, image_file=file)
+
+        ci.refresh_from_db(fields=["converted_image"])
+
+        # 7) 응답
+        return Response(verification_body(ci, result), status=200)
+
+
+class UploadPrecheckView(APIView):
+    """
+    POST /aiauth/<int:challenge_id>/precheck/
+    - 전송 전 사전 확인: {sha1, phash?} → {duplicate, reasons[], flagged_duplicate, similar_example_ids[]}
+    - duplicate=true면 업로드해도 동일 파일로 차단되므로 클라이언트는 전송을 생략
+    - 이미지 바이트 없이 (user, file_sha1) 인덱스 조회만
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, challenge_id: int):
+        ser = UploadPrecheckSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        body = precheck_upload(
+            user=request.user,
+            challenge_id=challenge_id,
+            file_sha1=ser.validated_data["sha1"],
+            phash=ser.validated_data.get("phash"),
+        )
+        return Response(body, status=200)
+
+
+class ProofUploadIssueView(APIView):
+    """
+    POST /aiauth/<int:challenge_id>/uploads/
+    - 직접 업로드 1단계: {sha1, size, content_type} → 사전 서명 업로드 URL (AIAUTH_UPLOAD_URL_TTL 초 유효)
+    - 같은 유저의 동일 파일(SHA-1)이면 409 → 전송 자체를 생략
+    - 응답: {upload_id, status, expires_at, upload: {method, url, headers}}
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, challenge_id: int):
+        ser = UploadIssueSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        upload, target = issue_upload(
+            user=request.user,
+            challenge_id=challenge_id,
+            file_sha1=ser.validated_data["sha1"],
+            size=ser.validated_data["size"],
+            content_type=ser.validated_data["content_type"],
+        )
+        if target["url"].startswith("/"):  # 로컬 수신 뷰
+            target["url"] = request.build_absolute_uri(target["url"])
+        return Response({
+            "upload_id": upload.id,
+            "status": upload.status,
+            "expires_at": upload.expires_at,
+            "upload": target,
+        }, status=201)
+
+
+class ProofUploadFinalizeView(APIView):
+    """
+    POST /aiauth/uploads/<int:upload_id>/finalize/
+    - 직접 업로드 2단계: 스토리지의 크기/SHA-1 대조 후 CompleteImage(pending) 생성 → 검증 대기열 (202)
+    - "s3" 백엔드에서는 바이트가 앱 워커를 거치지 않음 (변환/AI 판정은 process_proof_uploads)
+    - 아직 업로드되지 않았으면 409, 내용 불일치면 400
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id: int):
+        upload = finalize_upload(user=request.user, upload_id=upload_id)
+        return Response(upload_body(upload), status=202)
+
+
+class ProofUploadDetailView(APIView):
+    """
+    GET /aiauth/uploads/<int:upload_id>/
+    - 직접 업로드 상태 조회 (issued → queued → processing → done/failed)
+    - done이면 complete_image에 판정 결과(status, reasons)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, upload_id: int):
+        try:
+            upload = (ProofUpload.objects.select_related("complete_image")
+                      .get(id=upload_id, user=request.user))
+        except ProofUpload.DoesNotExist:
+            raise NotFound("Upload not found.")
+        return Response(upload_body(upload), status=200)
+
+
+class LocalUploadReceiveView(APIView):
+    """
+    PUT /aiauth/uploads/local/<token>/
+    - AIAUTH_UPLOAD_BACKEND="local"일 때의 스토리지 대체물 (테스트/로컬 개발용, 본문은 앱 워커가 받음)
+    - 인증 대신 서명 토큰(키/SHA-1/크기/Content-Type, 만료 포함)으로 권한 확인
+    - 본문은 청크 단위로 스테이징 파일에 바로 씀 (메모리에 전체를 올리지 않음)
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def put(self, request, token: str):
+        if settings.AIAUTH_UPLOAD_BACKEND != "local":
+            raise NotFound()
+        backend = LocalUploadBackend()
+        try:
+            signed = backend.unsign(token)
+        except signing.BadSignature:
+            return Response({"detail": "Invalid or expired upload URL."}, status=403)
+
+        try:
+            length = int(request.META.get("CONTENT_LENGTH") or "")
+        except ValueError:
+            return Response({"detail": "Content-Length required."}, status=411)
+        if length != signed["n"]:
+            return Response({"detail": "Content-Length does not match the signed size."}, status=400)
+        if request.content_type != signed["t"]:
+            return Response({"detail": "Content-Type does not match the signed type."}, status=400)
+
+        raw = request._request
+        try:
+            backend.receive(
+                signed["k"], iter(lambda: raw.read(CHUNK_SIZE), b""), sha1=signed["s"], size=signed["n"],
+            )
+        except UploadMismatch as e:
+            return Response({"detail": str(e)}, status=400)
+        return Response(status=200)
+
+
+def _offset_mismatch(exc):
+    """409 + 현재 offset (클라이언트는 이 위치부터 이어서 전송)"""
+    response = Response({"detail": exc.detail, "offset": exc.offset}, status=exc.status_code)
+    response["Upload-Offset"] = str(exc.offset)
+    return response
+
+
+class ResumableUploadCreateView(APIView):
+    """
+    POST /aiauth/<int:challenge_id>/resumable/
+    - 이어받기 업로드 생성: {size, content_type, sha1?} → {upload_id, offset: 0, max_chunk_size, expires_at}
+    - 이후 PATCH /aiauth/resumable/<id>/ 로 조각 전송, 끊기면 GET으로 offset 확인 후 그 위치부터 재전송
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, challenge_id: int):
+        ser = ResumableCreateSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        upload = create_resumable(
+            user=request.user,
+            challenge_id=challenge_id,
+            size=ser.validated_data["size"],
+            content_type=ser.validated_data["content_type"],
+            file_sha1=ser.validated_data["sha1"],
         )
+        response = Response(resumable_body(upload), status=201)
+        response["Location"] = request.build_absolute_uri(f"/aiauth/resumable/{upload.id}/")
+        return response
+
+
+class ResumableUploadView(APIView):
+    """
+    GET   /aiauth/resumable/<int:upload_id>/ → 현재 offset (재개 위치)
+    PATCH /aiauth/resumable/<int:upload_id>/ → 조각 추가
+      - 헤더 Upload-Offset: 이 조각의 시작 위치 (서버 offset과 다르면 409 + 현재 offset)
+      - 본문: 원시 바이트 (Content-Length 필수, 최대 AIAUTH_RESUMABLE_MAX_CHUNK)
+    """
+    permission_classes = [IsAuthenticated]
 
-        # ─────────────────────────────────────────────────────────────────
-        # [A-2] pHash 계산 및 같은 챌린지 내 유사 보류(flagged_duplicate)
-        # ─────────────────────────────────────────────────────────────────
-        phash_val = None
+    def get(self, request, upload_id: int):
+        upload = get_resumable(user=request.user, upload_id=upload_id)
+        response = Response(resumable_body(upload), status=200)
+        response["Upload-Offset"] = str(upload.offset)
+        return response
+
+    def patch(self, request, upload_id: int):
+        try:
+            offset = int(request.headers["Upload-Offset"])
+        except (KeyError, ValueError):
+            return Response({"detail": "Upload-Offset header required."}, status=400)
         try:
-            # 저장된 파일 핸들 기준으로 pHash 계산
-            phash_val = calc_phash(ci.image)
-            ci.phash = phash_val
-            ci.save(update_fields=["phash"])
-        except Exception:
-            phash_val = None  # pHash 실패는 치명적 아님
-
-        flagged = False
-        similar_ids = []
-        if phash_val is not None:
-            # 같은 챌린지의 기존 pHash들과 해밍거리 비교 (최근 N개로 제한 가능)
-            candidates = (
-                CompleteImage.objects
-                .filter(challenge_member__challenge_id=challenge_id, phash__isnull=False)
-                .exclude(id=ci.id)
-                .only("id", "phash")[:500]
+            length = int(request.META.get("CONTENT_LENGTH") or "")
+        except ValueError:
+            return Response({"detail": "Content-Length required."}, status=411)
+
+        raw = request._request
+        try:
+            upload = append_resumable(
+                user=request.user,
+                upload_id=upload_id,
+                offset=offset,
+                length=length,
+                chunks=iter(lambda: raw.read(CHUNK_SIZE), b""),
             )
-            for other in candidates:
-                if hamming_distance64(phash_val, other.phash) <= PHASH_THRESHOLD:
-                    flagged = True
-                    similar_ids.append(other.id)
-                    if len(similar_ids) >= 3:  # 충분하면 중단해도 됨
-                        break
-
-        if flagged:
-            # 보수적 운영: 보류 플래그만 세우고 최종 상태는 AI/사람 검수로 결정
-            ci.flagged_duplicate = True
-            ci.save(update_fields=["flagged_duplicate"])
-
-        # 6) AI 판정
-        verdict = judge_image(ch.ai_condition or "", file)
-
-        approved = bool(verdict.get("approved"))
-        reasons = verdict.get("reasons") or []
-        uncertain = bool(verdict.get("uncertain"))
-        raw_resp = verdict.get("raw")
-
-        # 유사 보류를 응답 사유에 표시(원하면 비활성화해도 됨)
-        if ci.flagged_duplicate and "Possible duplicate (pHash)" not in reasons:
-            reasons = ["Possible duplicate (pHash)"] + reasons
-
-        # 7) 상태 결정
-        if uncertain:
-            ci.status = CompleteImage.Status.PENDING
-            ci.reviewed_at = None
-        else:
-            ci.status = CompleteImage.Status.APPROVED if approved else CompleteImage.Status.REJECTED
-            ci.reviewed_at = timezone.now()
-
-        ci.review_reasons = "\n".join(reasons)
-        ci.save(update_fields=["status", "reviewed_at", "review_reasons"])
+        except OffsetMismatch as e:
+            return _offset_mismatch(e)
+        response = Response(resumable_body(upload), status=200)
+        response["Upload-Offset"] = str(upload.offset)
+        return response
 
-        ci.refresh_from_db(fields=["converted_image"])
 
-        # 8) 응답
-        body = {
-            "challenge_id": ch.id,
-            "user_id": request.user.id,
-            "upload_date": str(ci.date),
-            "approved": approved,
-            "reasons": reasons,
-            "raw_ai_response": raw_resp,
-            "complete_image": {
-                "id": ci.id,
-                "image_url": getattr(ci.converted_image, "url", None)
-                    if getattr(ci, "converted_image", None)
-                    else getattr(ci.image, "url", None),
-                "status": ci.status,
-                "created_at": ci.created_at,
-                "reviewed_at": ci.reviewed_at,
-                "flagged_duplicate": getattr(ci, "flagged_duplicate", False),
-                "similar_example_ids": similar_ids,  # 참고용
-            },
-        }
-        return Response(body, status=200)
\ No newline at end of file
+class ResumableUploadFinalizeView(APIView):
+    """
+    POST /aiauth/resumable/<int:upload_id>/finalize/
+    - 모든 조각을 받은 뒤 호출 → 조립된 파일로 CompleteImage 생성 + AI 판정
+    - 응답은 POST /aiauth/<challenge_id>/ 와 같은 모양 (동일 파일이면 approved=false, complete_image=null)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id: int):
+        try:
+            body = finalize_resumable(user=request.user, upload_id=upload_id)
+        except OffsetMismatch as e:
+            return _offset_mismatch(e)
+        return Response(body, status=200)
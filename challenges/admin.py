@@ -89,11 +89,11 @@ class CommentInline(admin.TabularInline):
 
 @admin.register(CompleteImage)
 class CompleteImageAdmin(admin.ModelAdmin):
-    list_display = ("id", "challenge_member", "user", "status", "date", "comment_count", "created_at")
+    list_display = ("id", "challenge", "challenge_member", "user", "status", "date", "comment_count", "created_at")
     list_filter = ("status", "date", "created_at")
-    search_fields = ("user__email", "challenge_member__challenge__title")
+    search_fields = ("user__email", "challenge__title")
     ordering = ("-created_at",)
-    readonly_fields = ("created_at",)
+    readonly_fields = ("challenge", "created_at",)
     autocomplete_fields = ("challenge_member", "user")
     inlines = [CommentInline]
 
@@ -120,6 +120,16 @@ class InviteCodeAdmin(admin.ModelAdmin):
     autocomplete_fields = ("challenge",)
 
 
+# ✅ 인증 이미지 blob (내용 주소 저장소)
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "size", "refcount", "created_at", "updated_at")
+    list_filter = ("refcount",)
+    search_fields = ("name", "sha1")
+    ordering = ("-created_at",)
+    readonly_fields = ("name", "sha1", "size", "refcount", "created_at", "updated_at")
+
+
 # ✅ 관리자 페이지 타이틀 통일
 admin.site.site_header = "Challink Admin"
 admin.site.site_title = "Challink Admin"
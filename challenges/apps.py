@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ChallengesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "challenges"
+
+    def ready(self):
+        # 초대코드 캐시 무효화 / blob 참조 해제 시그널 등록
+        from .utils import content_storage, invite_cache  # noqa: F401
@@ -0,0 +1,100 @@
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.utils import timezone
+
+from challenges.models import CompleteImage, MediaBlob, complete_image_storage
+from challenges.utils.content_storage import TMP_PREFIX
+
+
+class Command(BaseCommand):
+    help = "Reclaim unreferenced content-addressed CompleteImage blobs (refcount 0 past the grace period)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--grace-minutes", type=int, default=60, help="참조 0이 된 뒤 이 시간(분)이 지나야 삭제")
+        parser.add_argument("--recount", action="store_true", help="CompleteImage 참조를 다시 세어 refcount 보정 후 GC")
+        parser.add_argument("--sweep-orphans", action="store_true", help="MediaBlob에 없는 디스크 파일/임시파일도 정리")
+        parser.add_argument("--dry-run", action="store_true", help="삭제 대상만 출력하고 지우지 않음")
+
+    def _recount(self, dry_run):
+        refs = Counter()
+        for image, converted in CompleteImage.objects.values_list("image", "converted_image").iterator():
+            for name in (image, converted):
+                if name:
+                    refs[name] += 1
+
+        fixed = []
+        for blob in MediaBlob.objects.only("id", "name", "refcount").iterator():
+            actual = refs.pop(blob.name, 0)
+            if blob.refcount != actual:
+                blob.refcount = actual
+                fixed.append(blob)
+        missing = [MediaBlob(name=name, refcount=count) for name, count in refs.items()]
+
+        if not dry_run:
+            # updated_at도 갱신 → 방금 0이 된 blob은 유예시간 뒤에 회수
+            now = timezone.now()
+            for blob in fixed:
+                blob.updated_at = now
+            MediaBlob.objects.bulk_update(fixed, ["refcount", "updated_at"], batch_size=1000)
+            MediaBlob.objects.bulk_create(missing, batch_size=1000, ignore_conflicts=True)
+        self.stdout.write(self.style.NOTICE(f"Recount: fixed={len(fixed)}, registered={len(missing)}"))
+
+    def _sweep_orphans(self, storage, cutoff, dry_run):
+        known = set(MediaBlob.objects.values_list("name", flat=True))
+        removed = 0
+        # 파일시스템/S3 모두 스토리지의 iter_files로 나열 (challenges.utils.content_storage)
+        for name, modified in storage.iter_files("complete_images"):
+            if name in known and not os.path.basename(name).startswith(TMP_PREFIX):
+                continue
+            if modified > cutoff:
+                continue  # 쓰는 중이거나 방금 올라온 파일
+            removed += 1
+            if dry_run:
+                self.stdout.write(f"  orphan {name}")
+            else:
+                storage.delete(name)
+        return removed
+
+    def handle(self, *args, **opts):
+        dry_run = bool(opts.get("dry_run") or False)
+        grace = max(0, int(opts.get("grace_minutes") or 0))
+        cutoff = timezone.now() - timedelta(minutes=grace)
+        storage = complete_image_storage()
+
+        if opts.get("recount"):
+            self._recount(dry_run)
+
+        deleted, freed = 0, 0
+        candidates = (MediaBlob.objects
+                      .filter(refcount=0, updated_at__lt=cutoff)
+                      .values_list("id", "name", "size"))
+        for pk, name, size in candidates.iterator():
+            if dry_run:
+                self.stdout.write(f"  unreferenced {name}")
+                deleted += 1
+                continue
+            # 행 잠금 안에서 재확인 → 파일 삭제 → 행 삭제
+            # - 업로드(register_blob)도 같은 행을 잠그므로, 삭제 도중 "파일 있음"으로 보고 쓰기를 건너뛰는 일이 없음
+            # - 그 사이 다시 참조/재업로드(updated_at 갱신)된 blob은 건드리지 않음
+            with transaction.atomic():
+                blob = (MediaBlob.objects.select_for_update()
+                        .filter(pk=pk, refcount=0, updated_at__lt=cutoff).first())
+                if blob is None:
+                    continue
+                storage.delete(name)
+                blob.delete()
+            deleted += 1
+            freed += size or 0
+
+        orphans = self._sweep_orphans(storage, cutoff, dry_run) if opts.get("sweep_orphans") else 0
+
+        msg = (f"blobs={deleted}, freed≈{freed / 1024 / 1024:.1f}MB, orphans={orphans}, "
+               f"grace={grace}m, at={timezone.now()}")
+        if dry_run:
+            self.stdout.write(self.style.NOTICE(f"Dry run: {msg}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Done. {msg}"))
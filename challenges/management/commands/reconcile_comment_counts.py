@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from challenges.models import CompleteImage, Comment
+
+
+class Command(BaseCommand):
+    help = "Repair drifted CompleteImage.comment_count values with one grouped UPDATE (periodic reconciliation)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--challenge", type=int, default=0, help="특정 challenge_id만 처리")
+        parser.add_argument("--dry-run", action="store_true", help="어긋난 행 수만 출력하고 수정하지 않음")
+
+    def handle(self, *args, **opts):
+        challenge_id = int(opts.get("challenge") or 0)
+        dry_run = bool(opts.get("dry_run") or False)
+
+        # 사진별 삭제되지 않은 댓글 수 (상관 서브쿼리 → GROUP BY complete_image)
+        live_count = (
+            Comment.objects
+            .filter(complete_image=OuterRef("pk"), is_deleted=False)
+            .order_by()
+            .values("complete_image")
+            .annotate(c=Count("id"))
+            .values("c")
+        )
+        actual = Coalesce(Subquery(live_count, output_field=IntegerField()), Value(0))
+
+        qs = CompleteImage.objects.all()
+        if challenge_id:
+            qs = qs.filter(challenge_id=challenge_id)
+
+        drifted = qs.annotate(actual=actual).exclude(comment_count=F("actual"))
+
+        if dry_run:
+            self.stdout.write(self.style.NOTICE(
+                f"Dry run: drifted={drifted.count()} (challenge={challenge_id or 'ALL'})"
+            ))
+            return
+
+        with transaction.atomic():
+            updated = drifted.update(comment_count=actual)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. repaired={updated}, challenge={challenge_id or 'ALL'}, at={timezone.now()}"
+        ))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("challenges", "0011_completeimage_converted_image"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["complete_image", "is_deleted", "created_at"],
+                name="challenges__complet_bc9eb1_idx",
+            ),
+        ),
+    ]
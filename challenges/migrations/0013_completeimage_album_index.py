@@ -0,0 +1,14 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:04
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("challenges", "0012_comment_keyset_index"),
+    ]
+
+    # 앨범용 (challenge_member, status, created_at) 인덱스는 만들지 않음
+    # - 다음 0014의 비정규화 challenge_id + 복합 인덱스가 같은 조회를 조인 없이 커버 (추가 후 바로 삭제하는 왕복 제거)
+    operations = []
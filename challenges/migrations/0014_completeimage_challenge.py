@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("challenges", "0013_completeimage_album_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="completeimage",
+            name="challenge",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="complete_images",
+                to="challenges.challenge",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="completeimage",
+            index=models.Index(
+                fields=["challenge", "status", "created_at"],
+                name="ci_chal_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="completeimage",
+            index=models.Index(
+                fields=["challenge", "status", "date"], name="ci_chal_status_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="completeimage",
+            index=models.Index(
+                fields=["challenge", "user", "status", "date"],
+                name="ci_chal_user_status_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="completeimage",
+            index=models.Index(fields=["challenge", "phash"], name="ci_chal_phash_idx"),
+        ),
+    ]
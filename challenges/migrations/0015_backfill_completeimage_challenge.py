@@ -0,0 +1,39 @@
+from django.db import migrations
+from django.db.models import Max, OuterRef, Subquery
+
+CHUNK_SIZE = 5000
+
+
+def forwards(apps, schema_editor):
+    CompleteImage = apps.get_model("challenges", "CompleteImage")
+    ChallengeMember = apps.get_model("challenges", "ChallengeMember")
+
+    member_challenge = ChallengeMember.objects.filter(
+        pk=OuterRef("challenge_member_id")
+    ).values("challenge_id")[:1]
+
+    # id 범위 단위로 잘라서 UPDATE (대량 테이블에서 긴 락/트랜잭션 방지)
+    max_id = CompleteImage.objects.aggregate(m=Max("id"))["m"] or 0
+    for lo in range(0, max_id + 1, CHUNK_SIZE):
+        CompleteImage.objects.filter(
+            id__gte=lo,
+            id__lt=lo + CHUNK_SIZE,
+            challenge__isnull=True,
+        ).update(challenge_id=Subquery(member_challenge))
+
+
+def backwards(apps, schema_editor):
+    # 컬럼 자체는 0014 롤백 시 제거되므로 여기서는 할 일 없음
+    pass
+
+
+class Migration(migrations.Migration):
+    # 청크마다 커밋되도록 마이그레이션 전체 트랜잭션은 끔
+    atomic = False
+
+    dependencies = [
+        ("challenges", "0014_completeimage_challenge"),
+    ]
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
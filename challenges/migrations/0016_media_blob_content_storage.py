@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:13
+
+from collections import Counter
+
+import challenges.models
+from django.db import migrations, models
+
+
+def seed_refcounts(apps, schema_editor):
+    # 기존 CompleteImage가 참조하는 파일을 blob으로 등록 (GC가 사용 중인 파일을 지우지 않도록)
+    CompleteImage = apps.get_model("challenges", "CompleteImage")
+    MediaBlob = apps.get_model("challenges", "MediaBlob")
+    refs = Counter()
+    for image, converted in CompleteImage.objects.values_list("image", "converted_image").iterator():
+        for name in (image, converted):
+            if name:
+                refs[name] += 1
+    MediaBlob.objects.bulk_create(
+        [MediaBlob(name=name, refcount=count) for name, count in refs.items()],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("challenges", "0015_backfill_completeimage_challenge"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="completeimage",
+            name="converted_image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=challenges.models.complete_image_storage,
+                upload_to="complete_images/converted/",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="completeimage",
+            name="image",
+            field=models.ImageField(
+                storage=challenges.models.complete_image_storage,
+                upload_to="complete_images/",
+            ),
+        ),
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("sha1", models.CharField(blank=True, max_length=40, null=True)),
+                ("size", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("refcount", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "challenges_media_blob",
+                "indexes": [models.Index(fields=["refcount", "updated_at"], name="media_blob_gc_idx")],
+            },
+        ),
+        migrations.RunPython(seed_refcounts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("challenges", "0016_media_blob_content_storage"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="completeimage",
+            index=models.Index(fields=["image"], name="ci_image_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="completeimage",
+            index=models.Index(
+                fields=["converted_image"], name="ci_converted_image_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("challenges", "0017_complete_image_file_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="completeimage",
+            index=models.Index(fields=["user", "file_sha1"], name="ci_user_sha1_idx"),
+        ),
+    ]
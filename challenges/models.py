@@ -1,10 +1,8 @@
 from django.db import models
 from django.conf import settings
-from PIL import Image
 import io, os
 from django.core.files.base import ContentFile
-from pillow_heif import register_heif_opener
-register_heif_opener()
+from django.core.files.storage import storages
 
 
 # ✅ 챌린지 카테고리
@@ -117,6 +115,11 @@ class ChallengeMember(models.Model):
         return f"user#{self.user_id} in challenge#{self.challenge_id}"
 
 
+def complete_image_storage():
+    # settings.STORAGES["complete_images"] (내용 주소 기반 저장소)
+    return storages["complete_images"]
+
+
 # ✅ 인증 이미지 (AI 인증 대상)
 class CompleteImage(models.Model):
     class Status(models.TextChoices):
@@ -134,9 +137,20 @@ class CompleteImage(models.Model):
         on_delete=models.CASCADE,
         related_name="complete_images",
     )
-    image = models.ImageField(upload_to="complete_images/")
+    # challenge_member.challenge_id 비정규화 (핫 쿼리에서 ChallengeMember 조인 제거용)
+    # - 생성 시 save()에서 자동 채움, 기존 행은 0015 마이그레이션으로 backfill
+    challenge = models.ForeignKey(
+        "challenges.Challenge",
+        on_delete=models.CASCADE,
+        related_name="complete_images",
+        null=True,
+        blank=True,
+        db_index=False,  # 아래 복합 인덱스들의 선두 컬럼으로 커버
+    )
+    image = models.ImageField(upload_to="complete_images/", storage=complete_image_storage)
     converted_image = models.ImageField(
         upload_to="complete_images/converted/",
+        storage=complete_image_storage,
         null=True,
         blank=True
     )
@@ -162,14 +176,49 @@ class CompleteImage(models.Model):
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["-created_at"]),
+            # 앨범 키셋 페이지네이션 (챌린지별 승인 이미지 최신순)
+            models.Index(fields=["challenge", "status", "created_at"], name="ci_chal_status_created_idx"),
+            # success_today / 오늘 인증 유저 / 최신 승인 이미지
+            models.Index(fields=["challenge", "status", "date"], name="ci_chal_status_date_idx"),
+            # 참가자별 연속 인증(streak) 계산
+            models.Index(fields=["challenge", "user", "status", "date"], name="ci_chal_user_status_date_idx"),
+            # 같은 유저의 동일 파일(SHA-1) 차단 / 업로드 전 사전 확인 (file_sha1 단일 인덱스는 변환본 재사용 조회용)
+            models.Index(fields=["user", "file_sha1"], name="ci_user_sha1_idx"),
+            # 같은 챌린지 내 pHash 유사 후보 스캔
+            models.Index(fields=["challenge", "phash"], name="ci_chal_phash_idx"),
+            # 미디어 뷰 권한 확인: 파일 이름 → 인증 기록 (원본/변환본)
+            models.Index(fields=["image"], name="ci_image_idx"),
+            models.Index(fields=["converted_image"], name="ci_converted_image_idx"),
         ]
 
-    def save(self, *args, **kwargs):
-        """HEIC → JPEG 변환본 자동 생성 (동기 방식)"""
-        if self.image and not self.converted_image:
+    def save(self, *args, convert=True, **kwargs):
+        """
+        HEIC → JPEG 변환본 자동 생성 (동기 방식)
+        - convert=False: 파일을 열지 않고 저장만 (직접 업로드 확정 시, 변환은 검증 워커가 수행)
+        """
+        # 비정규화 컬럼 채우기 (challenge_member가 이미 로드돼 있으면 추가 쿼리 없음)
+        if self.challenge_id is None and self.challenge_member_id is not None:
+            self.challenge_id = self.challenge_member.challenge_id
+
+        adding = self._state.adding
+
+        # 같은 파일(SHA-1)의 변환본이 이미 있으면 재사용 (변환/저장 생략)
+        if convert and self.image and not self.converted_image and self.file_sha1:
+            twin = (CompleteImage.objects
+                    .filter(file_sha1=self.file_sha1)
+                    .exclude(converted_image="")
+                    .exclude(converted_image__isnull=True)
+                    .values_list("converted_image", flat=True)
+                    .first())
+            if twin:
+                self.converted_image.name = twin
+
+        if convert and self.image and not self.converted_image:
             try:
                 self.image.open()
-                img = Image.open(self.image).convert("RGB")
+                # PIL/HEIF 코덱은 실제 변환 시점에 로드 (모델 import 비용 최소화)
+                from aiauthentications.utils.image_codecs import open_image
+                img = open_image(self.image).convert("RGB")
                 buf = io.BytesIO()
                 img.save(buf, format="JPEG", quality=85)
                 filename = os.path.splitext(self.image.name)[0] + ".jpg"
@@ -180,10 +229,35 @@ class CompleteImage(models.Model):
 
         super().save(*args, **kwargs)
 
+        if adding:
+            # blob 참조 수 증가 (삭제 시 post_delete에서 감소)
+            from .utils.content_storage import acquire_blobs
+            acquire_blobs([self.image.name, self.converted_image.name])
+
     def __str__(self):
         return f"Image #{self.id} by user#{self.user_id}"
 
 
+# ✅ 내용 주소 저장소 blob (참조 수 관리)
+class MediaBlob(models.Model):
+    name = models.CharField(max_length=255, unique=True)  # 스토리지 상대 경로
+    sha1 = models.CharField(max_length=40, null=True, blank=True)
+    size = models.PositiveBigIntegerField(null=True, blank=True)
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "challenges_media_blob"
+        indexes = [
+            # GC: 참조 0 + 유예시간 지난 blob 스캔
+            models.Index(fields=["refcount", "updated_at"], name="media_blob_gc_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} (refs={self.refcount})"
+
+
 # ✅ 댓글
 class Comment(models.Model):
     complete_image = models.ForeignKey(
@@ -208,6 +282,8 @@ class Comment(models.Model):
         db_table = "challenges_comment"
         indexes = [
             models.Index(fields=["complete_image"]),
+            # 사진별 댓글 키셋 페이지네이션 (삭제 제외 + created_at 순)
+            models.Index(fields=["complete_image", "is_deleted", "created_at"]),
         ]
 
     def __str__(self):
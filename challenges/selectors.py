@@ -7,57 +7,149 @@ from typing import Optional, Tuple
 from django.db import models
 from django.db.models import Q, Prefetch
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from main.utils.pagination import encode_cursor, decode_cursor
 from .models import Challenge, ChallengeMember, CompleteImage, Comment
+from .utils.card_projection import CARD_COLUMNS, member_card_columns
+from .utils.invite_cache import resolve_invite_code
 from typing import Optional
 
 
-# 사진 1개 상세 조회 (댓글 포함)
-def get_complete_image_with_comments(photo_id: int):
-    return (
+COMMENT_PAGE_SIZE = 20
+COMMENT_MAX_PAGE_SIZE = 100
+
+ALBUM_PAGE_SIZE = 20
+ALBUM_MAX_PAGE_SIZE = 100
+
+
+def _live_comments():
+    # 삭제된 댓글은 SQL 단계에서 제외 + (created_at, id) 키셋 정렬
+    # → (complete_image, is_deleted, created_at) 복합 인덱스를 그대로 탄다
+    return (Comment.objects
+            .select_related("user")
+            .filter(is_deleted=False)
+            .order_by("created_at", "id"))
+
+
+def _keyset_page(rows: list, limit: int):
+    # limit+1개를 가져와서 넘치면 다음 페이지가 있다고 판단 → (rows, next_cursor)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def _decode_created_id_cursor(cursor: str):
+    # (created_at, id) 커서 → 파싱된 값
+    created_raw, id_raw = decode_cursor(cursor)
+    try:
+        created_at = parse_datetime(created_raw)  # 형식은 맞지만 없는 날짜(13월 등)면 ValueError
+    except ValueError:
+        created_at = None
+    # isdigit()은 "²" 같은 비ASCII 숫자도 참 → int()에서 ValueError(500)가 나지 않도록 ASCII만 허용
+    if created_at is None or not (id_raw.isascii() and id_raw.isdigit()):
+        raise ValidationError({"cursor": "유효하지 않은 커서입니다."})
+    return created_at, int(id_raw)
+
+
+# 사진 1개 상세 조회 (첫 N개 댓글 + 다음 커서)
+def get_complete_image_with_comments(photo_id: int, comment_limit: int = COMMENT_PAGE_SIZE):
+    photo = (
         CompleteImage.objects
         .select_related("user")
         .prefetch_related(
-            Prefetch("comments", queryset=Comment.objects.select_related("user").order_by("created_at"))
+            Prefetch("comments", queryset=_live_comments()[:comment_limit + 1], to_attr="comment_page")
         )
         .filter(id=photo_id)
         .first()
     )
+    if photo:
+        photo.comment_page, photo.comments_next_cursor = _keyset_page(photo.comment_page, comment_limit)
+    return photo
+
+
+# 사진 댓글 목록 (키셋 페이지네이션: created_at, id 오름차순)
+def list_photo_comments(photo_id: int, *, cursor: Optional[str] = None, limit: int = COMMENT_PAGE_SIZE):
+    qs = _live_comments().filter(complete_image_id=photo_id)
+
+    if cursor:
+        created_at, last_id = _decode_created_id_cursor(cursor)
+        qs = qs.filter(
+            Q(created_at__gt=created_at) |
+            Q(created_at=created_at, id__gt=last_id)
+        )
+
+    return _keyset_page(list(qs[:limit + 1]), limit)
 
 
 # 챌린지 내 모든 사진 조회 (+ 이름 필터링)
 def get_challenge_images(challenge_id: int, name: str = None):
     qs = (CompleteImage.objects
-            .select_related("user", "challenge_member__challenge")
+            .select_related("user")
             .filter(
-                challenge_member__challenge_id=challenge_id,
+                challenge_id=challenge_id,          # 비정규화 컬럼 (조인 없음)
                 status="approved",                 # 🔹 승인된 사진만
             ))
 
     if name and name.strip():
-        qs = qs.filter(user__name__icontains=name.strip())
+        # 이미지 전체를 user와 조인하지 않고, 이름이 맞는 멤버 id만 먼저 추려서 필터
+        # → (challenge, status, created_at) 복합 인덱스를 그대로 탄다
+        member_ids = ChallengeMember.objects.filter(
+            challenge_id=challenge_id,
+            user__name__icontains=name.strip(),
+        ).values("id")
+        qs = qs.filter(challenge_member_id__in=member_ids)
 
-    return qs.order_by("-created_at")
+    return qs.order_by("-created_at", "id")
 
 
+# 앨범 한 페이지 (키셋 페이지네이션: -created_at, id)
+def get_challenge_images_page(challenge_id: int, name: str = None, *,
+                              cursor: Optional[str] = None, limit: int = ALBUM_PAGE_SIZE):
+    qs = get_challenge_images(challenge_id, name)
+
+    if cursor:
+        created_at, last_id = _decode_created_id_cursor(cursor)
+        qs = qs.filter(
+            Q(created_at__lt=created_at) |
+            Q(created_at=created_at, id__gt=last_id)
+        )
+
+    return _keyset_page(list(qs[:limit + 1]), limit)
+
+
+# 앨범 변경 여부 판단용 상태값 (ETag 계산용, 집계 쿼리 1번)
+def get_challenge_images_state(challenge_id: int, name: str = None) -> dict:
+    return get_challenge_images(challenge_id, name).order_by().aggregate(
+        count=models.Count("id"),
+        latest_created_at=models.Max("created_at"),
+        latest_reviewed_at=models.Max("reviewed_at"),
+        comment_total=models.Sum("comment_count"),
+    )
+
 
-def list_challenges_selector(
+
+def _filter_challenges(
     *,
-    user=None,
-    include_full_slots: bool = False,   # True면 정원 가득도 포함
-    order: str = "recent",              # recent(=created_at desc) | popular | oldest
+    include_full_slots: bool = False,
+    order: str = "recent",
     category_id: Optional[int] = None,
     search: Optional[str] = None,
+    client_key: Optional[str] = None,
 ):
-    now = timezone.now()
-
+    # 공개 목록 필터/정렬 (list_challenge_cards_selector)
     base_qs = Challenge.objects.select_related("category", "owner")
 
     # --- (1) 초대코드 검색 여부 분기 ---
     if search and search.strip().lower().startswith("challink_"):
-        qs = base_qs.filter(
-            invite_codes__code=search.strip(),   # 대소문자 구분
-            invite_codes__expires_at__gte=now
-        ).distinct()
+        # 캐시로 code → challenge_id 해석 (InviteCode 조인 없음, 없는 코드는 DB 미조회)
+        invite = resolve_invite_code(search.strip(), client_key=client_key)   # 대소문자 구분
+        if invite is None or invite.is_expired:
+            qs = base_qs.none()
+        else:
+            qs = base_qs.filter(id=invite.challenge_id)
     else:
         qs = base_qs.filter(status="active")
 
@@ -85,40 +177,9 @@ def list_challenges_selector(
         qs = qs.order_by("created_at", "id")
     else:  # recent (기본)
         qs = qs.order_by("-created_at", "-id")
-
-
-    # --- (6) 로그인 유저 참여 여부 매핑 ---
-    # N+1 방지를 위해 한 번에 내가 속한 멤버십을 가져와서
-    # 각 Challenge 객체에 __me_member__ 속성으로 붙여준다.
-    if user and getattr(user, "is_authenticated", False):
-        # 우선 현재 쿼리셋에서 챌린지 id들을 한 번에 뽑는다.
-        challenge_ids = list(qs.values_list("id", flat=True))
-
-        # 내가 참여 중인 멤버십들만 조회
-        memberships = (
-            ChallengeMember.objects
-            .filter(user=user, challenge_id__in=challenge_ids)
-            .only("id", "challenge_id", "user_id", "role", "joined_at")
-        )
-
-        # challenge_id 별로 묶어두기
-        member_map = {}
-        for m in memberships:
-            member_map.setdefault(m.challenge_id, []).append(m)
-
-        # 쿼리셋을 리스트로 평가하고, 각 객체에 __me_member__ 속성을 붙인다.
-        challenge_list = list(qs)
-        for ch in challenge_list:
-            setattr(ch, "__me_member__", member_map.get(ch.id, []))
-
-        # ListCreateAPIView 에서는 리스트도 그대로 사용 가능
-        return challenge_list
-
-    # 로그인 유저가 아니면 그냥 원래 쿼리셋 반환
     return qs
 
 
-
 def my_challenges_selector(
     *,
     user,
@@ -170,6 +231,46 @@ def my_challenges_selector(
     return qs
 
 
+# 인증 이미지 파일 열람 권한 (미디어 뷰): 이 blob을 쓰는 인증 기록의 챌린지 멤버인지
+# - 내용 주소 저장소라 같은 blob을 여러 챌린지가 참조할 수 있음 → 그중 하나라도 멤버면 허용
+def can_view_complete_image_file(user, name: str) -> bool:
+    if user.is_staff:
+        return True
+    challenge_ids = (CompleteImage.objects
+                     .filter(Q(image=name) | Q(converted_image=name))
+                     .values("challenge_id"))
+    return ChallengeMember.objects.filter(user=user, challenge_id__in=challenge_ids).exists()
+
+
+# 서명 URL 열람 권한: 토큰에 실린 user가 지금도 그 챌린지 멤버(또는 스태프)인지 (쿼리 1회)
+def can_view_signed_complete_image(user_id: int, challenge_id: int) -> bool:
+    return (Profile.objects
+            .filter(id=user_id)
+            .filter(Q(is_staff=True) | Q(challenge_members__challenge_id=challenge_id))
+            .exists())
+
+
+# ─────────────────────────────────────────────────────────────────
+# 카드 목록 투영 (values_list 튜플, 변환은 challenges.utils.card_projection)
+# ─────────────────────────────────────────────────────────────────
+def list_challenge_cards_selector(**filters):
+    """공개 목록 카드 행 (참여 여부는 joined_challenge_ids로 페이지 행만)"""
+    return _filter_challenges(**filters).values_list(*CARD_COLUMNS)
+
+
+def joined_challenge_ids(user, challenge_ids) -> set:
+    if not (user and getattr(user, "is_authenticated", False)) or not challenge_ids:
+        return set()
+    return set(ChallengeMember.objects
+               .filter(user=user, challenge_id__in=challenge_ids)
+               .values_list("challenge_id", flat=True))
+
+
+def my_challenge_cards_selector(*, completed: bool = False, **filters):
+    """my_challenges_selector의 멤버십 + 카드 컬럼 행"""
+    return my_challenges_selector(**filters).values_list(*member_card_columns(completed=completed))
+
+
 def challenge_detail_selector(challenge_id: int, *, user=None):
     challenge = (Challenge.objects
                 .select_related("category", "owner")
@@ -188,7 +289,7 @@ def challenge_detail_selector(challenge_id: int, *, user=None):
     # 오늘 성공 수(success_today): 승인된(approved) 인증 이미지를 "오늘 날짜"로 집계
     today = timezone.localdate()
     success_today = CompleteImage.objects.filter(
-        challenge_member__challenge_id=challenge_id,
+        challenge_id=challenge_id,
         status="approved",
         date=today,
     ).count()
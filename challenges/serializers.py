@@ -7,6 +7,16 @@ from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
 from .services import generate_invite_code_for_challenge, Conflict
+from .utils.media_signing import signed_media_url
+from aiauthentications.utils.image_codecs import ensure_heif_opener
+
+
+class HeifImageField(serializers.ImageField):
+    """HEIC/HEIF도 받는 ImageField (Pillow 검증 직전에 HEIF 오프너 등록, 코덱은 첫 업로드 때 로드)"""
+
+    def to_internal_value(self, data):
+        ensure_heif_opener()
+        return super().to_internal_value(data)
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -48,7 +58,9 @@ class CommentCreateSerializer(serializers.ModelSerializer):
 class CompleteImageDetailSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source="user.name", read_only=True)
     user_id = serializers.IntegerField(source="user.id", read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    # selector에서 첫 N개 댓글(comment_page)과 다음 커서를 붙여줌
+    comments = CommentSerializer(source="comment_page", many=True, read_only=True)
+    comments_next_cursor = serializers.CharField(read_only=True, allow_null=True)
     image = serializers.SerializerMethodField()
 
     class Meta:
@@ -63,15 +75,16 @@ class CompleteImageDetailSerializer(serializers.ModelSerializer):
             "comment_count",
             "created_at",
             "comments",
+            "comments_next_cursor",
         ]
         read_only_fields = fields
 
     def get_image(self, obj):
-        # 변환본이 있으면 우선 사용
-        if getattr(obj, "converted_image", None):
-            return obj.converted_image.url.lstrip("/")
-        # 없으면 원본 사용
-        return obj.image.url.lstrip("/") if obj.image else None
+        # 변환본이 있으면 우선, 없으면 원본 (<img src>로 바로 쓰도록 요청자 기준 서명 URL)
+        request = self.context.get("request")
+        url = signed_media_url(obj.converted_image or obj.image, challenge_id=obj.challenge_id,
+                               user_id=request.user.id if request else None)
+        return url.lstrip("/") if url else None
 
 
 class CompleteImageListSerializer(serializers.ModelSerializer):
@@ -93,11 +106,11 @@ class CompleteImageListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
     def get_image(self, obj):
-        # 변환본이 있으면 우선 사용
-        if getattr(obj, "converted_image", None):
-            return obj.converted_image.url.lstrip("/")
-        # 없으면 원본 사용
-        return obj.image.url.lstrip("/") if obj.image else None
+        # 변환본이 있으면 우선, 없으면 원본 (<img src>로 바로 쓰도록 요청자 기준 서명 URL)
+        request = self.context.get("request")
+        url = signed_media_url(obj.converted_image or obj.image, challenge_id=obj.challenge_id,
+                               user_id=request.user.id if request else None)
+        return url.lstrip("/") if url else None
 
 
 
@@ -239,7 +252,7 @@ class ChallengeCreateSerializer(serializers.Serializer):
     subtitle = serializers.CharField(required=False, allow_blank=True)
     description = serializers.CharField(required=False, allow_blank=True)
     category_id = serializers.IntegerField()
-    cover_image = serializers.ImageField(required=False, allow_null=True)
+    cover_image = HeifImageField(required=False, allow_null=True)
     entry_fee = serializers.IntegerField(min_value=0)
     duration_weeks = serializers.IntegerField(min_value=1)
     freq_type = serializers.ChoiceField(choices=["DAILY", "WEEKDAYS", "WEEKENDS", "N_DAYS_PER_WEEK"])
@@ -11,6 +11,7 @@ from django.contrib.auth import get_user_model
 from rest_framework.exceptions import APIException, PermissionDenied, NotFound, ValidationError
 from rest_framework import status
 
+from accounts.selectors import select_fresh_user
 from .models import (
     CompleteImage,
     Comment,
@@ -18,6 +19,7 @@ from .models import (
     ChallengeMember,
     InviteCode,
 )
+from .utils.invite_cache import resolve_invite_code
 
 
 
@@ -36,9 +38,35 @@ def create_comment(photo_id: int, user, content: str, x_ratio=None, y_ratio=None
           y_ratio=y_ratio,
      )
 
-     # 댓글 수 증가 (atomic)
-     photo.comment_count = photo.comments.filter(is_deleted=False).count()
-     photo.save(update_fields=["comment_count"])
+     # 댓글 수 증가 (atomic, 재집계 없이 F() 델타만 반영)
+     CompleteImage.objects.filter(pk=photo.pk).update(comment_count=F("comment_count") + 1)
+
+     return comment
+
+
+# 댓글 삭제(soft delete) 서비스 로직
+@transaction.atomic
+def soft_delete_comment(photo_id: int, comment_id: int, user) -> Comment:
+     # is_deleted 플래그만 세우고 comment_count --
+     comment = get_object_or_404(
+          Comment.objects.select_for_update(),
+          id=comment_id,
+          complete_image_id=photo_id,
+     )
+     if comment.user_id != user.id and not getattr(user, "is_staff", False):
+          raise PermissionDenied("본인이 작성한 댓글만 삭제할 수 있습니다.")
+
+     # 이미 삭제된 댓글이면 카운터를 건드리지 않음 (멱등)
+     if comment.is_deleted:
+          return comment
+
+     comment.is_deleted = True
+     comment.save(update_fields=["is_deleted"])
+
+     # 댓글 수 감소 (0 미만으로 내려가지 않도록 가드)
+     CompleteImage.objects.filter(pk=photo_id, comment_count__gt=0).update(
+          comment_count=F("comment_count") - 1
+     )
 
      return comment
 
@@ -183,7 +211,8 @@ def join_challenge(*, user, challenge_id: int, agree_terms: bool = False):
 
         entry_fee_charged = required
     else:
-        user_point_balance_after = getattr(user, "point_balance", 0)
+        # 참가비 없음: 캐시된 request.user 대신 최신 잔액 (select_fresh_user 명시적 사용)
+        user_point_balance_after = select_fresh_user(user).point_balance
 
     # 6) 멤버 생성
     member = ChallengeMember.objects.create(
@@ -322,24 +351,21 @@ def validate_invite_code_and_build_join_payload(*, user, invite_code: str) -> di
         - 상태/정원/포인트 등을 보고 can_join / message 결정
         - 실제 참가(ChallengeMember 생성)는 여기서 하지 않음
     """
-    now = timezone.now()
-
-    try:
-        invite = (
-            InviteCode.objects
-            .select_related("challenge")
-            .get(code=invite_code)
-        )
-    except InviteCode.DoesNotExist:
+    # 초대코드 해석은 캐시 우선 (없는 코드도 음성 캐시, 실패 반복 시 429)
+    invite = resolve_invite_code(invite_code, client_key=f"user:{user.id}")
+    if invite is None:
         # 404 Not Found
         raise NotFound("해당 초대코드를 찾을 수 없습니다.")
 
     # 만료 체크
-    if invite.expires_at <= now:
+    if invite.is_expired:
         # 410 Gone
         raise Gone("초대코드가 만료되었습니다.")
 
-    challenge: Challenge = invite.challenge
+    try:
+        challenge: Challenge = Challenge.objects.get(pk=invite.challenge_id)
+    except Challenge.DoesNotExist:
+        raise NotFound("해당 초대코드를 찾을 수 없습니다.")
 
     # 이미 이 챌린지에 참여했는지 확인
     my_member = (
@@ -1,3 +1,558 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.core.files.base import ContentFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import Profile
+from aiauthentications.services import find_similar_images
+from challenges.models import Challenge, ChallengeCategory, ChallengeMember, CompleteImage
+from challenges.selectors import challenge_detail_selector, get_challenge_images
+from challenges.views import _calc_streak_days_by_user
+
+
+def _make_image(cm, **kwargs):
+    # 파일 변환(save의 HEIC→JPEG) 없이 행만 만들기
+    ci = CompleteImage(challenge_member=cm, user_id=cm.user_id, **kwargs)
+    ci.image.name = "complete_images/test.jpg"
+    ci.converted_image.name = "complete_images/converted/test.jpg"
+    ci.save()
+    return ci
+
+
+class CompleteImageQueryPlanTests(TestCase):
+    """
+    CompleteImage 핫 쿼리가 비정규화된 challenge_id + 복합 인덱스를 타는지 확인
+    - 셀렉터/서비스를 직접 호출해 실제로 나간 SQL을 검사 (ChallengeMember 조인이 다시 생기면 실패)
+    - SQLite에서는 캡처한 SQL의 EXPLAIN QUERY PLAN으로 사용 인덱스까지 확인
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Profile.objects.create_user("plan@test.com", "pw12345678", name="plan")
+        cls.challenge = Challenge.objects.create(title="plan", owner=cls.user, status="active")
+        cls.member = ChallengeMember.objects.create(challenge=cls.challenge, user=cls.user)
+        today = timezone.localdate()
+        for i in range(5):
+            _make_image(cls.member, status="approved", date=today - timedelta(days=i), phash=i)
+
+    def assertUsesIndex(self, func, index_name, *args, **kwargs):
+        """
+        func(*args, **kwargs)를 실제로 실행해 CompleteImage 쿼리를 캡처한 뒤 검사
+        (셀렉터 안의 쿼리가 바뀌면 테스트도 같이 따라가도록 쿼리를 손으로 다시 만들지 않음)
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            result = func(*args, **kwargs)
+        sqls = [q["sql"] for q in ctx.captured_queries if 'FROM "challenges_complete_image"' in q["sql"]]
+        self.assertTrue(sqls, "CompleteImage 쿼리가 실행되지 않음")
+        for sql in sqls:
+            self.assertNotIn('JOIN "challenges_challenge_member"', sql)
+            if connection.vendor == "sqlite":
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                    plan = " ".join(str(row) for row in cursor.fetchall())
+                self.assertIn(index_name, plan)
+        return result
+
+    def test_challenge_id_populated_on_create(self):
+        self.assertEqual(
+            CompleteImage.objects.filter(challenge=self.challenge).count(),
+            CompleteImage.objects.filter(challenge_member=self.member).count(),
+        )
+
+    def test_success_today_plan(self):
+        _, (_, success_today) = self.assertUsesIndex(
+            challenge_detail_selector, "ci_chal_status_date_idx", self.challenge.id
+        )
+        self.assertEqual(success_today, 1)
+
+    def test_streak_plan(self):
+        # 참가자 전체 streak를 한 번에 계산하는 쿼리
+        streaks = self.assertUsesIndex(_calc_streak_days_by_user, "ci_chal_status_date_idx", self.challenge.id)
+        self.assertEqual(streaks, {self.user.id: 5})
+
+    def test_album_plan(self):
+        images = self.assertUsesIndex(
+            lambda cid: list(get_challenge_images(cid)), "ci_chal_status", self.challenge.id
+        )
+        self.assertEqual(len(images), 5)
+
+    def test_phash_candidates_plan(self):
+        similar = self.assertUsesIndex(find_similar_images, "ci_chal_phash_idx", self.challenge.id, 0)
+        self.assertEqual(len(similar), 3)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 엔드포인트별 쿼리 예산 (pytest, 시드: conftest.py)
+# - 예산은 시드 규모(멤버 200명 × 30일)에서의 상한 → 멤버/사진 수에 비례하는 N+1이 생기면 실패
+# ─────────────────────────────────────────────────────────────────
+@pytest.mark.django_db
+def test_budget_challenge_list(seed, api, query_budget):
+    client = api()
+    with query_budget("GET /challenges/", 2):
+        res = client.get("/challenges/")
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_budget_challenge_list_invite_code(seed, api, query_budget):
+    client = api(seed.outsider_id)
+    with query_budget("GET /challenges/?search=<invite_code>", 5):
+        res = client.get("/challenges/", {"search": seed.invite_code})
+    assert res.status_code == 200
+    assert res.json()["items"]
+
+
+# ─────────────────────────────────────────────────────────────────
+# 초대코드 해석 캐시 (challenges.utils.invite_cache)
+# ─────────────────────────────────────────────────────────────────
+@pytest.mark.django_db
+def test_invite_cache_invalidated_on_create_and_delete(seed):
+    from challenges.models import InviteCode
+    from challenges.utils.invite_cache import resolve_invite_code
+
+    code = "challink_NEWCODE"
+    assert resolve_invite_code(code) is None  # 음성 캐시
+    invite = InviteCode.objects.create(
+        challenge_id=seed.challenge_id, code=code, expires_at=timezone.now() + timedelta(days=1),
+    )
+    assert resolve_invite_code(code).challenge_id == seed.challenge_id  # 양성 캐시
+    invite.delete()
+    assert resolve_invite_code(code) is None
+
+
+@pytest.mark.django_db
+def test_invite_miss_throttle_ignores_spoofed_forwarded_for(seed, api):
+    from challenges.utils import invite_cache
+
+    client = api()
+    for i in range(invite_cache.MISS_LIMIT):
+        # 요청마다 X-Forwarded-For를 바꿔도 같은 클라이언트(REMOTE_ADDR)로 집계
+        res = client.get("/challenges/", {"search": f"challink_MISS{i:02d}"}, HTTP_X_FORWARDED_FOR=f"10.0.0.{i}")
+        assert res.status_code == 200
+    res = client.get("/challenges/", {"search": "challink_MISSXX"}, HTTP_X_FORWARDED_FOR="10.0.1.1")
+    assert res.status_code == 429
+    # 캐시된 실패 한도 안에서는 진짜 코드도 DB 조회 전에 차단
+    assert client.get("/challenges/", {"search": seed.invite_code}).status_code == 429
+
+
+def test_client_ip_trusts_only_configured_proxy_hops():
+    from django.test import RequestFactory, override_settings
+
+    from challenges.utils.invite_cache import client_ip
+
+    request = RequestFactory().get("/", HTTP_X_FORWARDED_FOR="6.6.6.6, 1.2.3.4", REMOTE_ADDR="10.0.0.1")
+    assert client_ip(request) == "10.0.0.1"
+    with override_settings(TRUSTED_PROXY_COUNT=1):
+        assert client_ip(request) == "1.2.3.4"
+    with override_settings(TRUSTED_PROXY_COUNT=3):
+        assert client_ip(request) == "10.0.0.1"  # 프록시 수보다 짧으면 위조로 보고 REMOTE_ADDR
+
+
+@pytest.mark.django_db
+def test_budget_challenge_create(seed, api, query_budget):
+    today = timezone.localdate()
+    client = api(seed.owner_id)
+    with query_budget("POST /challenges/", 14):
+        res = client.post("/challenges/", {
+            "title": "new", "category_id": ChallengeCategory.objects.order_by("id").first().id,
+            "entry_fee": 1000, "duration_weeks": 1, "freq_type": "DAILY",
+            "start_date": today, "end_date": today + timedelta(days=6),
+            "settlement_method": "N_TO_ONE_WINNER",
+        }, format="multipart")
+    assert res.status_code == 201, res.content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", ["/challenges/my/", "/challenges/my/completed/"])
+def test_budget_my_challenges(seed, api, query_budget, path):
+    client = api(seed.owner_id)
+    with query_budget(f"GET {path}", 3):
+        res = client.get(path)
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_budget_challenge_detail_member(seed, api, query_budget):
+    client = api(seed.owner_id)
+    with query_budget("GET /challenges/{id}/ (member)", 9):
+        res = client.get(f"/challenges/{seed.challenge_id}/")
+    assert res.status_code == 200
+    assert len(res.json()["participants"]) == len(seed.member_ids)
+
+
+@pytest.mark.django_db
+def test_budget_challenge_detail_guest(seed, api, query_budget):
+    client = api(seed.outsider_id)
+    with query_budget("GET /challenges/{id}/ (guest)", 4):
+        res = client.get(f"/challenges/{seed.challenge_id}/")
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("suffix", ["images", "albums"])
+def test_budget_challenge_album(seed, api, query_budget, suffix):
+    client = api(seed.owner_id)
+    with query_budget(f"GET /challenges/{{id}}/{suffix}/", 3):
+        res = client.get(f"/challenges/{seed.challenge_id}/{suffix}/", {"page_size": 100})
+    assert res.status_code == 200
+    assert len(res.json()["items"]) == 100
+
+
+@pytest.mark.django_db
+def test_budget_photo_detail(seed, api, query_budget):
+    client = api(seed.owner_id)
+    with query_budget("GET /challenges/detail/{photo_id}/", 3):
+        res = client.get(f"/challenges/detail/{seed.photo_id}/")
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("created_raw, id_raw", [
+    ("not-a-date", "1"),
+    ("2024-13-45T00:00:00+00:00", "1"),
+    ("2024-01-01T00:00:00+00:00", "²"),
+])
+def test_photo_comments_rejects_bad_cursor(seed, api, created_raw, id_raw):
+    from main.utils.pagination import encode_cursor
+
+    res = api(seed.member_ids[0]).get(
+        f"/challenges/detail/{seed.photo_id}/comments/", {"cursor": encode_cursor(created_raw, id_raw)}
+    )
+    assert res.status_code == 400
+    assert "cursor" in res.json()
+
+
+@pytest.mark.django_db
+def test_comment_delete_twice_decrements_once(seed, api):
+    before = CompleteImage.objects.get(pk=seed.photo_id).comment_count
+    client, url = api(seed.owner_id), f"/challenges/detail/{seed.photo_id}/comments/{seed.comment_id}/"
+    assert client.delete(url).status_code == 204
+    assert client.delete(url).status_code == 204  # 이미 삭제된 댓글 → 카운터 그대로
+    assert CompleteImage.objects.get(pk=seed.photo_id).comment_count == before - 1
+
+
+@pytest.mark.django_db
+def test_reconcile_comment_counts_repairs_drift(seed):
+    import io
+
+    from django.core.management import call_command
+
+    from challenges.models import Comment
+
+    live = Comment.objects.filter(complete_image_id=seed.photo_id, is_deleted=False).count()
+    CompleteImage.objects.filter(pk=seed.photo_id).update(comment_count=live + 7)
+
+    call_command("reconcile_comment_counts", dry_run=True, stdout=io.StringIO())
+    assert CompleteImage.objects.get(pk=seed.photo_id).comment_count == live + 7
+
+    out = io.StringIO()
+    call_command("reconcile_comment_counts", stdout=out)
+    assert "repaired=1" in out.getvalue()
+    assert CompleteImage.objects.get(pk=seed.photo_id).comment_count == live
+
+
+@pytest.mark.django_db
+def test_budget_photo_comments(seed, api, query_budget):
+    client = api(seed.owner_id)
+    with query_budget("GET /challenges/detail/{photo_id}/comments/", 3):
+        res = client.get(f"/challenges/detail/{seed.photo_id}/comments/", {"page_size": 100})
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_budget_comment_create(seed, api, query_budget):
+    client = api(seed.member_ids[1])
+    with query_budget("POST /challenges/detail/{photo_id}/comments/", 6):
+        res = client.post(f"/challenges/detail/{seed.photo_id}/comments/", {"content": "hi"}, format="json")
+    assert res.status_code == 201
+
+
+@pytest.mark.django_db
+def test_budget_comment_delete(seed, api, query_budget):
+    client = api(seed.owner_id)
+    with query_budget("DELETE /challenges/detail/{photo_id}/comments/{comment_id}/", 6):
+        res = client.delete(f"/challenges/detail/{seed.photo_id}/comments/{seed.comment_id}/")
+    assert res.status_code == 204
+
+
+@pytest.mark.django_db
+def test_budget_challenge_join(seed, api, query_budget):
+    client = api(seed.outsider_id)
+    with query_budget("POST /challenges/{id}/join/", 12):
+        res = client.post(f"/challenges/{seed.challenge_id}/join/", {"agree_terms": True}, format="json")
+    assert res.status_code == 200, res.content
+
+
+@pytest.mark.django_db
+def test_budget_challenge_rules(seed, api, query_budget):
+    client = api(seed.owner_id)
+    with query_budget("PATCH /challenges/{id}/rules/", 4):
+        res = client.patch(f"/challenges/{seed.challenge_id}/rules/", {"ai_condition_text": "컵 사진"}, format="json")
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_budget_challenge_end(seed, api, query_budget):
+    client = api(seed.owner_id)
+    with query_budget("POST /challenges/{id}/end/", 5):
+        res = client.post(f"/challenges/{seed.challenge_id}/end/")
+    assert res.status_code == 200
+
+
+# ─────────────────────────────────────────────────────────────────
+# 카드 목록 투영 (values_list + card_projection)이 기존 응답과 같은지
+# ─────────────────────────────────────────────────────────────────
+@pytest.mark.django_db
+def test_card_projection_matches_serializer(seed, api):
+    import json
+
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIRequestFactory
+
+    from challenges.serializers import ChallengeCardSerializer
+
+    Challenge.objects.filter(pk=seed.challenge_id).update(cover_image="challenge_covers/a b%한.jpg")
+    res = api(seed.owner_id).get("/challenges/", {"include_full": "true"})
+    assert res.status_code == 200
+    item = next(i for i in res.json()["items"] if i["id"] == seed.challenge_id)
+
+    challenge = Challenge.objects.select_related("category").get(pk=seed.challenge_id)
+    setattr(challenge, "__me_member__", [ChallengeMember.objects.get(challenge=challenge, user_id=seed.owner_id)])
+    request = APIRequestFactory().get("/challenges/")
+    expected = ChallengeCardSerializer(challenge, context={"request": request}).data
+    assert item == json.loads(JSONRenderer().render(expected))
+
+
+@pytest.mark.django_db
+def test_my_completed_cards_include_result_columns(seed, api):
+    res = api(seed.owner_id).get("/challenges/my/completed/")
+    assert res.status_code == 200
+    item = res.json()["items"][0]
+    assert item["challenge"]["id"] == seed.ended_challenge_id
+    assert set(item["challenge_member"]) >= {"success_rate", "final_points_awarded", "final_rank", "ended_at"}
+    assert item["challenge"]["category"]["id"] is not None
+
+
+# ─────────────────────────────────────────────────────────────────
+# 미디어 뷰 (권한 확인 + ETag/Range + 프록시 핸드오프)
+# ─────────────────────────────────────────────────────────────────
+@pytest.fixture
+def proof_file(seed):
+    """시드 사진의 변환본을 내용 주소 기반 파일로 교체 (임시 MEDIA_ROOT에 실제 파일)"""
+    import hashlib
+
+    from challenges.models import complete_image_storage
+
+    data = bytes(range(256)) * 4
+    sha1 = hashlib.sha1(data).hexdigest()
+    name = complete_image_storage().save("complete_images/converted/proof.jpg", ContentFile(data))
+    assert name == f"complete_images/converted/{sha1[:2]}/{sha1[2:4]}/{sha1}.jpg"
+    CompleteImage.objects.filter(pk=seed.photo_id).update(converted_image=name)
+    return SimpleNamespace(name=name, sha1=sha1, data=data)
+
+
+@pytest.mark.django_db
+def test_media_requires_membership(seed, api, proof_file):
+    url = f"/media/{proof_file.name}"
+    assert api().get(url).status_code == 401
+    assert api(seed.outsider_id).get(url).status_code == 404
+
+    res = api(seed.member_ids[0]).get(url)
+    assert res.status_code == 200
+    assert b"".join(res.streaming_content) == proof_file.data
+    assert res["ETag"] == f'"{proof_file.sha1}"'
+    assert res["Cache-Control"].startswith("private") and "immutable" in res["Cache-Control"]
+    assert res["Accept-Ranges"] == "bytes"
+
+
+@pytest.mark.django_db
+def test_media_signed_url_works_without_auth_header(seed, api, proof_file):
+    import time
+    from unittest import mock
+
+    from challenges.models import complete_image_storage
+    from challenges.utils import media_signing
+
+    image = api(seed.member_ids[0]).get(f"/challenges/detail/{seed.photo_id}/").json()["image"]
+    assert image.startswith(f"media/{proof_file.name}?sig=")
+
+    res = api().get(f"/{image}")  # <img src>처럼 Authorization 헤더 없이
+    assert res.status_code == 200
+    assert b"".join(res.streaming_content) == proof_file.data
+
+    token = image.split("?sig=", 1)[1]
+    other = complete_image_storage().save("complete_images/other.jpg", ContentFile(b"other file"))
+    assert api().get(f"/media/{other}", {"sig": token}).status_code == 404  # 다른 파일 이름
+    assert api().get(f"/media/{proof_file.name}", {"sig": token[:-2] + "xx"}).status_code == 404
+
+    # 만료 시각이 지났거나, 발급 대상이 챌린지에서 빠지면 거절
+    with mock.patch.object(media_signing.time, "time", return_value=time.time() + 3 * media_signing.TTL):
+        assert api().get(f"/{image}").status_code == 404
+    ChallengeMember.objects.filter(challenge_id=seed.challenge_id, user_id=seed.member_ids[0]).delete()
+    assert api().get(f"/{image}").status_code == 404
+
+
+@pytest.mark.django_db
+def test_media_range_and_conditional(seed, api, proof_file):
+    client, url = api(seed.owner_id), f"/media/{proof_file.name}"
+    size = len(proof_file.data)
+
+    res = client.get(url, HTTP_RANGE="bytes=10-19")
+    assert res.status_code == 206
+    assert res["Content-Range"] == f"bytes 10-19/{size}"
+    assert b"".join(res.streaming_content) == proof_file.data[10:20]
+
+    res = client.get(url, HTTP_RANGE="bytes=-5")
+    assert b"".join(res.streaming_content) == proof_file.data[-5:]
+
+    res = client.get(url, HTTP_RANGE=f"bytes={size}-")
+    assert res.status_code == 416
+    assert res["Content-Range"] == f"bytes */{size}"
+
+    res = client.get(url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+    assert res.status_code == 200  # If-Range 불일치 → 전체
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=f'"{proof_file.sha1}"').status_code == 304
+
+
+@pytest.mark.django_db
+def test_media_proxy_handoff(seed, api, proof_file, settings):
+    settings.MEDIA_ACCEL_MODE = "nginx"
+    res = api(seed.owner_id).get(f"/media/{proof_file.name}")
+    assert res.status_code == 200
+    assert res["X-Accel-Redirect"] == f"/protected-media/{proof_file.name}"
+    assert res.content == b""
+
+    settings.MEDIA_ACCEL_MODE = "sendfile"
+    res = api(seed.owner_id).get(f"/media/{proof_file.name}")
+    assert res["X-Sendfile"].endswith(proof_file.name)
+
+
+@pytest.mark.django_db
+def test_media_public_cover(seed, api):
+    from django.core.files.storage import default_storage
+
+    name = default_storage.save("challenge_covers/cover.png", ContentFile(b"\x89PNG cover"))
+    res = api().get(f"/media/{name}")
+    assert res.status_code == 200
+    assert res["Cache-Control"].startswith("public")
+    assert api().get("/media/challenge_covers/missing.png").status_code == 404
+
+
+@pytest.mark.django_db
+def test_media_rejects_path_traversal(seed, api, proof_file):
+    # 공개 접두사 + ".." 로 인증 이미지에 닿으면 안 됨 (두 스토리지가 같은 MEDIA_ROOT)
+    for url in (
+        f"/media/challenge_covers/../{proof_file.name}",
+        f"/media/challenge_covers/%2e%2e/{proof_file.name}",
+        f"/media/./{proof_file.name}",
+        f"/media/challenge_covers//../{proof_file.name}",
+    ):
+        assert api().get(url).status_code == 404, url
+        assert api(seed.outsider_id).get(url).status_code == 404, url
+
+
+# ─────────────────────────────────────────────────────────────────
+# 내용 주소 저장소 (중복 제거 / 참조 수 / GC)
+# ─────────────────────────────────────────────────────────────────
+def _png_bytes(color):
+    import io
+
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+@pytest.mark.django_db
+def test_content_storage_dedup_and_refcount(seed):
+    import os
+
+    from challenges.models import MediaBlob, complete_image_storage
+
+    storage = complete_image_storage()
+    cm = ChallengeMember.objects.get(challenge_id=seed.challenge_id, user_id=seed.member_ids[3])
+    data = _png_bytes((201, 202, 203))
+
+    a = CompleteImage.objects.create(challenge_member=cm, user_id=cm.user_id, image=ContentFile(data, name="a.png"))
+    b = CompleteImage.objects.create(challenge_member=cm, user_id=cm.user_id, image=ContentFile(data, name="b.png"))
+    # 같은 바이트 → 같은 blob 하나 (변환본도 같은 SHA-1 쌍둥이를 재사용)
+    assert a.image.name == b.image.name and a.converted_image.name == b.converted_image.name
+    assert len(os.listdir(os.path.dirname(storage.path(a.image.name)))) == 1
+    assert MediaBlob.objects.get(name=a.image.name).refcount == 2
+    assert MediaBlob.objects.get(name=a.converted_image.name).refcount == 2
+
+    a.delete()
+    assert MediaBlob.objects.get(name=b.image.name).refcount == 1
+    b.delete()
+    assert MediaBlob.objects.get(name=b.image.name).refcount == 0
+    assert storage.exists(b.image.name)  # 파일은 GC가 회수
+
+
+@pytest.mark.django_db
+def test_gc_media_blobs(seed):
+    import io
+
+    from django.core.management import call_command
+
+    from challenges.models import MediaBlob, complete_image_storage
+
+    storage = complete_image_storage()
+    cm = ChallengeMember.objects.get(challenge_id=seed.challenge_id, user_id=seed.member_ids[3])
+    kept = CompleteImage.objects.create(
+        challenge_member=cm, user_id=cm.user_id, image=ContentFile(_png_bytes((211, 0, 0)), name="kept.png"),
+    )
+    dropped = CompleteImage.objects.create(
+        challenge_member=cm, user_id=cm.user_id, image=ContentFile(_png_bytes((0, 212, 0)), name="dropped.png"),
+    )
+    dropped_names = [dropped.image.name, dropped.converted_image.name]
+    dropped.delete()
+    recent = storage.save("complete_images/recent.png", ContentFile(_png_bytes((0, 0, 213))))
+
+    # 유예시간 안이면 참조 0이어도 유지
+    call_command("gc_media_blobs", "--grace-minutes", "60", stdout=io.StringIO())
+    assert all(storage.exists(n) for n in dropped_names)
+
+    MediaBlob.objects.filter(name__in=dropped_names).update(updated_at=timezone.now() - timedelta(hours=2))
+    call_command("gc_media_blobs", "--grace-minutes", "60", stdout=io.StringIO())
+    assert not any(storage.exists(n) for n in dropped_names)
+    assert not MediaBlob.objects.filter(name__in=dropped_names).exists()
+    assert storage.exists(kept.image.name) and storage.exists(recent)
+
+    # 회수된 blob을 다시 올리면 행과 파일이 새로 생김 (파일이 있다고 보고 쓰기를 건너뛰지 않음)
+    again = storage.save("complete_images/dropped.png", ContentFile(_png_bytes((0, 212, 0))))
+    assert again == dropped_names[0] and storage.exists(again)
+    assert MediaBlob.objects.filter(name=again, refcount=0).exists()
+
+
+@pytest.mark.django_db
+def test_challenge_create_accepts_heic_cover(seed, api, monkeypatch):
+    import io
+
+    import pillow_heif
+    from PIL import Image
+
+    from aiauthentications.utils import image_codecs
+
+    buf = io.BytesIO()
+    pillow_heif.from_pillow(Image.new("RGB", (16, 16), (1, 2, 3))).save(buf, quality=50)
+    # 같은 워커가 앞서 HEIC를 연 적이 없는 상태(오프너 미등록)를 재현
+    monkeypatch.setattr(image_codecs, "_heif_registered", False)
+    monkeypatch.setattr(Image, "OPEN", {k: v for k, v in Image.OPEN.items() if k != "HEIF"})
+    monkeypatch.setattr(Image, "ID", [k for k in Image.ID if k != "HEIF"])
 
-# Create your tests here.
+    today = timezone.localdate()
+    res = api(seed.owner_id).post("/challenges/", {
+        "title": "heic cover", "category_id": ChallengeCategory.objects.order_by("id").first().id,
+        "entry_fee": 1000, "duration_weeks": 1, "freq_type": "DAILY",
+        "start_date": today, "end_date": today + timedelta(days=6),
+        "settlement_method": "N_TO_ONE_WINNER",
+        "cover_image": ContentFile(buf.getvalue(), name="cover.heic"),
+    }, format="multipart")
+    assert res.status_code == 201, res.content
@@ -6,7 +6,7 @@ from .views import *
 from .views import (
     ChallengeListCreateView,
     MyChallengeListView, MyCompletedChallengeListView,
-    ChallengeDetailView, CompleteImageDetailView, CommentCreateView,
+    ChallengeDetailView, CompleteImageDetailView, CommentListCreateView, CommentDeleteView,
     ChallengeImageListView, ChallengeJoinView, ChallengeEndView,
 )
 
@@ -22,7 +22,8 @@ urlpatterns = [
 
     # 기록 사진 상세 / 댓글
     path("detail/<int:photo_id>/", CompleteImageDetailView.as_view()),
-    path("detail/<int:photo_id>/comments/", CommentCreateView.as_view()),
+    path("detail/<int:photo_id>/comments/", CommentListCreateView.as_view()),   # GET(커서 목록) / POST
+    path("detail/<int:photo_id>/comments/<int:comment_id>/", CommentDeleteView.as_view()),
 
     path("<int:challenge_id>/join/", ChallengeJoinView.as_view(), name="challenge-join"), # POST
     
@@ -0,0 +1,94 @@
+from challenges.models import Challenge
+
+# 챌린지 카드 목록용 컬럼 투영 (values_list 튜플 → 응답 dict)
+# - 모델 인스턴스/ImageField 디스크립터/ModelSerializer 필드를 거치지 않음
+# - 컬럼 순서와 아래 언패킹 순서가 곧 계약 → 컬럼을 바꾸면 _unpack_card도 같이 바꿀 것
+CARD_COLUMNS = (
+    "id", "title", "subtitle", "cover_image",
+    "duration_weeks", "freq_type", "freq_n_days", "entry_fee",
+    "category_id", "category__name", "member_count_cache", "member_limit",
+    "status", "start_date", "end_date",
+)
+
+MEMBER_COLUMNS = ("id", "challenge_id", "user_id", "role", "joined_at")
+MEMBER_RESULT_COLUMNS = ("success_rate", "final_points_awarded", "final_rank", "ended_at")
+
+
+def member_card_columns(*, completed: bool = False) -> tuple:
+    """ChallengeMember 기준 values_list 컬럼 (멤버십 + challenge__ 카드 컬럼)"""
+    member = MEMBER_COLUMNS + (MEMBER_RESULT_COLUMNS if completed else ())
+    return member + tuple(f"challenge__{c}" for c in CARD_COLUMNS)
+
+
+def cover_url_builder(request):
+    """
+    cover_image 파일명 → 절대 URL (ImageFieldFile.url + build_absolute_uri와 같은 결과)
+    - storage.url은 행마다, 스킴/호스트 계산은 요청당 한 번
+    """
+    storage = Challenge._meta.get_field("cover_image").storage
+    origin = request.build_absolute_uri("/")[:-1]
+
+    def build(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return origin + url if url.startswith("/") else url
+    return build
+
+
+def _unpack_card(row, cover_url):
+    (id_, title, subtitle, cover, duration_weeks, freq_type, freq_n_days, entry_fee,
+     category_id, category_name, member_count, member_limit, status, start_date, end_date) = row
+    return {
+        "id": id_,
+        "title": title,
+        "subtitle": subtitle,
+        "cover_image": cover_url(cover),
+        "duration_weeks": duration_weeks,
+        "freq_type": freq_type,
+        "freq_n_days": freq_n_days,
+        "entry_fee": entry_fee,
+        "category": {"id": category_id, "name": category_name},
+        "member_count": member_count,
+        "member_limit": member_limit,
+        "status": status,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+
+
+def challenge_card_mapper(request):
+    """공개 목록 카드 (ChallengeCardSerializer와 같은 모양) → mapper(row, is_joined)"""
+    cover_url = cover_url_builder(request)
+
+    def build(row, is_joined=False):
+        card = _unpack_card(row, cover_url)
+        if card["category"]["id"] is None:
+            card["category"] = None  # 중첩 시리얼라이저는 관계가 없으면 null
+        card["is_joined"] = is_joined
+        return card
+    return build
+
+
+def member_card_mapper(request, *, completed: bool = False):
+    """내 챌린지 목록 항목 ({challenge_member, challenge}) → mapper(row)"""
+    cover_url = cover_url_builder(request)
+    split = len(MEMBER_COLUMNS) + (len(MEMBER_RESULT_COLUMNS) if completed else 0)
+
+    def build(row):
+        cm_id, challenge_id, user_id, role, joined_at, *result = row[:split]
+        member = {
+            "challenge_member_id": cm_id,
+            "challenge_id": challenge_id,
+            "user_id": user_id,
+            "role": role,
+            "joined_at": joined_at,
+        }
+        if completed:
+            success_rate, final_points_awarded, final_rank, ended_at = result
+            member["success_rate"] = success_rate
+            member["final_points_awarded"] = final_points_awarded or 0
+            member["final_rank"] = final_rank
+            member["ended_at"] = ended_at
+        return {"challenge_member": member, "challenge": _unpack_card(row[split:], cover_url)}
+    return build
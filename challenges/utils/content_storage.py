@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+from aiauthentications.utils.image_hashing import calc_sha1
+
+# 쓰는 중인 임시파일 접두사 (GC 고아 파일 정리 시 함께 회수)
+TMP_PREFIX = ".tmp-"
+
+
+class ContentAddressedMixin:
+    """
+    내용(SHA-1) 기준 이름 규칙 + blob 등록 (파일시스템/S3 스토리지 공용)
+    - 하위 클래스는 write_if_missing(name, content), iter_files(prefix)만 구현
+    """
+
+    def blob_name(self, name, sha1):
+        dirname, filename = os.path.split(name)
+        ext = os.path.splitext(filename)[1].lower()
+        return os.path.join(dirname, sha1[:2], sha1[2:4], f"{sha1}{ext}").replace("\\", "/")
+
+    def get_available_name(self, name, max_length=None):
+        # 실제 이름은 _save에서 내용 해시로 정해지므로 _1, _2 같은 접미사를 붙이지 않음
+        return name
+
+    def _save(self, name, content):
+        # 업로드 핸들러가 수신 중 계산해 둔 sha1이 있으면 재사용
+        sha1 = getattr(content, "sha1", None) or calc_sha1(content)
+        name = self.blob_name(name, sha1)
+
+        # 존재 확인 전에 blob 행을 먼저 잠그고 갱신(refcount 0으로 등록/updated_at 갱신)
+        # → GC는 같은 행 잠금 안에서 파일을 지우므로, "있음"으로 보고 쓰기를 건너뛴 직후 지워지는 일이 없음
+        with transaction.atomic():
+            register_blob(name, sha1, getattr(content, "size", None))
+            self.write_if_missing(name, content)
+        return name
+
+    def write_if_missing(self, name, content):
+        """blob이 없을 때만 content를 name으로 기록 (register_blob과 같은 트랜잭션 안에서 호출)"""
+        raise NotImplementedError
+
+    def iter_files(self, prefix):
+        """prefix 아래 저장된 파일 → (이름, 수정 시각) (gc_media_blobs --sweep-orphans)"""
+        raise NotImplementedError
+
+
+@deconstructible
+class ContentAddressedStorage(ContentAddressedMixin, FileSystemStorage):
+    """
+    내용(SHA-1) 기준 저장소 (CompleteImage.image / converted_image 용)
+    - 경로: <upload_to>/<sha[:2]>/<sha[2:4]>/<sha><ext> → 같은 바이트는 항상 같은 이름
+    - 이미 있는 blob이면 쓰지 않고 이름만 반환 (중복 업로드는 디스크 추가 사용 없음)
+    - 새 blob은 같은 디렉터리의 임시파일에 쓴 뒤 os.replace로 원자적 교체
+    - 참조 수는 MediaBlob 테이블에서 관리, 참조 0인 blob은 gc_media_blobs 커맨드로 회수
+    - S3 호환 스토리지 버전은 challenges.utils.s3_storage.S3ContentAddressedStorage
+    """
+
+    def write_if_missing(self, name, content):
+        path = self.path(name)
+        if not os.path.exists(path):
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=TMP_PREFIX)
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    if hasattr(content, "temporary_file_path"):
+                        with open(content.temporary_file_path(), "rb") as src:
+                            shutil.copyfileobj(src, out)
+                    else:
+                        if hasattr(content, "seek"):
+                            content.seek(0)
+                        for chunk in content.chunks():
+                            out.write(chunk)
+                if self.file_permissions_mode is not None:
+                    os.chmod(tmp_path, self.file_permissions_mode)
+                # 동시에 같은 blob을 쓰더라도 내용이 같으므로 마지막 replace가 이겨도 무방
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def iter_files(self, prefix):
+        for dirpath, _, filenames in os.walk(self.path(prefix)):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, self.location).replace(os.sep, "/")
+                yield name, datetime.fromtimestamp(os.path.getmtime(path), tz=dt_timezone.utc)
+
+
+def _blob_model():
+    # models.py가 필드 정의 시 이 모듈(스토리지)을 불러오므로 모델은 지연 import
+    from challenges.models import MediaBlob
+    return MediaBlob
+
+
+def register_blob(name, sha1=None, size=None):
+    """
+    blob 행 등록/updated_at 갱신 (transaction.atomic 안에서 호출, 파일 존재 확인/쓰기까지 같은 트랜잭션에서)
+    - UPDATE/INSERT가 잡은 행 잠금은 커밋까지 유지 → gc_media_blobs의 select_for_update와 직렬화
+    """
+    MediaBlob = _blob_model()
+    if not MediaBlob.objects.filter(name=name).update(updated_at=timezone.now()):
+        MediaBlob.objects.get_or_create(name=name, defaults={"sha1": sha1, "size": size})
+
+
+def acquire_blobs(names):
+    names = [n for n in names if n]
+    if not names:
+        return
+    MediaBlob = _blob_model()
+    for name in names:
+        MediaBlob.objects.get_or_create(name=name)
+    MediaBlob.objects.filter(name__in=names).update(
+        refcount=F("refcount") + 1, updated_at=timezone.now()
+    )
+
+
+def release_blobs(names):
+    names = [n for n in names if n]
+    if not names:
+        return
+    # update()는 auto_now를 갱신하지 않으므로 updated_at 직접 기록 (GC 유예시간 기준)
+    _blob_model().objects.filter(name__in=names, refcount__gt=0).update(
+        refcount=F("refcount") - 1, updated_at=timezone.now()
+    )
+
+
+@receiver(post_delete, sender="challenges.CompleteImage")
+def _release_on_delete(sender, instance, **kwargs):
+    # 파일은 바로 지우지 않음 (다른 행이 같은 blob을 참조할 수 있음) → GC가 회수
+    release_blobs([instance.image.name, instance.converted_image.name])
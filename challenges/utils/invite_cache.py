@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.exceptions import Throttled
+
+from challenges.models import InviteCode
+
+# 초대코드 → (challenge_id, expires_at) 해석 캐시
+# - 양성 캐시: TTL은 expires_at을 넘지 않음
+# - 음성 캐시: 존재하지 않는 코드도 짧게 캐시 → 무작위 challink_XXXXXX 스캔이 DB까지 안 감
+# - 클라이언트별 실패 횟수도 같은 캐시에 기록, 한도를 넘으면 DB 조회 전에 429
+POSITIVE_TTL = getattr(settings, "INVITE_CACHE_POSITIVE_TTL", 60 * 10)
+NEGATIVE_TTL = getattr(settings, "INVITE_CACHE_NEGATIVE_TTL", 60)
+MISS_LIMIT = getattr(settings, "INVITE_LOOKUP_MISS_LIMIT", 20)      # 윈도우당 허용 실패 횟수
+MISS_WINDOW = getattr(settings, "INVITE_LOOKUP_MISS_WINDOW", 60 * 10)
+
+_NEGATIVE = "__none__"
+
+
+@dataclass(frozen=True)
+class InviteResolution:
+    challenge_id: int
+    expires_at: datetime
+
+    @property
+    def is_expired(self) -> bool:
+        return self.expires_at <= timezone.now()
+
+
+def _code_key(code: str) -> str:
+    return f"invite:code:{code}"
+
+
+def _miss_key(client_key: str) -> str:
+    return f"invite:miss:{client_key}"
+
+
+def client_ip(request) -> str:
+    """
+    클라이언트 IP (실패 횟수 집계용)
+    - X-Forwarded-For의 왼쪽 값은 클라이언트가 마음대로 넣을 수 있으므로 쓰지 않음
+    - TRUSTED_PROXY_COUNT개의 프록시 뒤라면 오른쪽에서 그 번째 값(가장 바깥 신뢰 프록시가 본 주소), 아니면 REMOTE_ADDR
+    """
+    hops = getattr(settings, "TRUSTED_PROXY_COUNT", 0)
+    if hops > 0:
+        forwarded = [p.strip() for p in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if p.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def client_key_for(request) -> str:
+    """로그인 유저는 user id, 아니면 클라이언트 IP 기준으로 실패 횟수 집계"""
+    user = getattr(request, "user", None)
+    if user is not None and getattr(user, "is_authenticated", False):
+        return f"user:{user.id}"
+    return f"ip:{client_ip(request) or 'unknown'}"
+
+
+def _check_rate(client_key: Optional[str]) -> None:
+    if not client_key:
+        return
+    misses = cache.get(_miss_key(client_key), 0)
+    if misses >= MISS_LIMIT:
+        raise Throttled(wait=MISS_WINDOW, detail="초대코드 조회 실패가 너무 많습니다. 잠시 후 다시 시도해주세요.")
+
+
+def _record_miss(client_key: Optional[str]) -> None:
+    if not client_key:
+        return
+    key = _miss_key(client_key)
+    # add는 키가 없을 때만 윈도우 시작 (원자적), 이후 incr
+    if not cache.add(key, 1, timeout=MISS_WINDOW):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # 그 사이 만료된 경우
+            cache.add(key, 1, timeout=MISS_WINDOW)
+
+
+def resolve_invite_code(code: str, *, client_key: Optional[str] = None) -> Optional[InviteResolution]:
+    """
+    초대코드 해석 (캐시 우선)
+    - 없는 코드: None (음성 캐시 + 실패 횟수 기록)
+    - 만료 여부는 호출 측에서 InviteResolution.is_expired로 판단
+    """
+    _check_rate(client_key)
+
+    key = _code_key(code)
+    hit = cache.get(key)
+    if hit == _NEGATIVE:
+        _record_miss(client_key)
+        return None
+    if hit is not None:
+        return InviteResolution(*hit)
+
+    row = (InviteCode.objects
+           .filter(code=code)
+           .values_list("challenge_id", "expires_at")
+           .first())
+    if row is None:
+        cache.set(key, _NEGATIVE, timeout=NEGATIVE_TTL)
+        _record_miss(client_key)
+        return None
+
+    resolution = InviteResolution(*row)
+    remaining = int((resolution.expires_at - timezone.now()).total_seconds())
+    # 이미 만료된 코드는 음성 캐시와 같은 짧은 TTL로 (410 응답용)
+    ttl = min(POSITIVE_TTL, remaining) if remaining > 0 else NEGATIVE_TTL
+    cache.set(key, row, timeout=ttl)
+    return resolution
+
+
+def invalidate_invite_code(code: str) -> None:
+    cache.delete(_code_key(code))
+
+
+# 코드 생성/재발급/삭제(어드민 포함) 시 캐시 무효화
+# - 새 코드가 이전에 음성 캐시돼 있었을 수도 있으므로 생성 시에도 지움
+@receiver(post_save, sender=InviteCode)
+@receiver(post_delete, sender=InviteCode)
+def _invalidate_on_change(sender, instance, **kwargs):
+    invalidate_invite_code(instance.code)
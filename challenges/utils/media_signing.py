@@ -0,0 +1,37 @@
+import time
+from typing import Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core import signing
+
+# 인증 이미지 서명 URL (<img src>는 Authorization 헤더를 못 보내므로 URL에 짧은 열람 권한을 실음)
+# - 토큰: {"n": 파일 이름, "c": challenge_id, "u": 발급 대상 user_id, "e": 만료 시각}
+# - 만료는 TTL 단위로 올림 → 같은 윈도우 안에서는 URL이 같아 브라우저 캐시가 그대로 맞음 (유효 시간 TTL~2*TTL)
+# - 검증은 MediaView: 서명 + 만료 + 이름 일치 + 그 user가 아직 그 챌린지를 볼 수 있는지
+# - 로컬 경로가 없는 스토리지(S3)는 storage.url 자체가 서명 GET URL이므로 그대로 씀
+SALT = "challenges.media"
+TTL = getattr(settings, "MEDIA_SIGNED_URL_TTL", 60 * 60)
+
+
+def signed_media_url(field_file, *, challenge_id: int, user_id: int) -> Optional[str]:
+    """ImageFieldFile → "/media/...?sig=..." (원격 스토리지면 storage.url 그대로)"""
+    if not field_file:
+        return None
+    url = field_file.url
+    if url.startswith(settings.MEDIA_URL):
+        expires = (int(time.time()) // TTL + 2) * TTL
+        token = signing.dumps({"n": field_file.name, "c": challenge_id, "u": user_id, "e": expires}, salt=SALT)
+        url = f"{url}?{urlencode({'sig': token})}"
+    return url
+
+
+def unsign_media_token(token: str, name: str) -> Optional[dict]:
+    """토큰 → {"c", "u"} (변조/만료/다른 파일이면 None)"""
+    try:
+        scope = signing.loads(token, salt=SALT)
+    except signing.BadSignature:
+        return None
+    if scope.get("n") != name or scope.get("e", 0) < time.time():
+        return None
+    return scope
@@ -0,0 +1,33 @@
+from django.utils.deconstruct import deconstructible
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+from .content_storage import ContentAddressedMixin
+
+# 인증 이미지의 S3 호환 스토리지 (django-storages, AIAUTH_UPLOAD_BACKEND="s3"일 때 STORAGES["complete_images"])
+# - 직접 업로드는 같은 버킷 안 서버 측 복사로 확정 (aiauthentications.utils.presigned.S3UploadBackend)
+#   → 앱 워커는 인증 사진 바이트를 받지 않음
+# - 설정에서 지정할 때만 import (로컬/테스트 실행은 boto3 로딩 비용 없음)
+
+
+@deconstructible
+class S3ContentAddressedStorage(ContentAddressedMixin, S3Storage):
+    """
+    ContentAddressedStorage의 S3 버전 (이름 규칙/MediaBlob 등록은 같음)
+    - 이미 있는 객체(head_object)면 다시 올리지 않음
+    - url()은 querystring_expire 동안 유효한 서명 GET URL (MediaView가 권한 확인 후 리다이렉트)
+    """
+
+    def object_key(self, name):
+        """스토리지 이름 → 버킷 안 객체 키 (location 접두사 포함)"""
+        return self._normalize_name(clean_name(name))
+
+    def write_if_missing(self, name, content):
+        if not self.exists(name):
+            S3Storage._save(self, name, content)
+
+    def iter_files(self, prefix):
+        root = self.object_key(prefix).rstrip("/") + "/"
+        strip = len(self.location.strip("/")) + 1 if self.location.strip("/") else 0
+        for obj in self.bucket.objects.filter(Prefix=root):
+            yield obj.key[strip:], obj.last_modified
@@ -1,16 +1,24 @@
+import hashlib
 from datetime import timedelta
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
 
 from django.shortcuts import render
 from rest_framework import status, permissions, generics
+from rest_framework.exceptions import NotAuthenticated, NotFound
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.generics import GenericAPIView, ListCreateAPIView
+from main.utils.db_router import replica_reads
+from main.utils.compression import cache_compressed
+from main.utils.media_serving import clean_media_name, serve_media
 from main.utils.pagination import StandardPagePagination
 from django.conf import settings
-from .models import CompleteImage, ChallengeMember, Challenge, InviteCode  
+from django.core.files.storage import default_storage
+from .models import CompleteImage, ChallengeMember, Challenge, InviteCode, complete_image_storage
 from rest_framework.parsers import MultiPartParser, FormParser
 
 
@@ -39,31 +47,27 @@ from .serializers import (
 )
 from .selectors import (
     get_complete_image_with_comments,
-    get_challenge_images,
-    list_challenges_selector,
-    my_challenges_selector,
+    list_photo_comments,
+    get_challenge_images_page,
+    get_challenge_images_state,
+    list_challenge_cards_selector,
+    joined_challenge_ids,
+    my_challenge_cards_selector,
     challenge_detail_selector,
+    can_view_complete_image_file,
+    can_view_signed_complete_image,
+    COMMENT_PAGE_SIZE,
+    COMMENT_MAX_PAGE_SIZE,
+    ALBUM_PAGE_SIZE,
+    ALBUM_MAX_PAGE_SIZE,
 )
-from .services import create_comment, join_challenge, Conflict, end_challenge, validate_invite_code_and_build_join_payload
+from .utils.card_projection import challenge_card_mapper, member_card_mapper
+from .utils.invite_cache import client_key_for
+from .utils.media_signing import signed_media_url, unsign_media_token
+from .services import create_comment, soft_delete_comment, join_challenge, Conflict, end_challenge, validate_invite_code_and_build_join_payload
 DEFAULT_DISPLAY_THUMBNAIL = getattr(settings, "DEFAULT_DISPLAY_THUMBNAIL", None)
 
 
-# 절대 URL 생성 유틸
-def _abs_image_url(request, image_field):
-    """
-    ImageField → 절대 URL 문자열로 안전 변환
-    - 파일이 없으면 None 반환
-    """
-    if not image_field:
-        return None
-    try:
-        url = image_field.url  # ex) /media/...
-    except Exception:
-        return None
-    # 절대 URL로 통일
-    return request.build_absolute_uri(url)
-
-
 class ChallengeListCreateView(ListCreateAPIView):
     """
     GET/POST /challenges/
@@ -84,32 +88,39 @@ class ChallengeListCreateView(ListCreateAPIView):
         return [AllowAny()]
 
 
-    def get_queryset(self):
+    def _list_filters(self):
         req = self.request
         include_full = (req.query_params.get("include_full", "false").lower() == "true")
         order = req.query_params.get("order", "recent")
         category_id = req.query_params.get("category_id")
         search = req.query_params.get("search") or req.query_params.get("q")
+        return {
+            "include_full_slots": include_full,
+            "order": order,
+            "category_id": int(category_id) if category_id else None,
+            "search": search,
+            "client_key": client_key_for(req),
+        }
 
-        return list_challenges_selector(
-            user=req.user if req.user.is_authenticated else None,
-            include_full_slots=include_full,
-            order=order,
-            category_id=int(category_id) if category_id else None,
-            search=search,
-        )
+    def get_queryset(self):
+        # list()와 같은 카드 행 (평가는 호출하는 쪽에서, 여기서는 쿼리셋만 만듦)
+        return list_challenge_cards_selector(**self._list_filters())
 
     def get_serializer_class(self):
         return ChallengeCardSerializer if self.request.method == "GET" else ChallengeCreateSerializer
 
+    @replica_reads()
     def list(self, request, *args, **kwargs):
-        qs = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(qs)
-        data_qs = page if page is not None else qs
-        ser = ChallengeCardSerializer(data_qs, many=True, context={"request": request})
+        # 카드 컬럼만 values_list로 가져와 페이지 행만 dict로 (ChallengeCardSerializer와 같은 응답)
+        rows = list_challenge_cards_selector(**self._list_filters())
+        page = self.paginate_queryset(rows)
+        rows = page if page is not None else list(rows)
+        joined = joined_challenge_ids(request.user, [row[0] for row in rows])
+        to_card = challenge_card_mapper(request)
+        items = [to_card(row, row[0] in joined) for row in rows]
         if page is not None:
-            return self.get_paginated_response(ser.data)
-        return Response({"page": 1, "page_size": len(ser.data), "total": len(ser.data), "items": ser.data})
+            return cache_compressed(self.get_paginated_response(items))
+        return cache_compressed(Response({"page": 1, "page_size": len(items), "total": len(items), "items": items}))
 
     def create(self, request, *args, **kwargs):
         # POST 그대로 유지
@@ -130,14 +141,35 @@ class CompleteImageDetailView(APIView):
         if not photo:
             return Response({"detail": "해당 사진을 찾을 수 없습니다."}, status=404)
 
-        serializer = CompleteImageDetailSerializer(photo)
+        serializer = CompleteImageDetailSerializer(photo, context={"request": request})
         return Response(serializer.data, status=200)
 
 
-# 댓글 작성
-class CommentCreateView(APIView):
+# 댓글 목록(키셋 커서) / 댓글 작성
+class CommentListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
+    def get(self, request, photo_id):
+        if not CompleteImage.objects.filter(id=photo_id).exists():
+            return Response({"detail": "해당 사진을 찾을 수 없습니다."}, status=404)
+
+        try:
+            page_size = int(request.query_params.get("page_size", COMMENT_PAGE_SIZE))
+        except ValueError:
+            return Response({"detail": "page_size는 정수여야 합니다."}, status=400)
+        page_size = max(1, min(page_size, COMMENT_MAX_PAGE_SIZE))
+
+        comments, next_cursor = list_photo_comments(
+            photo_id,
+            cursor=request.query_params.get("cursor") or None,
+            limit=page_size,
+        )
+        return Response({
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "items": CommentSerializer(comments, many=True).data,
+        }, status=200)
+
     def post(self, request, photo_id):
         serializer = CommentCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -156,16 +188,62 @@ class CommentCreateView(APIView):
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
 
-# 챌린지 내 사진 목록 조회 (이름 필터링)
+# 댓글 삭제 (soft delete)
+class CommentDeleteView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request, photo_id, comment_id):
+        # 서비스 호출 (트랜잭션, comment_count -1)
+        soft_delete_comment(photo_id=photo_id, comment_id=comment_id, user=request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def _album_etag(request, challenge_id):
+    """
+    앨범 ETag: 최신 이미지 시각/개수/댓글 수 + 쿼리 파라미터로 계산
+    - 변경이 없으면 condition()이 304 Not Modified로 바로 응답
+    """
+    name = request.GET.get("name", None)
+    state = get_challenge_images_state(challenge_id, name)
+    raw = "|".join(str(v) for v in (
+        challenge_id,
+        state["count"],
+        state["latest_created_at"],
+        state["latest_reviewed_at"],
+        state["comment_total"],
+        request.GET.urlencode(),
+    ))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+# 챌린지 내 사진 목록 조회 (이름 필터링 + 키셋 커서 + ETag)
 class ChallengeImageListView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @replica_reads()  # ETag 계산 쿼리까지 복제본에서
+    @method_decorator(condition(etag_func=_album_etag))
     def get(self, request, challenge_id):
         name = request.query_params.get("name", None)
-        photos = get_challenge_images(challenge_id, name)
 
-        serializer = CompleteImageListSerializer(photos, many=True)
-        return Response(serializer.data, status=200)
+        try:
+            page_size = int(request.query_params.get("page_size", ALBUM_PAGE_SIZE))
+        except ValueError:
+            return Response({"detail": "page_size는 정수여야 합니다."}, status=400)
+        page_size = max(1, min(page_size, ALBUM_MAX_PAGE_SIZE))
+
+        photos, next_cursor = get_challenge_images_page(
+            challenge_id,
+            name,
+            cursor=request.query_params.get("cursor") or None,
+            limit=page_size,
+        )
+
+        serializer = CompleteImageListSerializer(photos, many=True, context={"request": request})
+        return Response({
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "items": serializer.data,
+        }, status=200)
 
 
 
@@ -186,7 +264,7 @@ class MyChallengeListView(GenericAPIView):
         category_id = request.query_params.get("category_id")
         search = request.query_params.get("search")
 
-        member_qs = my_challenges_selector(
+        rows = my_challenge_cards_selector(
             user=request.user,
             status=status_q,
             include_owner=include_owner,
@@ -195,37 +273,11 @@ class MyChallengeListView(GenericAPIView):
             search=search,
         )
 
-        page = self.paginate_queryset(member_qs)
-        rows = page if page is not None else member_qs
-
-        items = []
-        for cm in rows:
-            ch = cm.challenge
-            items.append({
-                "challenge_member": {
-                    "challenge_member_id": cm.id,
-                    "challenge_id": cm.challenge_id,
-                    "user_id": cm.user_id,
-                    "role": cm.role,
-                    "joined_at": cm.joined_at,
-                },
-                "challenge": {
-                    "id": ch.id,
-                    "title": ch.title,
-                    "subtitle": ch.subtitle,
-                    "cover_image": _abs_image_url(request, ch.cover_image),
-                    "duration_weeks": ch.duration_weeks,
-                    "freq_type": ch.freq_type,
-                    "freq_n_days": ch.freq_n_days,
-                    "entry_fee": ch.entry_fee,
-                    "category": {"id": ch.category_id, "name": ch.category.name if ch.category else None},
-                    "member_count": ch.member_count_cache,
-                    "member_limit": ch.member_limit,
-                    "status": ch.status,
-                    "start_date": ch.start_date,
-                    "end_date": ch.end_date,
-                }
-            })
+        page = self.paginate_queryset(rows)
+        rows = page if page is not None else rows
+        # 멤버십/카드 컬럼 튜플 → 응답 dict (모델 인스턴스·ImageField 미사용)
+        to_item = member_card_mapper(request)
+        items = [to_item(row) for row in rows]
 
         if page is not None:
             return self.get_paginated_response(items)
@@ -248,76 +300,48 @@ class MyCompletedChallengeListView(GenericAPIView):
         category_id = request.query_params.get("category_id")
         search = request.query_params.get("search")
 
-        member_qs = my_challenges_selector(
+        rows = my_challenge_cards_selector(
             user=request.user,
             status="ended",
             include_owner=True,
             order=order,
             category_id=int(category_id) if category_id else None,
             search=search,
+            completed=True,
         )
 
-        page = self.paginate_queryset(member_qs)
-        rows = page if page is not None else member_qs
-
-        items = []
-        for cm in rows:
-            ch = cm.challenge
-            items.append({
-                "challenge_member": {
-                    "challenge_member_id": cm.id,
-                    "challenge_id": cm.challenge_id,
-                    "user_id": cm.user_id,
-                    "role": cm.role,
-                    "joined_at": cm.joined_at,
-                    "success_rate": cm.success_rate,
-                    "final_points_awarded": cm.final_points_awarded or 0,
-                    "final_rank": cm.final_rank,
-                    "ended_at": cm.ended_at,
-                },
-                "challenge": {
-                    "id": ch.id,
-                    "title": ch.title,
-                    "subtitle": ch.subtitle,
-                    "cover_image": _abs_image_url(request, ch.cover_image),
-                    "duration_weeks": ch.duration_weeks,
-                    "freq_type": ch.freq_type,
-                    "freq_n_days": ch.freq_n_days,
-                    "entry_fee": ch.entry_fee,
-                    "category": {"id": ch.category_id, "name": ch.category.name if ch.category else None},
-                    "member_count": ch.member_count_cache,
-                    "member_limit": ch.member_limit,
-                    "status": ch.status,
-                    "start_date": ch.start_date,
-                    "end_date": ch.end_date,
-                }
-            })
+        page = self.paginate_queryset(rows)
+        rows = page if page is not None else rows
+        # 멤버십/카드 컬럼 튜플 → 응답 dict (모델 인스턴스·ImageField 미사용)
+        to_item = member_card_mapper(request, completed=True)
+        items = [to_item(row) for row in rows]
 
         if page is not None:
             return self.get_paginated_response(items)
         return Response({"page": 1, "page_size": len(items), "total": len(items), "items": items})
 
-def _calc_streak_days(user_id: int, challenge_id: int) -> int:
+def _calc_streak_days_by_user(challenge_id: int) -> dict:
     """
-    오늘을 끝점으로 승인된 인증의 연속 일수
+    오늘을 끝점으로 승인된 인증의 연속 일수 (참가자 전체를 쿼리 1번으로)
+    - {user_id: streak_days}, 승인 기록이 없는 유저는 키 없음
     """
     today = timezone.localdate()
-    qs = (CompleteImage.objects
-        .filter(challenge_member__challenge_id=challenge_id, user_id=user_id, status="approved")
-        .values_list("date", flat=True)
-        .distinct()
-        .order_by("-date"))
-    dates = list(qs)
-    if not dates:
-        return 0
-    streak, cursor = 0, today
-    for d in dates:
-        if d == cursor:
+    dates_by_user = {}
+    rows = (CompleteImage.objects
+        .filter(challenge_id=challenge_id, status="approved", date__lte=today)
+        .values_list("user_id", "date")
+        .distinct())
+    for uid, d in rows:
+        dates_by_user.setdefault(uid, set()).add(d)
+
+    streaks = {}
+    for uid, dates in dates_by_user.items():
+        streak, cursor = 0, today
+        while cursor in dates:
             streak += 1
             cursor = cursor - timedelta(days=1)
-        elif d < cursor:
-            break
-    return streak
+        streaks[uid] = streak
+    return streaks
 
 class ChallengeDetailView(GenericAPIView):
     """
@@ -343,7 +367,7 @@ class ChallengeDetailView(GenericAPIView):
             # is_joined 계산을 위해 __me_member__ 속성만 비워둠
             setattr(challenge, "__me_member__", [])
             ser = ChallengeDetailForGuestSerializer(challenge, context={"request": request})
-            return Response(ser.data, status=200)
+            return cache_compressed(Response(ser.data, status=200))
 
         # ✅ 참여자 응답(최소 구현)
         setattr(challenge, "__my_member__", my_member)
@@ -354,14 +378,14 @@ class ChallengeDetailView(GenericAPIView):
                    .filter(challenge_id=challenge.id))
 
         today_approved_uids = set(CompleteImage.objects.filter(
-            challenge_member__challenge_id=challenge.id,
+            challenge_id=challenge.id,
             status="approved",
             date=today
         ).values_list("user_id", flat=True))
 
         latest_approved = (
             CompleteImage.objects
-            .filter(challenge_member__challenge_id=challenge.id, status="approved")
+            .filter(challenge_id=challenge.id, status="approved")
             .order_by("user_id", "-date", "-id")
         )
 
@@ -369,13 +393,12 @@ class ChallengeDetailView(GenericAPIView):
         for img in latest_approved:
             uid = img.user_id
             if uid not in latest_map:
-                # ✅ HEIC → JPEG 변환본 우선 사용
-                if getattr(img, "converted_image", None):
-                    latest_map[uid] = img.converted_image.url.lstrip("/")
-                elif img.image:
-                    latest_map[uid] = img.image.url.lstrip("/")
-                else:
-                    latest_map[uid] = None
+                # ✅ HEIC → JPEG 변환본 우선 사용 (요청자 기준 서명 URL)
+                url = signed_media_url(img.converted_image or img.image,
+                                       challenge_id=challenge.id, user_id=request.user.id)
+                latest_map[uid] = url.lstrip("/") if url else None
+
+        streaks = _calc_streak_days_by_user(challenge.id)
 
         participants = []
         for m in members:
@@ -387,7 +410,7 @@ class ChallengeDetailView(GenericAPIView):
                 "user_id": uid,
                 "name": m.user.name if m.user and m.user.name else "",
                 "avatar": None,
-                "streak_days": _calc_streak_days(uid, challenge.id),
+                "streak_days": streaks.get(uid, 0),
                 "has_proof_today": has_today,
                 "latest_proof_image": latest,
                 "display_thumbnail": display,
@@ -440,7 +463,7 @@ class ChallengeDetailView(GenericAPIView):
             "invite_codes": invite_codes,   # ✅ 추가
         }
         ser = ChallengeDetailForMemberSerializer(payload)
-        return Response(ser.data, status=200)
+        return cache_compressed(Response(ser.data, status=200))
 
 
 
@@ -596,3 +619,35 @@ class InviteCodeJoinView(APIView):
         # 3) 응답 시리얼라이즈 + 200 OK
         out_ser = InviteCodeJoinOutSerializer(payload)
         return Response(out_ser.data, status=status.HTTP_200_OK)
+
+
+class MediaView(APIView):
+    """
+    GET /media/<name>
+    - 인증 이미지(complete_images/): 둘 중 하나
+      · ?sig=<서명 토큰> (API 응답의 이미지 URL, <img src>로 바로 사용) → 서명/만료 + 토큰의 user가 아직 그 챌린지 멤버
+      · 서명 없음 → 로그인 + 해당 기록의 챌린지 멤버만 (API와 같은 Bearer/세션 인증)
+    - 그 외(챌린지 커버 등): 공개
+    - 파일 전송은 프록시로 넘김 (MEDIA_ACCEL_MODE, main.utils.media_serving)
+    """
+    permission_classes = [AllowAny]
+    PROTECTED_PREFIX = "complete_images/"
+
+    def get(self, request, name):
+        # 접두사 검사 전에 정규화 (../ 로 공개 분기를 거쳐 인증 이미지에 닿지 않도록)
+        name = clean_media_name(name)
+        if name.startswith(self.PROTECTED_PREFIX):
+            token = request.query_params.get("sig")
+            if token:
+                scope = unsign_media_token(token, name)
+                if scope is None or not can_view_signed_complete_image(scope["u"], scope["c"]):
+                    raise NotFound()  # 만료/변조/권한 없음 모두 존재 여부를 숨김
+            elif not request.user.is_authenticated:
+                raise NotAuthenticated()
+            elif not can_view_complete_image_file(request.user, name):
+                raise NotFound()  # 권한 없는 파일은 존재 여부도 숨김
+            # 내용 주소 기반 이름 → 바이트가 바뀌지 않음 (권한 확인이 있으므로 private)
+            return serve_media(request, complete_image_storage(), name,
+                               cache_control=f"private, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable")
+        return serve_media(request, default_storage, name,
+                           cache_control=f"public, max-age={settings.MEDIA_PUBLIC_MAX_AGE}")
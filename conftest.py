@@ -0,0 +1,211 @@
+"""
+엔드포인트 쿼리 예산(query budget) 테스트 공용 픽스처
+- 세션 시작 시 현실적인 규모의 데이터를 한 번만 시드 (챌린지 1개 × 멤버 200명 × 30일 인증)
+- query_budget: 블록 안에서 실행된 쿼리 수를 상한과 비교 + 리포트에 기록
+- pytest --query-budget-report=query_budgets.json → CI에서 비교 가능한 JSON 리포트 출력
+"""
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+
+import pytest
+
+REPORT = []
+
+SEED_MEMBERS = 200
+SEED_DAYS = 30
+SEED_COMMENTS = 40
+SEED_PASSWORD = "pw12345678"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--query-budget-report",
+        default=None,
+        help="엔드포인트별 쿼리 수/예산 리포트(JSON) 저장 경로",
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    path = session.config.getoption("--query-budget-report")
+    if not path or not REPORT:
+        return
+    entries = sorted(REPORT, key=lambda r: r["name"])
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "seed": {"members": SEED_MEMBERS, "days": SEED_DAYS, "comments": SEED_COMMENTS},
+            "endpoints": entries,
+            "over_budget": [r["name"] for r in entries if r["queries"] > r["budget"]],
+        }, f, ensure_ascii=False, indent=2)
+
+
+@dataclass
+class SeedData:
+    owner_id: int
+    member_ids: list
+    outsider_id: int
+    challenge_id: int
+    ended_challenge_id: int
+    photo_id: int
+    comment_id: int
+    invite_code: str
+    password: str = SEED_PASSWORD
+
+
+def _seed():
+    from django.contrib.auth.hashers import make_password
+    from django.utils import timezone
+
+    from accounts.models import PointHistory, Profile
+    from challenges.models import (
+        Challenge, ChallengeCategory, ChallengeMember, Comment, CompleteImage, InviteCode,
+    )
+
+    today = timezone.localdate()
+    password = make_password(SEED_PASSWORD)  # 해시 1번만 계산해서 공유
+    users = Profile.objects.bulk_create([
+        Profile(email=f"user{i}@seed.test", name=f"user{i}", password=password, point_balance=100_000)
+        for i in range(SEED_MEMBERS + 1)
+    ])
+    owner, outsider = users[0], users[-1]
+    members = users[:SEED_MEMBERS]
+    category = ChallengeCategory.objects.order_by("id").first()
+
+    def make_challenge(title, status, start, end, weeks):
+        ch = Challenge.objects.create(
+            title=title, owner=owner, category=category, status=status,
+            entry_fee=1000, duration_weeks=weeks, start_date=start, end_date=end,
+            member_limit=SEED_MEMBERS + 50, member_count_cache=SEED_MEMBERS,
+            ai_condition="물 마시는 사진",
+        )
+        cms = ChallengeMember.objects.bulk_create([
+            ChallengeMember(challenge=ch, user=u, role="owner" if u.id == owner.id else "member")
+            for u in members
+        ])
+        return ch, cms
+
+    def make_images(ch, cms, days, end):
+        rows = []
+        for cm in cms:
+            for k in range(days):
+                name = f"complete_images/seed/{ch.id}_{cm.id}_{k}.jpg"
+                rows.append(CompleteImage(
+                    challenge_member=cm, challenge=ch, user_id=cm.user_id,
+                    image=name, converted_image=name.replace("seed/", "seed/converted/"),
+                    # 7일에 한 번은 반려 → streak/성공일 계산이 끊기는 경우 포함
+                    status="rejected" if (cm.id + k) % 7 == 0 else "approved",
+                    date=end - timedelta(days=k),
+                    file_sha1=f"{ch.id:08x}{cm.id:016x}{k:016x}",
+                    phash=(cm.id * 1_000_003 + k) % (2 ** 62),
+                ))
+        CompleteImage.objects.bulk_create(rows, batch_size=2000)
+
+    challenge, cms = make_challenge("seed active", "active", today - timedelta(days=SEED_DAYS - 1), today + timedelta(days=5), 5)
+    make_images(challenge, cms, SEED_DAYS, today)
+
+    ended, ended_cms = make_challenge("seed ended", "ended", today - timedelta(days=14), today - timedelta(days=8), 1)
+    make_images(ended, ended_cms, 7, today - timedelta(days=8))
+
+    photo = CompleteImage.objects.filter(challenge=challenge, user=owner).order_by("-date").first()
+    comments = Comment.objects.bulk_create([
+        Comment(complete_image=photo, user=members[i % len(members)], content=f"comment {i}")
+        for i in range(SEED_COMMENTS)
+    ])
+    CompleteImage.objects.filter(pk=photo.pk).update(comment_count=SEED_COMMENTS)
+
+    code = "challink_SEED01"
+    InviteCode.objects.create(challenge=challenge, code=code, expires_at=timezone.now() + timedelta(days=7))
+
+    PointHistory.objects.bulk_create([
+        PointHistory(user=owner, type="CHARGE", amount=1000, balance_after=1000 * (i + 1), description=f"charge {i}")
+        for i in range(50)
+    ])
+
+    return SeedData(
+        owner_id=owner.id,
+        member_ids=[u.id for u in members],
+        outsider_id=outsider.id,
+        challenge_id=challenge.id,
+        ended_challenge_id=ended.id,
+        photo_id=photo.id,
+        comment_id=comments[0].id,
+        invite_code=code,
+    )
+
+
+@pytest.fixture(scope="session")
+def seed(django_db_setup, django_db_blocker):
+    """세션 단위 시드 데이터 (각 테스트의 변경은 트랜잭션 롤백으로 되돌아감)"""
+    with django_db_blocker.unblock():
+        return _seed()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # 초대코드 등 캐시 상태가 테스트 간 쿼리 수에 영향을 주지 않도록
+    from django.core.cache import cache
+    cache.clear()
+
+    # 폐기 토큰 Bloom 필터도 빈 상태로 (DB는 테스트마다 롤백되므로 첫 요청의 로딩 쿼리를 예산에서 제외)
+    from accounts.revocation import revocation_list
+    revocation_list.reset()
+
+
+@pytest.fixture
+def api():
+    """api(user_id) → 실제 JWT Bearer 헤더를 단 APIClient (인증 쿼리까지 예산에 포함)"""
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from accounts.models import Profile
+
+    def _client(user_id=None):
+        client = APIClient()
+        if user_id is not None:
+            token = AccessToken.for_user(Profile(pk=user_id))
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+    return _client
+
+
+@pytest.fixture
+def query_budget(request):
+    """
+    with query_budget("GET /challenges/{id}/ (member)", 12):
+        res = client.get(...)
+    - 블록의 쿼리 수가 budget을 넘으면 실패 (중복 쿼리 지문을 메시지에 포함)
+    """
+    from django.db import connection
+
+    from main.utils.instrumentation import QueryCollector
+
+    @contextmanager
+    def _budget(name, budget):
+        # execute_wrapper는 파라미터화된 SQL을 받으므로 id만 다른 N+1 쿼리가 같은 지문으로 묶임
+        collector = QueryCollector(capture_stacks=False)
+        with connection.execute_wrapper(collector):
+            yield collector
+        duplicates = collector.duplicates
+        REPORT.append({
+            "name": name,
+            "test": request.node.nodeid,
+            "queries": collector.count,
+            "budget": budget,
+            "headroom": budget - collector.count,
+            "duplicate_queries": sum(c - 1 for _, c in duplicates),
+        })
+        detail = "\n".join(f"  x{c} {fp[:200]}" for fp, c in duplicates[:5])
+        assert collector.count <= budget, f"{name}: {collector.count} queries > budget {budget}\n{detail}"
+
+    return _budget
+
+
+@pytest.fixture
+def stub_gemini(monkeypatch):
+    """AI 판정은 네트워크 없이 항상 승인"""
+    import aiauthentications.services as services
+    monkeypatch.setattr(services, "judge_image", lambda *a, **k: {
+        "approved": True, "reasons": [], "uncertain": False, "raw": None,
+    })
+
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "main"
+
+    def ready(self):
+        # SQLite 연결 PRAGMA 튜닝 시그널 등록
+        from .utils import db_profile  # noqa: F401
@@ -0,0 +1,90 @@
+import io
+import pstats
+import sys
+import time
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from main.utils.profiling import COLLAPSED_EXT, PSTATS_EXT, iter_profiles, read_collapsed
+
+
+class Command(BaseCommand):
+    help = "Aggregate request profiles saved by ProfilingMiddleware into flamegraph-ready collapsed stacks or merged pstats."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--dir", default="", help="프로파일 디렉터리 (기본: settings.PROFILING_DIR)")
+        parser.add_argument("--endpoint", default="", help="엔드포인트 라벨 부분 일치 필터 (예: 'challenges/<int:challenge_id>/')")
+        parser.add_argument("--challenge", type=int, default=0, help="특정 challenge_id 태그만")
+        parser.add_argument("--since-minutes", type=int, default=0, help="최근 N분 내 프로파일만")
+        parser.add_argument("--format", choices=("collapsed", "pstats"), default="collapsed",
+                            help="collapsed: flamegraph.pl/speedscope 입력, pstats: .prof 병합")
+        parser.add_argument("--group-by-endpoint", action="store_true", help="collapsed 스택 루트에 엔드포인트 라벨 추가")
+        parser.add_argument("--output", default="", help="결과 파일 경로 (collapsed는 생략 시 stdout)")
+        parser.add_argument("--top", type=int, default=25, help="pstats 요약 출력 함수 수")
+
+    def handle(self, *args, **opts):
+        fmt = opts["format"]
+        ext = COLLAPSED_EXT if fmt == "collapsed" else PSTATS_EXT
+        cutoff = time.time() - opts["since_minutes"] * 60 if opts["since_minutes"] else None
+
+        matched = []
+        for meta, path in iter_profiles(opts["dir"] or None):
+            if not path.endswith(ext):
+                continue
+            if opts["endpoint"] and opts["endpoint"] not in meta.get("endpoint", ""):
+                continue
+            if opts["challenge"] and meta.get("challenge_id") != opts["challenge"]:
+                continue
+            if cutoff and meta.get("at", 0) < cutoff:
+                continue
+            matched.append((meta, path))
+        if not matched:
+            raise CommandError(f"No {fmt} profiles matched the filters.")
+
+        # 요약은 stderr로 (collapsed를 stdout으로 받아 파이프할 수 있게)
+        summary = defaultdict(list)
+        for meta, _ in matched:
+            summary[meta.get("endpoint", "?")].append(meta.get("duration_ms") or 0)
+        for endpoint, durations in sorted(summary.items(), key=lambda kv: -len(kv[1])):
+            self.stderr.write(f"  {endpoint:<60} profiles={len(durations):>4} avg={sum(durations) / len(durations):8.1f}ms")
+
+        if fmt == "collapsed":
+            self._collapsed(matched, opts)
+        else:
+            self._pstats(matched, opts)
+
+    def _collapsed(self, matched, opts):
+        merged = Counter()
+        for meta, path in matched:
+            root = meta.get("endpoint", "?").replace(";", ",") + ";" if opts["group_by_endpoint"] else ""
+            for stack, n in read_collapsed(path).items():
+                merged[root + stack] += n
+
+        out = open(opts["output"], "w", encoding="utf-8") if opts["output"] else sys.stdout
+        try:
+            for stack, n in merged.most_common():
+                out.write(f"{stack} {n}\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        if opts["output"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"Merged {len(matched)} profiles, {sum(merged.values())} samples → {opts['output']} "
+                f"(flamegraph.pl {opts['output']} > flame.svg)"
+            ))
+
+    def _pstats(self, matched, opts):
+        stats = pstats.Stats(matched[0][1], stream=io.StringIO())
+        for _, path in matched[1:]:
+            stats.add(path)
+
+        buf = io.StringIO()
+        stats.stream = buf
+        stats.sort_stats("cumulative").print_stats(opts["top"])
+        self.stdout.write(buf.getvalue())
+        if opts["output"]:
+            stats.dump_stats(opts["output"])
+            self.stdout.write(self.style.SUCCESS(
+                f"Merged {len(matched)} profiles → {opts['output']} (snakeviz / flameprof)"
+            ))
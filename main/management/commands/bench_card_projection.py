@@ -0,0 +1,118 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test import RequestFactory
+
+from challenges.models import Challenge, ChallengeMember
+from challenges.selectors import _filter_challenges
+from challenges.serializers import ChallengeCardSerializer
+from challenges.utils.card_projection import (
+    CARD_COLUMNS, challenge_card_mapper, member_card_columns, member_card_mapper,
+)
+
+
+def _legacy_cover(request, image_field):
+    # 이전 MyChallengeListView의 _abs_image_url (ImageFieldFile 디스크립터 경유)
+    if not image_field:
+        return None
+    try:
+        url = image_field.url
+    except Exception:
+        return None
+    return request.build_absolute_uri(url)
+
+
+def legacy_member_items(request, members):
+    items = []
+    for cm in members:
+        ch = cm.challenge
+        items.append({
+            "challenge_member": {
+                "challenge_member_id": cm.id,
+                "challenge_id": cm.challenge_id,
+                "user_id": cm.user_id,
+                "role": cm.role,
+                "joined_at": cm.joined_at,
+                "success_rate": cm.success_rate,
+                "final_points_awarded": cm.final_points_awarded or 0,
+                "final_rank": cm.final_rank,
+                "ended_at": cm.ended_at,
+            },
+            "challenge": {
+                "id": ch.id,
+                "title": ch.title,
+                "subtitle": ch.subtitle,
+                "cover_image": _legacy_cover(request, ch.cover_image),
+                "duration_weeks": ch.duration_weeks,
+                "freq_type": ch.freq_type,
+                "freq_n_days": ch.freq_n_days,
+                "entry_fee": ch.entry_fee,
+                "category": {"id": ch.category_id, "name": ch.category.name if ch.category else None},
+                "member_count": ch.member_count_cache,
+                "member_limit": ch.member_limit,
+                "status": ch.status,
+                "start_date": ch.start_date,
+                "end_date": ch.end_date,
+            },
+        })
+    return items
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark card list building: model instances + ChallengeCardSerializer / hand-built dicts "
+        "versus values_list projection + precompiled row mappers (rows per second, query included)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--rows", type=int, default=500, help="한 번에 만들 카드 수 (DB에 있는 만큼까지)")
+        parser.add_argument("--repeat", type=int, default=30, help="반복 횟수 (중앙값 보고)")
+
+    def _rate(self, fn, repeat):
+        n = len(fn())  # 워밍업 + 행 수
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - t0)
+        median = statistics.median(samples)
+        return n, median * 1000, n / median if median else 0
+
+    def handle(self, *args, **opts):
+        rows, repeat = max(1, int(opts["rows"])), max(1, int(opts["repeat"]))
+        if not Challenge.objects.exists():
+            raise CommandError("No challenges in the database; run generate_synthetic_data first.")
+        request = RequestFactory().get("/challenges/")
+
+        def cards_serializer():
+            challenges = list(_filter_challenges(include_full_slots=True)[:rows])
+            for ch in challenges:
+                setattr(ch, "__me_member__", [])
+            return ChallengeCardSerializer(challenges, many=True, context={"request": request}).data
+
+        def cards_projection():
+            to_card = challenge_card_mapper(request)
+            return [to_card(row) for row in _filter_challenges(include_full_slots=True).values_list(*CARD_COLUMNS)[:rows]]
+
+        members = (ChallengeMember.objects.select_related("challenge", "challenge__category")
+                   .order_by("-challenge__created_at", "-id"))
+
+        def members_legacy():
+            return legacy_member_items(request, list(members[:rows]))
+
+        def members_projection():
+            to_item = member_card_mapper(request, completed=True)
+            return [to_item(row) for row in members.values_list(*member_card_columns(completed=True))[:rows]]
+
+        for label, before, after in (
+            ("challenge cards (GET /challenges/)", cards_serializer, cards_projection),
+            ("member cards (GET /challenges/my/completed/)", members_legacy, members_projection),
+        ):
+            n, old_ms, old_rate = self._rate(before, repeat)
+            _, new_ms, new_rate = self._rate(after, repeat)
+            self.stdout.write(self.style.NOTICE(f"{label}: {n} rows"))
+            self.stdout.write(f"  instances   {old_ms:8.2f} ms  {old_rate:10,.0f} rows/s")
+            self.stdout.write(
+                f"  projection  {new_ms:8.2f} ms  {new_rate:10,.0f} rows/s  x{old_ms / new_ms:.1f}"
+            )
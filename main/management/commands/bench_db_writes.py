@@ -0,0 +1,157 @@
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, connections
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from main.management.commands.generate_synthetic_data import make_jpeg
+
+
+def _phase_stats(name, latencies, errors, elapsed):
+    values = sorted(latencies)
+    return {
+        "phase": name,
+        "ok": len(values),
+        "errors": dict(errors),
+        "ops_per_s": round(len(values) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(statistics.median(values) * 1000, 2) if values else None,
+        "p95_ms": round(values[int(0.95 * (len(values) - 1))] * 1000, 2) if values else None,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Write-throughput benchmark for join_challenge and image uploads across DB profiles "
+        "(SQLite default journaling vs WAL tuning, optional Postgres persistent vs pooled)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--threads", type=int, default=8, help="동시 쓰기 스레드 수")
+        parser.add_argument("--ops", type=int, default=25, help="스레드당 참가/업로드 횟수")
+        parser.add_argument("--postgres-url", default="", help="Postgres 프로파일도 비교 (빈 DB의 DATABASE_URL, psycopg 필요)")
+        parser.add_argument("--worker", action="store_true", help="(내부용) 현재 DB 설정으로 측정만 하고 JSON 출력")
+
+    def handle(self, *args, **opts):
+        if opts["worker"]:
+            self.stdout.write(json.dumps(self._work(int(opts["threads"]), int(opts["ops"]))))
+            return
+
+        # 프로파일마다 새 프로세스 + 새 DB (설정은 import 시점에 결정되므로 환경변수로 전환)
+        tmpdir = tempfile.mkdtemp(prefix="bench_db_")
+        profiles = [
+            ("sqlite default", {"DATABASE_URL": f"sqlite:///{tmpdir}/default.sqlite3", "SQLITE_TUNING": "0"}),
+            ("sqlite WAL tuned", {"DATABASE_URL": f"sqlite:///{tmpdir}/tuned.sqlite3", "SQLITE_TUNING": "1"}),
+        ]
+        if opts["postgres_url"]:
+            profiles += [
+                ("postgres persistent", {"DATABASE_URL": opts["postgres_url"], "DB_POOL": "0"}),
+                ("postgres pool", {"DATABASE_URL": opts["postgres_url"], "DB_POOL": "1"}),
+            ]
+
+        manage = os.path.join(settings.BASE_DIR, "manage.py")
+        try:
+            for label, extra in profiles:
+                env = dict(os.environ, **extra)
+                subprocess.run([sys.executable, manage, "migrate", "-v0"], env=env, check=True)
+                proc = subprocess.run(
+                    [sys.executable, manage, "bench_db_writes", "--worker",
+                     "--threads", str(opts["threads"]), "--ops", str(opts["ops"])],
+                    env=env, capture_output=True, text=True,
+                )
+                if proc.returncode != 0:
+                    self.stderr.write(f"{label}: worker failed\n{proc.stderr[-2000:]}")
+                    continue
+                result = json.loads(proc.stdout.strip().splitlines()[-1])
+                self.stdout.write(self.style.NOTICE(f"{label} ({opts['threads']} threads x {opts['ops']} ops)"))
+                for phase in result["phases"]:
+                    self.stdout.write(
+                        f"  {phase['phase']:<8} {phase['ops_per_s']:>8} ops/s  p50 {phase['p50_ms']:>8} ms  "
+                        f"p95 {phase['p95_ms']:>8} ms  ok={phase['ok']} errors={phase['errors'] or 0}"
+                    )
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def _work(self, n_threads, n_ops):
+        from accounts.models import Profile
+        from challenges.models import Challenge, ChallengeCategory, ChallengeMember, CompleteImage
+        from challenges.services import join_challenge
+
+        today = timezone.localdate()
+        password = make_password("bench-password")
+        users = Profile.objects.bulk_create([
+            Profile(email=f"bench-{i}@bench.local", password=password, point_balance=100_000)
+            for i in range(n_threads * n_ops + 1)
+        ])
+        owner = users.pop()
+        challenge = Challenge.objects.create(
+            title="bench", owner=owner, category=ChallengeCategory.objects.order_by("id").first(),
+            status="active", entry_fee=1000, start_date=today, end_date=today,
+            member_limit=len(users) + 1, ai_condition="bench",
+        )
+        ChallengeMember.objects.create(challenge=challenge, user=owner, role="owner")
+        rng = random.Random(0)
+        images = [make_jpeg(rng, size=32) for _ in range(len(users))]  # 측정 구간 밖에서 미리 생성
+
+        def run_phase(name, op, indexes):
+            latencies, errors, lock = [], Counter(), threading.Lock()
+            done = []
+
+            def worker(t):
+                try:
+                    for i in indexes[t::n_threads]:
+                        t0 = time.perf_counter()
+                        try:
+                            op(i)
+                        except Exception as e:
+                            with lock:
+                                errors[f"{type(e).__name__}: {str(e)[:60]}"] += 1
+                            continue
+                        with lock:
+                            latencies.append(time.perf_counter() - t0)
+                            done.append(i)
+                finally:
+                    connections.close_all()
+
+            threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+            started = time.perf_counter()
+            for th in threads:
+                th.start()
+            for th in threads:
+                th.join()
+            return _phase_stats(name, latencies, errors, time.perf_counter() - started), sorted(done)
+
+        def join(i):
+            join_challenge(user=users[i], challenge_id=challenge.id, agree_terms=True)
+
+        def upload(i):
+            # 업로드 뷰의 쓰기 부분: 멤버십 조회 + 파일 저장(blob 등록) + CompleteImage 생성/참조 증가
+            cm = ChallengeMember.objects.get(challenge_id=challenge.id, user_id=users[i].id)
+            CompleteImage.objects.create(
+                challenge_member=cm, challenge_id=challenge.id, user_id=users[i].id,
+                image=ContentFile(images[i], name="bench.jpg"), status="approved", date=today,
+            )
+
+        media = tempfile.mkdtemp(prefix="bench_db_media_")
+        try:
+            with override_settings(MEDIA_ROOT=media):
+                joined, joined_idx = run_phase("join", join, list(range(len(users))))
+                # 참가에 성공한 사용자만 업로드 (참가 실패가 업로드 오류로 번지지 않게)
+                uploaded, _ = run_phase("upload", upload, joined_idx)
+                phases = [joined, uploaded]
+        finally:
+            shutil.rmtree(media, ignore_errors=True)
+        return {"vendor": connection.vendor, "phases": phases}
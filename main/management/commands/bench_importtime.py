@@ -0,0 +1,76 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+# python -X importtime 출력: "import time: self [us] | cumulative | imported package"
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+# 워커 기동 시 특히 무거운 서드파티 패키지 (최상위 import 기준으로 따로 보고)
+WATCH = ("google.genai", "google.generativeai", "pillow_heif", "PIL.Image", "imagehash", "numpy", "scipy", "httpx")
+
+
+class Command(BaseCommand):
+    help = "Cold-start benchmark: run `python -X importtime manage.py <cmd>` in fresh processes and report import cost."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--command", default="check", help="측정할 manage.py 하위 커맨드")
+        parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (중앙값 보고)")
+        parser.add_argument("--top", type=int, default=15, help="누적 import 시간 상위 모듈 수")
+
+    def _run_once(self, command):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", os.path.join(settings.BASE_DIR, "manage.py"), command],
+            capture_output=True, text=True, cwd=settings.BASE_DIR,
+        )
+        wall = time.perf_counter() - t0
+        if proc.returncode != 0:
+            self.stderr.write(proc.stdout + proc.stderr[-2000:])
+        cumulative, total = {}, 0
+        for line in proc.stderr.splitlines():
+            m = _LINE.match(line)
+            if not m:
+                continue
+            own, cum, name = int(m.group(1)), int(m.group(2)), m.group(4)
+            total += own
+            # 모듈은 처음 import될 때 한 번만 찍힘
+            cumulative[name] = cum
+        return wall, total, cumulative
+
+    def handle(self, *args, **opts):
+        repeat = max(1, int(opts["repeat"]))
+        # 첫 실행은 .pyc 생성 등 준비 비용이 섞이므로 버림
+        self._run_once(opts["command"])
+
+        walls, totals, per_module = [], [], defaultdict(list)
+        for _ in range(repeat):
+            wall, total, cumulative = self._run_once(opts["command"])
+            walls.append(wall)
+            totals.append(total)
+            for name, us in cumulative.items():
+                per_module[name].append(us)
+
+        self.stdout.write(self.style.NOTICE(
+            f"manage.py {opts['command']} x{repeat}: wall {statistics.median(walls) * 1000:.0f} ms, "
+            f"imports {statistics.median(totals) / 1000:.0f} ms (median)"
+        ))
+        self.stdout.write("  watched packages (cumulative, 0 = not imported):")
+        for name in WATCH:
+            samples = per_module.get(name)
+            ms = statistics.median(samples) / 1000 if samples else 0.0
+            self.stdout.write(f"    {name:<24} {ms:8.1f} ms")
+
+        self.stdout.write(f"  top {opts['top']} by cumulative time:")
+        top = sorted(
+            ((statistics.median(v), k) for k, v in per_module.items() if "." not in k),
+            reverse=True,
+        )[: opts["top"]]
+        for us, name in top:
+            self.stdout.write(f"    {name:<24} {us / 1000:8.1f} ms")
@@ -0,0 +1,101 @@
+import statistics
+import time
+from datetime import timedelta
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import PointHistory
+from accounts.serializers import PointHistorySerializer
+from challenges.serializers import ChallengeDetailForMemberSerializer
+from main.utils.parsers import ORJSONParser
+from main.utils.renderers import ORJSONRenderer
+
+
+def detail_payload(participants):
+    """ChallengeDetailView(참여자 화면)와 같은 모양의 직렬화 결과 (DB 없이 생성)"""
+    now = timezone.now()
+    today = timezone.localdate()
+    payload = {
+        "id": 1, "title": "매일 아침 러닝 30분", "entry_fee": 5000, "duration_weeks": 4,
+        "freq_type": "DAILY", "freq_n_days": None, "category": {"id": 1, "name": "운동"},
+        "status": "active", "start_date": today, "end_date": today + timedelta(days=27),
+        "member_count": participants, "member_limit": participants + 10,
+        "progress_summary": {"success_today": participants // 2, "total_members": participants, "date": today},
+        "participants": [
+            {
+                "user_id": i, "name": f"참가자{i}", "avatar": None, "streak_days": i % 28,
+                "has_proof_today": i % 2 == 0,
+                "latest_proof_image": f"media/complete_images/ab/cd/{i:064x}.jpg" if i % 2 == 0 else None,
+                "display_thumbnail": f"media/complete_images/ab/cd/{i:064x}.jpg" if i % 2 == 0 else "icons/default.png",
+                "is_owner": i == 0,
+            }
+            for i in range(participants)
+        ],
+        "my_membership": {"is_joined": True, "challenge_member_id": 1, "role": "owner", "joined_at": now},
+        "settlement_note": "🔥 총 참가비: N p / 모인 참가비를 성공자들에게 N:1 분배해요",
+        "ai_condition": "러닝 앱 기록 화면 또는 야외 러닝 사진",
+        "total_entry_pot": 5000 * participants,
+        "invite_codes": [{"code": "AbC123", "expires_at": now + timedelta(days=1), "case_sensitive": True}],
+    }
+    return ChallengeDetailForMemberSerializer(payload).data
+
+
+def wallet_page(rows):
+    """WalletHistoryView 한 페이지 (PageNumberPagination 응답 모양)"""
+    now = timezone.now()
+    items = [
+        PointHistory(
+            point_history_id=i, type="REWARD" if i % 3 else "JOIN", amount=1000 if i % 3 else -5000,
+            balance_after=100_000 + i, description=f"[정산] 챌린지 {i}", occurred_at=now - timedelta(hours=i),
+        )
+        for i in range(rows)
+    ]
+    return {
+        "count": 10_000, "next": "http://testserver/wallet/history/?page=2", "previous": None,
+        "results": PointHistorySerializer(items, many=True).data,
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark DRF JSONRenderer/JSONParser against the orjson-based renderer/parser on representative payloads."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--participants", type=int, default=500, help="챌린지 상세 참가자 수")
+        parser.add_argument("--rows", type=int, default=100, help="지갑 내역 페이지 행 수")
+        parser.add_argument("--repeat", type=int, default=200, help="반복 횟수 (중앙값 보고)")
+
+    def _time(self, fn, repeat):
+        fn()  # 워밍업
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - t0)
+        return statistics.median(samples) * 1000
+
+    def handle(self, *args, **opts):
+        repeat = max(1, int(opts["repeat"]))
+        payloads = [
+            (f"challenge detail ({opts['participants']} participants)", detail_payload(int(opts["participants"]))),
+            (f"wallet history ({opts['rows']} rows)", wallet_page(int(opts["rows"]))),
+        ]
+        stdlib, fast = JSONRenderer(), ORJSONRenderer()
+        for label, data in payloads:
+            expected = stdlib.render(data)
+            if fast.render(data) != expected:
+                self.stderr.write(f"{label}: orjson output differs from JSONRenderer")
+            render_std = self._time(lambda: stdlib.render(data), repeat)
+            render_fast = self._time(lambda: fast.render(data), repeat)
+            parse_std = self._time(lambda: JSONParser().parse(BytesIO(expected)), repeat)
+            parse_fast = self._time(lambda: ORJSONParser().parse(BytesIO(expected)), repeat)
+            self.stdout.write(self.style.NOTICE(f"{label}: {len(expected) / 1024:.1f} KB"))
+            self.stdout.write(
+                f"  render  json {render_std:8.3f} ms  orjson {render_fast:8.3f} ms  x{render_std / render_fast:.1f}"
+            )
+            self.stdout.write(
+                f"  parse   json {parse_std:8.3f} ms  orjson {parse_fast:8.3f} ms  x{parse_std / parse_fast:.1f}"
+            )
@@ -0,0 +1,190 @@
+import io
+import json
+import random
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+
+from accounts.models import Profile
+from aiauthentications.utils.image_hashing import calc_sha1
+from challenges.models import (
+    Challenge, ChallengeCategory, ChallengeMember, Comment, CompleteImage, MediaBlob,
+)
+
+BATCH_SIZE = 2000
+
+
+def make_jpeg(rng: random.Random, size: int = 96) -> bytes:
+    """작은 실제 JPEG (그라디언트 + 노이즈 → 이미지마다 바이트/해시가 다름)"""
+    base = [rng.randrange(256) for _ in range(3)]
+    im = Image.new("RGB", (size, size))
+    px = im.load()
+    for y in range(size):
+        for x in range(size):
+            px[x, y] = (
+                (base[0] + x * 2) % 256,
+                (base[1] + y * 2) % 256,
+                (base[2] + rng.randrange(32)) % 256,
+            )
+    buf = io.BytesIO()
+    im.save(buf, "JPEG", quality=80)
+    return buf.getvalue()
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic users/challenges/members/CompleteImage rows (with real small JPEGs) for load tests."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=500, help="생성할 사용자 수 (N)")
+        parser.add_argument("--challenges", type=int, default=50, help="생성할 챌린지 수 (M)")
+        parser.add_argument("--members", type=int, default=20, help="챌린지당 멤버 수 (방장 포함)")
+        parser.add_argument("--days", type=int, default=30, help="인증 이미지를 만들 일수 (K)")
+        parser.add_argument("--ended-ratio", type=float, default=0.2, help="종료된 챌린지 비율 (정산/보상 조회용)")
+        parser.add_argument("--upload-ratio", type=float, default=0.8, help="멤버별 하루 인증 확률")
+        parser.add_argument("--reject-ratio", type=float, default=0.1, help="인증 중 반려 비율")
+        parser.add_argument("--comments", type=float, default=0.3, help="승인 사진당 평균 댓글 수")
+        parser.add_argument("--image-pool", type=int, default=200, help="실제로 저장할 서로 다른 JPEG 수 (행들이 나눠 참조)")
+        parser.add_argument("--prefix", default="load", help="이메일/제목 접두사 (여러 번 생성 시 구분)")
+        parser.add_argument("--password", default="loadtest1234", help="모든 생성 계정의 비밀번호")
+        parser.add_argument("--seed", type=int, default=42, help="난수 시드 (같은 값이면 같은 데이터)")
+        parser.add_argument("--manifest", default="loadtest_manifest.json", help="부하 드라이버용 매니페스트(JSON) 저장 경로")
+
+    def handle(self, *args, **opts):
+        n_users = int(opts["users"])
+        n_challenges = int(opts["challenges"])
+        n_members = min(int(opts["members"]), n_users)
+        days = int(opts["days"])
+        pool_size = max(days, int(opts["image_pool"]))  # 한 사용자가 같은 이미지를 두 번 쓰지 않도록 최소 K개
+        prefix = opts["prefix"]
+        rng = random.Random(opts["seed"])
+
+        if n_users < 1 or n_challenges < 1 or n_members < 1 or days < 1:
+            raise CommandError("--users/--challenges/--members/--days must be positive.")
+        if Profile.objects.filter(email__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Users with prefix '{prefix}-' already exist. Use another --prefix.")
+        category_ids = list(ChallengeCategory.objects.values_list("id", flat=True))
+        if not category_ids:
+            raise CommandError("No ChallengeCategory rows. Run migrations first.")
+
+        # 1) 이미지 풀: 실제 JPEG을 내용 주소 저장소로 저장 (같은 바이트는 blob 1개)
+        storage = CompleteImage._meta.get_field("image").storage
+        pool = []
+        for _ in range(pool_size):
+            content = ContentFile(make_jpeg(rng), name="synthetic.jpg")
+            sha1 = calc_sha1(content)
+            content.sha1 = sha1
+            pool.append((storage.save("complete_images/synthetic.jpg", content), sha1))
+        self.stdout.write(f"Image pool: {len(pool)} blobs")
+
+        today = timezone.localdate()
+        password = make_password(opts["password"])  # 해시 1번만 계산해서 공유
+
+        with transaction.atomic():
+            admin = Profile.objects.create(
+                email=f"{prefix}-admin@loadtest.local", name=f"{prefix}-admin",
+                password=password, is_staff=True,
+            )
+            users = Profile.objects.bulk_create([
+                Profile(email=f"{prefix}-{i}@loadtest.local", name=f"{prefix}{i}", password=password, point_balance=1_000_000)
+                for i in range(n_users)
+            ], batch_size=BATCH_SIZE)
+
+            # 2) 챌린지 + 멤버
+            n_ended = int(n_challenges * float(opts["ended_ratio"]))
+            challenges, member_sets = [], []
+            for c in range(n_challenges):
+                ended = c < n_ended
+                end = today - timedelta(days=rng.randint(2, 10)) if ended else today + timedelta(days=rng.randint(3, 14))
+                start = (end if ended else today) - timedelta(days=days - 1)
+                members = rng.sample(users, n_members)
+                challenges.append(Challenge(
+                    title=f"{prefix} challenge {c}", owner=members[0], category_id=rng.choice(category_ids),
+                    status="ended" if ended else "active", entry_fee=rng.choice((0, 1000, 5000)),
+                    duration_weeks=max(1, (end - start).days // 7), start_date=start, end_date=end,
+                    # 진행 중 챌린지는 자리를 남겨 참가(join) 트래픽이 성공할 수 있게
+                    member_limit=n_members if ended else n_members + 10, member_count_cache=n_members,
+                    ai_condition="물 마시는 사진",
+                ))
+                member_sets.append(members)
+            Challenge.objects.bulk_create(challenges, batch_size=BATCH_SIZE)
+
+            cms = ChallengeMember.objects.bulk_create([
+                ChallengeMember(challenge=ch, user=u, role="owner" if i == 0 else "member")
+                for ch, members in zip(challenges, member_sets)
+                for i, u in enumerate(members)
+            ], batch_size=BATCH_SIZE)
+
+            # 3) K일치 인증 이미지 (풀 이미지를 사용자/일자별로 돌려 씀)
+            user_index = {u.id: i for i, u in enumerate(users)}
+            challenge_by_id = {ch.id: ch for ch in challenges}
+            rows, refs = [], Counter()
+            upload_ratio, reject_ratio = float(opts["upload_ratio"]), float(opts["reject_ratio"])
+            for cm in cms:
+                ch = challenge_by_id[cm.challenge_id]
+                last = min(ch.end_date, today)
+                for k in range(days):
+                    if rng.random() >= upload_ratio:
+                        continue
+                    name, sha1 = pool[(user_index[cm.user_id] * 7 + ch.id + k) % pool_size]
+                    refs[name] += 2  # image + converted_image (JPEG은 변환본이 원본과 같은 blob)
+                    rows.append(CompleteImage(
+                        challenge_member=cm, challenge=ch, user_id=cm.user_id,
+                        image=name, converted_image=name,
+                        status="rejected" if rng.random() < reject_ratio else "approved",
+                        date=last - timedelta(days=k), file_sha1=sha1,
+                        width=96, height=96,
+                    ))
+            images = CompleteImage.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+            # bulk_create는 save()를 거치지 않으므로 blob 참조 수를 한 번에 반영
+            blobs = list(MediaBlob.objects.filter(name__in=list(refs)))
+            for blob in blobs:
+                blob.refcount += refs[blob.name]
+            MediaBlob.objects.bulk_update(blobs, ["refcount"], batch_size=BATCH_SIZE)
+
+            # 4) 댓글 (승인 사진에 무작위로)
+            approved = [img for img in images if img.status == "approved"]
+            n_comments = int(len(approved) * float(opts["comments"]))
+            Comment.objects.bulk_create([
+                Comment(
+                    complete_image=rng.choice(approved), user=rng.choice(users),
+                    content=f"comment {i}", x_ratio=rng.random(), y_ratio=rng.random(),
+                )
+                for i in range(n_comments)
+            ] if approved else [], batch_size=BATCH_SIZE)
+
+        call_command("reconcile_comment_counts", stdout=io.StringIO())
+
+        self._write_manifest(opts, admin, users, challenges, member_sets, approved, rng)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created users={len(users)} challenges={len(challenges)} (ended={n_ended}) "
+            f"members={len(cms)} images={len(images)} comments={n_comments} → {opts['manifest']}"
+        ))
+
+    def _write_manifest(self, opts, admin, users, challenges, member_sets, approved, rng):
+        # 드라이버가 "멤버인 챌린지에 업로드", "종료 챌린지 보상 조회" 같은 유효 요청을 만들 수 있게
+        active_of, ended_of = {}, {}
+        for ch, members in zip(challenges, member_sets):
+            target = ended_of if ch.status == "ended" else active_of
+            for u in members:
+                target.setdefault(u.id, []).append(ch.id)
+        manifest = {
+            "password": opts["password"],
+            "admin_email": admin.email,
+            "users": [
+                {"id": u.id, "email": u.email, "active": active_of.get(u.id, []), "ended": ended_of.get(u.id, [])}
+                for u in users
+            ],
+            "active_challenge_ids": [ch.id for ch in challenges if ch.status == "active"],
+            "ended_challenge_ids": [ch.id for ch in challenges if ch.status == "ended"],
+            "photos": [[img.id, img.challenge_id] for img in rng.sample(approved, min(len(approved), 1000))],
+        }
+        with open(opts["manifest"], "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
@@ -0,0 +1,309 @@
+import asyncio
+import json
+import os
+import random
+import time
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from main.management.commands.generate_synthetic_data import make_jpeg
+
+# 기본 트래픽 비율 (조회 위주 + 소량의 쓰기/업로드)
+# 이름은 서버 QueryMetricsMiddleware의 라우트 라벨과 같게 맞춰 DB 쿼리 수를 엔드포인트별로 합침
+TRAFFIC_MIX = {
+    "list": 25,
+    "search": 5,
+    "detail": 15,
+    "album": 15,
+    "my": 8,
+    "photo": 8,
+    "comments": 8,
+    "comment_post": 3,
+    "join": 2,
+    "upload": 4,
+    "rewards": 5,
+    "me": 2,
+}
+
+LOGIN = "POST /auth/login/"
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class _VirtualUser:
+    """가상 사용자 1명: 로그인 후 트래픽 비율대로 요청 반복"""
+
+    def __init__(self, user, manifest, rng):
+        self.user = user
+        self.manifest = manifest
+        self.rng = rng
+        self.headers = {}
+
+    def _mine_or_any(self, key, fallback):
+        ids = self.user[key] or self.manifest[fallback]
+        return self.rng.choice(ids) if ids else None
+
+    def build(self, action):
+        """action → (엔드포인트 라벨, method, path, 요청 kwargs), 만들 수 없으면 None"""
+        m, rng = self.manifest, self.rng
+        if action == "list":
+            return "GET /challenges/", "GET", "/challenges/", {"params": {"order": rng.choice(("recent", "popular"))}}
+        if action == "search":
+            return "GET /challenges/", "GET", "/challenges/", {"params": {"search": "challenge"}}
+        if action in ("detail", "album"):
+            cid = self._mine_or_any("active", "active_challenge_ids")
+            if cid is None:
+                return None
+            if action == "detail":
+                return "GET /challenges/<int:challenge_id>/", "GET", f"/challenges/{cid}/", {}
+            return "GET /challenges/<int:challenge_id>/albums/", "GET", f"/challenges/{cid}/albums/", {}
+        if action == "my":
+            return "GET /challenges/my/", "GET", "/challenges/my/", {}
+        if action in ("photo", "comments", "comment_post"):
+            if not m["photos"]:
+                return None
+            pid, _ = rng.choice(m["photos"])
+            if action == "photo":
+                return "GET /challenges/detail/<int:photo_id>/", "GET", f"/challenges/detail/{pid}/", {}
+            label = "/challenges/detail/<int:photo_id>/comments/"
+            if action == "comments":
+                return f"GET {label}", "GET", f"/challenges/detail/{pid}/comments/", {}
+            body = {"content": "load test", "x_ratio": rng.random(), "y_ratio": rng.random()}
+            return f"POST {label}", "POST", f"/challenges/detail/{pid}/comments/", {"json": body}
+        if action == "join":
+            mine = set(self.user["active"])
+            candidates = [cid for cid in m["active_challenge_ids"] if cid not in mine]
+            if not candidates:
+                return None
+            cid = rng.choice(candidates)
+            mine.add(cid)
+            self.user["active"].append(cid)
+            return ("POST /challenges/<int:challenge_id>/join/", "POST", f"/challenges/{cid}/join/",
+                    {"json": {"agree_terms": True}})
+        if action == "upload":
+            if not self.user["active"]:
+                return None
+            cid = rng.choice(self.user["active"])
+            # 매번 새 이미지 → 중복 단락이 아닌 실제 업로드/판정 경로
+            files = {"image": ("upload.jpg", make_jpeg(rng), "image/jpeg")}
+            return "POST /aiauth/<int:challenge_id>/", "POST", f"/aiauth/{cid}/", {"files": files}
+        if action == "rewards":
+            cid = self._mine_or_any("ended", "ended_challenge_ids")
+            if cid is None:
+                return None
+            return "GET /challenges/<int:challenge_id>/rewards/", "GET", f"/challenges/{cid}/rewards/", {}
+        if action == "me":
+            return "GET /users/me/", "GET", "/users/me/", {}
+        raise CommandError(f"Unknown action: {action}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Async (httpx) load driver: replay a weighted traffic mix against a running server and report "
+        "RPS, p50/p95/p99 and DB queries per endpoint. Start the server with AI_JUDGE_STUB=1."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="대상 서버 주소 (runserver/uvicorn)")
+        parser.add_argument("--manifest", default="loadtest_manifest.json", help="generate_synthetic_data가 만든 매니페스트")
+        parser.add_argument("--concurrency", type=int, default=20, help="동시 가상 사용자 수")
+        parser.add_argument("--duration", type=float, default=30.0, help="측정 시간(초)")
+        parser.add_argument("--mix", default="", help="트래픽 비율 덮어쓰기 (예: list=50,upload=0)")
+        parser.add_argument("--timeout", type=float, default=30.0, help="요청 타임아웃(초)")
+        parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+        parser.add_argument("--label", default="", help="결과에 남길 실행 이름 (예: before, after)")
+        parser.add_argument("--out", default="", help="결과 JSON 경로 (기본: loadtest_results/<시각>.json)")
+        parser.add_argument("--compare", default="", help="이전 결과 JSON과 엔드포인트별 비교 출력")
+        parser.add_argument("--no-server-metrics", action="store_true", help="/metrics/ 조회 생략 (DB 쿼리 수 미포함)")
+
+    def handle(self, *args, **opts):
+        try:
+            import httpx
+        except ImportError:
+            raise CommandError("httpx is required: pip install httpx")
+
+        try:
+            with open(opts["manifest"], encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            raise CommandError(f"Manifest not found: {opts['manifest']}. Run generate_synthetic_data first.")
+
+        mix = dict(TRAFFIC_MIX)
+        for item in filter(None, opts["mix"].split(",")):
+            key, _, weight = item.partition("=")
+            if key.strip() not in mix:
+                raise CommandError(f"Unknown action in --mix: {key}")
+            mix[key.strip()] = float(weight)
+        mix = {k: w for k, w in mix.items() if w > 0}
+        if not mix:
+            raise CommandError("Traffic mix is empty.")
+
+        result = asyncio.run(self._run(httpx, manifest, mix, opts))
+        result["label"] = opts["label"]
+        result["mix"] = mix
+
+        out = opts["out"] or os.path.join(
+            "loadtest_results", f"{timezone.localtime():%Y%m%d-%H%M%S}{'-' + opts['label'] if opts['label'] else ''}.json"
+        )
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+        self._print_report(result)
+        if opts["compare"]:
+            with open(opts["compare"], encoding="utf-8") as f:
+                self._print_compare(json.load(f), result)
+        self.stdout.write(self.style.SUCCESS(f"Saved → {out}"))
+
+    async def _run(self, httpx, manifest, mix, opts):
+        rng = random.Random(opts["seed"])
+        concurrency = max(1, int(opts["concurrency"]))
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        latencies, statuses = defaultdict(list), defaultdict(Counter)
+
+        async with httpx.AsyncClient(base_url=opts["base_url"], timeout=opts["timeout"], limits=limits) as client:
+            async def call(label, method, path, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    res = await client.request(method, path, **kwargs)
+                    status = res.status_code
+                except httpx.HTTPError as e:
+                    res, status = None, type(e).__name__
+                latencies[label].append(time.perf_counter() - t0)
+                statuses[label][str(status)] += 1
+                return res
+
+            async def login(email):
+                res = await call(LOGIN, "POST", "/auth/login/", json={"email": email, "password": manifest["password"]})
+                if res is None or res.status_code != 200:
+                    return None
+                return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+            admin_headers = None
+            if not opts["no_server_metrics"]:
+                admin_headers = await login(manifest["admin_email"])
+                if admin_headers is None:
+                    self.stderr.write("Admin login failed; DB query totals will be skipped.")
+
+            # 가상 사용자 준비 (로그인은 측정 구간 밖에서 1번씩)
+            users = rng.sample(manifest["users"], min(concurrency, len(manifest["users"])))
+            vus = []
+            for user in users:
+                vu = _VirtualUser(dict(user, active=list(user["active"])), manifest, random.Random(rng.random()))
+                vu.headers = await login(user["email"])
+                if vu.headers:
+                    vus.append(vu)
+            if not vus:
+                raise CommandError("No virtual user could log in. Check --base-url and the manifest.")
+            login_stats = self._summarize(latencies, statuses, elapsed=None)
+            latencies.clear()
+            statuses.clear()
+
+            if admin_headers:
+                # 서버 계측값을 이번 측정 구간만 보도록 초기화 (단일 프로세스 서버 기준)
+                await client.get("/metrics/", params={"reset": 1}, headers=admin_headers)
+
+            actions, weights = list(mix), list(mix.values())
+            deadline = time.perf_counter() + float(opts["duration"])
+
+            async def worker(vu):
+                while time.perf_counter() < deadline:
+                    spec = vu.build(vu.rng.choices(actions, weights)[0]) or vu.build("list")
+                    label, method, path, kwargs = spec
+                    await call(label, method, path, headers=vu.headers, **kwargs)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(vu) for vu in vus))
+            elapsed = time.perf_counter() - started
+
+            server = None
+            if admin_headers:
+                res = await client.get("/metrics/", headers=admin_headers)
+                if res.status_code == 200:
+                    server = res.json()
+
+        endpoints = self._summarize(latencies, statuses, elapsed)
+        db_total = None
+        if server is not None:
+            # 서버 라벨(라우트 패턴) 기준으로 상태코드 구분 없이 합산
+            by_label = defaultdict(lambda: {"queries": 0, "sql_ms": 0.0, "requests": 0})
+            for row in server["endpoints"]:
+                agg = by_label[row["endpoint"]]
+                agg["queries"] += row["queries_total"]
+                agg["sql_ms"] += row["sql_ms_total"]
+                agg["requests"] += row["requests"]
+            for label, row in endpoints.items():
+                agg = by_label.get(label)
+                if agg and agg["requests"]:
+                    row["db_queries"] = agg["queries"]
+                    row["db_queries_per_request"] = round(agg["queries"] / agg["requests"], 2)
+                    row["db_sql_ms_per_request"] = round(agg["sql_ms"] / agg["requests"], 2)
+            db_total = sum(a["queries"] for label, a in by_label.items() if not label.startswith("GET /metrics"))
+
+        total = sum(r["requests"] for r in endpoints.values())
+        return {
+            "started_at": timezone.localtime().isoformat(),
+            "base_url": opts["base_url"],
+            "concurrency": len(vus),
+            "duration_s": round(elapsed, 2),
+            "total_requests": total,
+            "rps": round(total / elapsed, 2) if elapsed else None,
+            "db_queries_total": db_total,
+            "login": login_stats.get(LOGIN),
+            "endpoints": endpoints,
+        }
+
+    @staticmethod
+    def _summarize(latencies, statuses, elapsed):
+        out = {}
+        for label, values in latencies.items():
+            values = sorted(values)
+            ok = sum(n for s, n in statuses[label].items() if s.isdigit() and int(s) < 400)
+            out[label] = {
+                "requests": len(values),
+                "rps": round(len(values) / elapsed, 2) if elapsed else None,
+                "p50_ms": round(_percentile(values, 0.5) * 1000, 2),
+                "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+                "p99_ms": round(_percentile(values, 0.99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+                "error_rate": round(1 - ok / len(values), 4),
+                "statuses": dict(statuses[label]),
+            }
+        return out
+
+    def _print_report(self, result):
+        self.stdout.write(self.style.NOTICE(
+            f"{result['total_requests']} requests in {result['duration_s']}s "
+            f"({result['rps']} rps, {result['concurrency']} VUs, db queries={result['db_queries_total']})"
+        ))
+        self.stdout.write(f"  {'endpoint':<52} {'n':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'q/req':>6} {'err':>6}")
+        for label, r in sorted(result["endpoints"].items(), key=lambda kv: -kv[1]["requests"]):
+            self.stdout.write(
+                f"  {label:<52} {r['requests']:>6} {r['rps']:>7} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+                f"{r['p99_ms']:>8} {r.get('db_queries_per_request', '-'):>6} {r['error_rate']:>6.1%}"
+            )
+
+    def _print_compare(self, before, after):
+        self.stdout.write(self.style.NOTICE(
+            f"Compare: {before.get('label') or before.get('started_at')} → {after.get('label') or after.get('started_at')} "
+            f"(rps {before['rps']} → {after['rps']})"
+        ))
+
+        def delta(a, b):
+            return f"{(b - a) / a:+.1%}" if a and b is not None else "n/a"
+
+        for label, b in sorted(after["endpoints"].items()):
+            a = before["endpoints"].get(label)
+            if not a:
+                continue
+            self.stdout.write(
+                f"  {label:<52} p95 {a['p95_ms']:>8} → {b['p95_ms']:>8} ({delta(a['p95_ms'], b['p95_ms'])})"
+                f"  q/req {a.get('db_queries_per_request', '-')} → {b.get('db_queries_per_request', '-')}"
+            )
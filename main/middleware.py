@@ -0,0 +1,256 @@
+import cProfile
+import hmac
+import logging
+import pstats
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from main.utils import compression, db_router
+from main.utils.instrumentation import QueryCollector, fingerprint_id, registry
+from main.utils.profiling import StackSampler, save_profile
+
+logger = logging.getLogger(__name__)
+
+
+def endpoint_label(request):
+    # 라우트 패턴 기준 (path 파라미터별로 라벨이 폭증하지 않도록)
+    match = getattr(request, "resolver_match", None)
+    route = match.route if match is not None else "<unresolved>"
+    return f"{request.method} /{route}"
+
+
+class QueryMetricsMiddleware:
+    """
+    요청별 DB 쿼리 수 / SQL 시간 / 중복 쿼리 지문 / 응답 시간 계측
+    - 모든 DB 커넥션에 execute_wrapper 설치 → main.utils.instrumentation.registry에 기록
+    - 쿼리 수·중복·응답 시간이 임계값을 넘으면 중복 쿼리의 호출 스택과 함께 경고 로그
+    - 설정: QUERY_METRICS_ENABLED, SLOW_REQUEST_QUERY_THRESHOLD,
+            SLOW_REQUEST_DUPLICATE_THRESHOLD, SLOW_REQUEST_MS_THRESHOLD
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "QUERY_METRICS_ENABLED", True)
+        self.query_threshold = getattr(settings, "SLOW_REQUEST_QUERY_THRESHOLD", 30)
+        self.duplicate_threshold = getattr(settings, "SLOW_REQUEST_DUPLICATE_THRESHOLD", 5)
+        self.ms_threshold = getattr(settings, "SLOW_REQUEST_MS_THRESHOLD", 1000)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(collector))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        endpoint = endpoint_label(request)
+        duplicates = sum(n - 1 for _, n in collector.duplicates)
+        slow = (
+            collector.count > self.query_threshold
+            or duplicates > self.duplicate_threshold
+            or duration * 1000 > self.ms_threshold
+        )
+        registry.record(endpoint, response.status_code, duration, collector, slow=slow)
+        if slow:
+            self._log_offender(request, endpoint, response, duration, collector, duplicates)
+        return response
+
+    @staticmethod
+    def _log_offender(request, endpoint, response, duration, collector, duplicates):
+        lines = [
+            f"slow request {endpoint} path={request.path} status={response.status_code} "
+            f"{duration * 1000:.1f}ms queries={collector.count} sql={collector.sql_time * 1000:.1f}ms "
+            f"duplicates={duplicates}"
+        ]
+        for fp, n in collector.duplicates[:5]:
+            lines.append(f"  x{n} [{fingerprint_id(fp)}] {fp[:300]}")
+            for frame in collector.stacks.get(fp, []):
+                lines.append(f"      at {frame}")
+        logger.warning("\n".join(lines))
+
+
+class ProfilingMiddleware:
+    """
+    opt-in 요청 프로파일링 (운영 중 느린 엔드포인트를 그 자리에서 분석)
+    - PROFILING_SAMPLE_RATE 비율로 무작위 샘플링
+    - 또는 X-Profile 헤더 + (PROFILING_TOKEN 일치 또는 스태프 JWT) → 해당 요청 강제 프로파일,
+      응답 X-Profile-Id 헤더로 저장된 프로파일 id 반환
+    - 결과는 엔드포인트/challenge_id 태그와 함께 PROFILING_DIR에 저장 → aggregate_profiles 커맨드로 집계
+    """
+
+    header = "X-Profile"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "PROFILING_ENABLED", False)
+        self.rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+        self.mode = getattr(settings, "PROFILING_MODE", "sample")
+        self.interval = getattr(settings, "PROFILING_INTERVAL_MS", 5.0) / 1000
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        forced = self.header in request.headers and self._is_trusted(request)
+        if not forced and (self.rate <= 0 or random.random() >= self.rate):
+            return self.get_response(request)
+
+        sampler = profiler = None
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # 다른 프로파일러가 이미 켜져 있으면(디버거 등) 이번 요청은 건너뜀
+                return self.get_response(request)
+        else:
+            sampler = StackSampler(self.interval)
+            sampler.start()
+
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            else:
+                sampler.stop()
+        duration = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        kwargs = match.kwargs if match is not None else {}
+        meta = {
+            "endpoint": endpoint_label(request),
+            "path": request.path,
+            "challenge_id": kwargs.get("challenge_id"),
+            "photo_id": kwargs.get("photo_id"),
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "mode": "cprofile" if profiler is not None else "sample",
+            "forced": forced,
+            "at": time.time(),
+        }
+        try:
+            stem = save_profile(
+                meta,
+                stacks=sampler.stacks if sampler is not None else None,
+                stats=pstats.Stats(profiler) if profiler is not None else None,
+            )
+        except (OSError, TypeError):
+            # 프로파일 저장 실패가 요청 실패로 이어지지 않게 (pstats는 호출이 없으면 TypeError)
+            logger.exception("failed to save request profile for %s", meta["endpoint"])
+            return response
+        if forced:
+            response["X-Profile-Id"] = stem
+        return response
+
+    def _is_trusted(self, request):
+        token = getattr(settings, "PROFILING_TOKEN", "")
+        sent = request.headers.get(self.header, "")
+        if token and sent and hmac.compare_digest(token, sent):
+            return True
+        # 이 미들웨어는 DRF 인증 전에 실행되므로 Bearer 토큰을 직접 확인 (헤더가 있을 때만 비용 발생)
+        # DRF와 같은 인증 클래스 → 로그아웃(폐기)/무효화된 토큰은 스태프라도 거절
+        from rest_framework.exceptions import AuthenticationFailed
+
+        from accounts.authentication import CachedJWTAuthentication
+
+        try:
+            auth = CachedJWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return bool(auth and auth[0].is_staff)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    읽기 복제본 라우팅용 요청 상태 (main.utils.db_router)
+    - 요청마다 쓰기 여부를 추적 → 같은 요청의 이후 읽기는 primary
+    - 쓰기가 있었던 인증 사용자는 REPLICA_STICKY_SECONDS 동안 primary에서 읽음 (복제 지연 대비)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not db_router.replicas():
+            return self.get_response(request)
+
+        token = db_router.begin_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            state = db_router.end_request(token)
+        # DRF 인증 결과는 request.user에도 반영됨 (JWT 사용자)
+        user = getattr(request, "user", None)
+        if state.wrote and user is not None and user.is_authenticated:
+            db_router.mark_sticky(user.pk)
+        return response
+
+
+class CompressionMiddleware:
+    """
+    응답 본문 brotli/gzip 압축 (main.utils.compression)
+    - Accept-Encoding 협상 (brotli 패키지가 없으면 gzip만), 이미 압축된 미디어/작은 본문/Range 응답은 그대로
+    - 스트리밍 응답은 청크 단위로 압축해 그대로 스트리밍
+    - ETag가 있거나 CACHE_COMPRESSED_ATTR가 켜진 응답은 압축 결과를 전용 캐시(CACHES["compression"])에서 재사용
+    - 설정: COMPRESSION_ENABLED, COMPRESSION_MIN_BYTES, COMPRESSION_GZIP_LEVEL,
+            COMPRESSION_BROTLI_QUALITY, COMPRESSION_CACHE_TTL
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "COMPRESSION_ENABLED", True)
+        self.min_bytes = getattr(settings, "COMPRESSION_MIN_BYTES", 512)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.enabled or not self._should_compress(response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = compression.negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.compress_stream_async(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compression.compress_stream(response.streaming_content, encoding)
+            del response.headers["Content-Length"]
+        else:
+            body = response.content
+            if len(body) < self.min_bytes:
+                return response
+            if response.has_header("ETag") or getattr(response, compression.CACHE_COMPRESSED_ATTR, False):
+                compressed = compression.compress_cached(body, encoding)
+            else:
+                compressed = compression.compress(body, encoding)
+            if len(compressed) >= len(body):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # 본문 바이트가 달라지므로 strong ETag → weak (django GZipMiddleware와 같음)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    @staticmethod
+    def _should_compress(response):
+        if response.status_code != 200 or response.has_header("Content-Encoding"):
+            return False
+        if response.has_header("Content-Range"):
+            return False  # Range 응답은 원본 바이트 기준
+        return compression.is_compressible(response.get("Content-Type", ""))
@@ -1,3 +1,218 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import Profile
+from main.middleware import CompressionMiddleware, ReplicaRoutingMiddleware
+from main.utils import compression
+from main.utils import db_router
+from main.utils.db_router import PrimaryReplicaRouter, read_db, replica_reads
+from main.utils.parsers import ORJSONParser
+from main.utils.renderers import ORJSONRenderer
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaRouterTests(SimpleTestCase):
+    """
+    복제본 라우팅 결정만 확인 (복제본 별칭을 실제로 조회하지 않으므로 별도 DB 불필요)
+    - 실제 두 번째 DB로 확인하려면 DATABASE_REPLICA_URLS=sqlite:////tmp/replica.sqlite3 로 테스트 실행 (TEST.MIRROR)
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def _request(self, user=None):
+        request = self.factory.get("/")
+        request.user = user or AnonymousUser()
+        return request
+
+    def test_reads_stay_on_primary_outside_replica_scope(self):
+        self.assertEqual(read_db(), "default")
+        token = db_router.begin_request(self._request())
+        try:
+            self.assertEqual(read_db(), "default")
+        finally:
+            db_router.end_request(token)
+
+    def test_replica_scope_routes_reads(self):
+        with replica_reads():
+            self.assertEqual(read_db(), "replica1")
+        self.assertEqual(read_db(), "default")
+
+    @replica_reads()
+    def test_decorator_form(self):
+        self.assertEqual(read_db(), "replica1")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        with replica_reads():
+            self.assertEqual(read_db(), "default")
+
+    def test_read_after_write_in_same_request(self):
+        token = db_router.begin_request(self._request())
+        try:
+            with replica_reads():
+                self.router.db_for_write(Profile)
+                self.assertEqual(read_db(), "default")
+        finally:
+            db_router.end_request(token)
+
+    def test_sticky_user_reads_primary(self):
+        user = SimpleNamespace(pk=7, is_authenticated=True)
+        db_router.mark_sticky(user.pk)
+        token = db_router.begin_request(self._request(user))
+        try:
+            with replica_reads():
+                self.assertEqual(read_db(), "default")
+        finally:
+            db_router.end_request(token)
+
+        other = SimpleNamespace(pk=8, is_authenticated=True)
+        token = db_router.begin_request(self._request(other))
+        try:
+            with replica_reads():
+                self.assertEqual(read_db(), "replica1")
+        finally:
+            db_router.end_request(token)
+
+    def test_middleware_marks_writer_sticky(self):
+        user = SimpleNamespace(pk=11, is_authenticated=True)
+
+        def view(request):
+            self.router.db_for_write(Profile)
+            return HttpResponse("ok")
+
+        ReplicaRoutingMiddleware(view)(self._request(user))
+        self.assertTrue(cache.get(db_router.STICKY_KEY.format(user_id=11)))
+
+        ReplicaRoutingMiddleware(lambda r: HttpResponse("ok"))(self._request(SimpleNamespace(pk=12, is_authenticated=True)))
+        self.assertIsNone(cache.get(db_router.STICKY_KEY.format(user_id=12)))
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaAtomicTests(TransactionTestCase):
+    # TestCase는 테스트 전체를 atomic으로 감싸므로 TransactionTestCase에서 확인
+    def test_atomic_block_reads_primary(self):
+        with replica_reads():
+            with transaction.atomic():
+                self.assertEqual(read_db(), "default")
+            self.assertEqual(read_db(), "replica1")
+
+
+class ReplicaMigrateTests(SimpleTestCase):
+    @override_settings(DATABASE_REPLICAS=["replica1"])
+    def test_migrations_only_on_primary(self):
+        router = PrimaryReplicaRouter()
+        self.assertTrue(router.allow_migrate("default", "challenges"))
+        self.assertFalse(router.allow_migrate("replica1", "challenges"))
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    payload = {
+        "aware": datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+        "naive": datetime(2025, 1, 2, 3, 4, 5),
+        "date": date(2025, 1, 2),
+        "decimal": Decimal("12.50"),
+        "lazy": gettext_lazy("Not found."),
+        "uuid": uuid.UUID(int=1),
+        "nested": [{"name": "참가자", "sep": "a\u2028b"}, None, True, 1.5],
+        7: "int key",
+    }
+
+    def test_matches_stdlib_renderer_bytes(self):
+        self.assertEqual(ORJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_indent_request_uses_stdlib_path(self):
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            ORJSONRenderer().render(self.payload, media_type),
+            JSONRenderer().render(self.payload, media_type),
+        )
+
+    def test_non_finite_floats_render_as_null(self):
+        # JSONRenderer(STRICT_JSON)는 ValueError → 이 렌더러는 null로 출력 (의도한 동작 차이)
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({"x": float("nan")})
+        self.assertEqual(ORJSONRenderer().render({"x": float("nan"), "y": float("inf")}), b'{"x":null,"y":null}')
+
+    def test_parser_roundtrip_and_errors(self):
+        body = ORJSONRenderer().render({"amount": 5000, "name": "충전"})
+        self.assertEqual(ORJSONParser().parse(BytesIO(body)), {"amount": 5000, "name": "충전"})
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b"{not json"))
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"x": NaN}'))
+
+
+@override_settings(COMPRESSION_MIN_BYTES=100)
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = b'{"items": [' + b",".join(b'{"id": %d, "title": "challenge"}' % i for i in range(200)) + b"]}"
+
+    def setUp(self):
+        cache.clear()
+        caches[compression.COMPRESSION_CACHE_ALIAS].clear()
+        self.factory = RequestFactory()
+
+    def _get(self, response, accept="gzip, deflate"):
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda r: response)(request)
+
+    def _json(self, body=None):
+        return HttpResponse(body or self.body, content_type="application/json")
+
+    def test_negotiate(self):
+        self.assertEqual(compression.negotiate("gzip;q=0.5, identity"), "gzip")
+        self.assertIsNone(compression.negotiate("gzip;q=0, identity"))
+        self.assertIsNone(compression.negotiate(""))
+        expected = "br" if compression.brotli_module() else "gzip"
+        self.assertEqual(compression.negotiate("br, gzip"), expected)
+        self.assertEqual(compression.negotiate("*"), expected)
+
+    def test_gzip_json(self):
+        response = self._json()
+        response["ETag"] = '"abc"'
+        res = self._get(response)
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(res.content), self.body)
+        self.assertEqual(res["Content-Length"], str(len(res.content)))
+        self.assertEqual(res["ETag"], 'W/"abc"')
+        self.assertIn("Accept-Encoding", res["Vary"])
+
+    def test_skips_media_small_and_unaccepted(self):
+        image = HttpResponse(self.body, content_type="image/jpeg")
+        self.assertFalse(self._get(image).has_header("Content-Encoding"))
+        self.assertFalse(self._get(self._json(b'{"ok": true}')).has_header("Content-Encoding"))
+        self.assertFalse(self._get(self._json(), accept="identity").has_header("Content-Encoding"))
+
+    def test_streaming_response(self):
+        chunks = [self.body[i:i + 500] for i in range(0, len(self.body), 500)]
+        res = self._get(StreamingHttpResponse(iter(chunks), content_type="application/json"))
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(res.streaming_content)), self.body)
+
+    def test_cacheable_body_compressed_once(self):
+        with mock.patch.object(compression, "compress", wraps=compression.compress) as compress:
+            for _ in range(3):
+                res = self._get(compression.cache_compressed(self._json()))
+                self.assertEqual(gzip.decompress(res.content), self.body)
+        self.assertEqual(compress.call_count, 1)
+        # 압축 결과는 전용 별칭에만 (default 캐시의 JWT 사용자/초대코드 항목을 밀어내지 않음)
+        self.assertIsNone(cache.get(compression.COMPRESSED_CACHE_KEY.format(
+            encoding="gzip", digest=hashlib.blake2b(self.body, digest_size=20).hexdigest(),
+        )))
@@ -0,0 +1,8 @@
+# main/urls.py
+from django.urls import path
+from .views import MetricsView, PrometheusMetricsView
+
+urlpatterns = [
+    path("", MetricsView.as_view()),
+    path("prometheus/", PrometheusMetricsView.as_view()),
+]
@@ -0,0 +1,142 @@
+import hashlib
+import re
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+# 응답 압축 (main.middleware.CompressionMiddleware)
+# - brotli는 선택 의존성: 패키지가 없으면 gzip만 협상
+# - 이미 압축된 미디어(이미지/영상/압축 파일)는 건너뜀
+# - 캐시 대상 응답(ETag가 있거나 뷰가 CACHE_COMPRESSED_ATTR를 켠 응답)은 압축 결과를 본문 해시로 캐시
+#   → 자주 나가는 같은 본문(공개 목록, 앨범 페이지 등)은 매번 다시 압축하지 않음
+#   → 전용 캐시 별칭(CACHES["compression"])에만 저장, default 캐시의 인증/초대코드 항목과 경쟁하지 않음
+CACHE_COMPRESSED_ATTR = "cache_compressed"
+COMPRESSED_CACHE_KEY = "compress:{encoding}:{digest}"
+COMPRESSION_CACHE_ALIAS = "compression"
+
+_INCOMPRESSIBLE = re.compile(
+    r"^(image/(?!svg)|video/|audio/|font/woff2?"
+    r"|application/(zip|gzip|x-gzip|x-brotli|x-7z-compressed|x-rar-compressed|octet-stream))"
+)
+
+_brotli = None
+_brotli_checked = False
+
+
+def brotli_module():
+    """brotli 모듈 (없으면 None, import는 처음 한 번만)"""
+    global _brotli, _brotli_checked
+    if not _brotli_checked:
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        _brotli, _brotli_checked = brotli, True
+    return _brotli
+
+
+def negotiate(accept_encoding: str):
+    """Accept-Encoding(q값 포함)에서 br → gzip 순으로 선택, 둘 다 불가하면 None"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    star = weights.get("*", 0.0)
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli_module() is None:
+            continue
+        if weights.get(encoding, star) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    return not _INCOMPRESSIBLE.match((content_type or "").lower())
+
+
+def cache_compressed(response):
+    """압축 결과를 캐시에서 재사용할 응답으로 표시 (자주 반복되는 본문: 공개 목록/상세 등)"""
+    setattr(response, CACHE_COMPRESSED_ATTR, True)
+    return response
+
+
+def _gzip_level():
+    return getattr(settings, "COMPRESSION_GZIP_LEVEL", 6)
+
+
+def _brotli_quality():
+    return getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli_module().compress(body, quality=_brotli_quality())
+    encoder = zlib.compressobj(_gzip_level(), zlib.DEFLATED, 31)  # wbits 31 = gzip 헤더
+    return encoder.compress(body) + encoder.flush()
+
+
+def compress_cached(body: bytes, encoding: str) -> bytes:
+    """
+    본문 해시 기준으로 압축 결과를 캐시 (COMPRESSION_CACHE_TTL, 0이면 매번 압축)
+    - 키가 본문 내용이므로 사용자별로 다른 본문이 섞일 일이 없음
+    """
+    ttl = getattr(settings, "COMPRESSION_CACHE_TTL", 300)
+    if not ttl:
+        return compress(body, encoding)
+    key = COMPRESSED_CACHE_KEY.format(encoding=encoding, digest=hashlib.blake2b(body, digest_size=20).hexdigest())
+    cache = caches[COMPRESSION_CACHE_ALIAS]
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = compress(body, encoding)
+        cache.set(key, compressed, ttl)
+    return compressed
+
+
+class _StreamEncoder:
+    """청크 단위 압축 (청크마다 flush → 클라이언트가 바로 받아서 풀 수 있게)"""
+
+    def __init__(self, encoding):
+        if encoding == "br":
+            self._encoder = brotli_module().Compressor(quality=_brotli_quality())
+            self._feed = lambda chunk: self._encoder.process(chunk) + self._encoder.flush()
+            self._finish = self._encoder.finish
+        else:
+            self._encoder = zlib.compressobj(_gzip_level(), zlib.DEFLATED, 31)
+            self._feed = lambda chunk: self._encoder.compress(chunk) + self._encoder.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._encoder.flush
+
+    def feed(self, chunk) -> bytes:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        return self._feed(chunk) if chunk else b""
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def compress_stream(chunks, encoding):
+    encoder = _StreamEncoder(encoding)
+    for chunk in chunks:
+        data = encoder.feed(chunk)
+        if data:
+            yield data
+    yield encoder.finish()
+
+
+async def compress_stream_async(chunks, encoding):
+    encoder = _StreamEncoder(encoding)
+    async for chunk in chunks:
+        data = encoder.feed(chunk)
+        if data:
+            yield data
+    yield encoder.finish()
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# SQLite 연결 튜닝 (settings.SQLITE_TUNING)
+# - journal_mode=WAL: 읽기가 쓰기를 막지 않음 (파일에 영구 기록, 이후 연결은 확인만)
+# - synchronous=NORMAL: WAL에서는 커밋마다 fsync하지 않아도 DB 손상 없음 (전원 장애 시 마지막 커밋만 유실 가능)
+# - busy_timeout: 잠금 충돌 시 즉시 실패하지 않고 대기
+# - mmap_size: 읽기를 read() 대신 메모리 매핑으로
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout={busy_timeout}",
+    "PRAGMA mmap_size={mmap_size}",
+)
+
+
+@receiver(connection_created)
+def _tune_sqlite(sender, connection, **kwargs):
+    if connection.vendor != "sqlite" or not getattr(settings, "SQLITE_TUNING", False):
+        return
+    params = {
+        "busy_timeout": int(getattr(settings, "SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "mmap_size": int(getattr(settings, "SQLITE_MMAP_SIZE", 0)),
+    }
+    # 드라이버 연결에 직접 실행 → 요청별 쿼리 계측/쿼리 예산에 잡히지 않음
+    for pragma in PRAGMAS:
+        connection.connection.execute(pragma.format(**params))
@@ -0,0 +1,117 @@
+import random
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# 읽기 전용 복제본 라우팅 (settings.DATABASE_REPLICAS, DATABASE_ROUTERS)
+# - 복제본 읽기는 opt-in: replica_reads() 범위 안의 읽기만 복제본으로 (목록/앨범/지갑/보상 조회 등)
+# - 다음 경우는 항상 primary
+#   · 쓰기 전부 + transaction.atomic 안의 읽기
+#   · 같은 요청에서 이미 쓰기가 일어난 뒤의 읽기
+#   · 쓰기 요청을 보낸 사용자의 REPLICA_STICKY_SECONDS 이내 읽기 (복제 지연 동안 read-your-writes)
+STICKY_KEY = "db:sticky:{user_id}"
+
+_state = ContextVar("db_routing_state", default=None)
+
+
+class _RoutingState:
+    __slots__ = ("request", "wrote", "sticky", "replica_depth")
+
+    def __init__(self, request=None):
+        self.request = request
+        self.wrote = False
+        self.sticky = None  # 요청당 캐시 조회 1번 (None = 아직 확인 안 함)
+        self.replica_depth = 0
+
+
+def replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def begin_request(request):
+    """요청 단위 상태 시작 (ReplicaRoutingMiddleware), 반환 토큰은 end_request에 전달"""
+    return _state.set(_RoutingState(request))
+
+
+def end_request(token):
+    state = _state.get()
+    _state.reset(token)
+    return state
+
+
+def mark_sticky(user_id):
+    cache.set(STICKY_KEY.format(user_id=user_id), 1, getattr(settings, "REPLICA_STICKY_SECONDS", 5))
+
+
+def _is_sticky(state):
+    if state.sticky is None:
+        user = getattr(state.request, "user", None) if state.request is not None else None
+        state.sticky = bool(
+            user is not None and user.is_authenticated
+            and cache.get(STICKY_KEY.format(user_id=user.pk))
+        )
+    return state.sticky
+
+
+class replica_reads(ContextDecorator):
+    """
+    이 범위의 읽기를 복제본으로 보냄 (뷰 메서드/셀렉터 데코레이터 또는 with 문)
+    - 지연 평가 QuerySet은 실제 평가 시점에 라우팅되므로 평가까지 범위 안에 있어야 함 (뷰 단위로 감싸는 이유)
+    """
+
+    def _recreate_cm(self):
+        # 데코레이터로 쓸 때 호출마다 새 인스턴스 (동시 요청 간 _token/_state 공유 방지)
+        return type(self)()
+
+    def __enter__(self):
+        state = _state.get()
+        self._token = None
+        if state is None:
+            # 요청 밖(관리 커맨드 등)에서도 쓸 수 있게 임시 상태 생성
+            state = _RoutingState()
+            self._token = _state.set(state)
+        state.replica_depth += 1
+        self._state = state
+        return self
+
+    def __exit__(self, *exc):
+        self._state.replica_depth -= 1
+        if self._token is not None:
+            _state.reset(self._token)
+        return False
+
+
+def read_db():
+    """지금 실행할 읽기의 DB 별칭"""
+    aliases = replicas()
+    state = _state.get()
+    if not aliases or state is None or state.replica_depth <= 0:
+        return DEFAULT_DB_ALIAS
+    if state.wrote or connections[DEFAULT_DB_ALIAS].in_atomic_block or _is_sticky(state):
+        return DEFAULT_DB_ALIAS
+    return random.choice(aliases)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return read_db()
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # primary/복제본은 같은 데이터 → 어느 쪽에서 읽은 객체끼리도 관계 허용
+        pool = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # 복제본 스키마는 primary에서 복제됨
+        return db not in replicas()
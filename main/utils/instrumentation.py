@@ -0,0 +1,243 @@
+import bisect
+import hashlib
+import os
+import re
+import threading
+import time
+import traceback
+from collections import Counter, defaultdict, deque
+
+from django.conf import settings
+
+# 요청 단위 DB 쿼리/지연 계측 (main.middleware.QueryMetricsMiddleware가 기록)
+# - 프로세스 내 메모리에만 보관 (워커별로 따로 집계됨)
+# - 누적 카운터/히스토그램: Prometheus 텍스트 export용 (단조 증가)
+# - 최근 N개 샘플: 스태프용 JSON에서 p50/p95/p99 계산용 (롤링 윈도우)
+WINDOW_SIZE = getattr(settings, "QUERY_METRICS_WINDOW_SIZE", 500)          # 엔드포인트별 최근 샘플 수
+WINDOW_SECONDS = getattr(settings, "QUERY_METRICS_WINDOW_SECONDS", 60 * 10)
+TOP_FINGERPRINTS = 10
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # 초
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)                               # 요청당 쿼리 수
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_WS = re.compile(r"\s+")
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def fingerprint(sql: str) -> str:
+    """
+    쿼리 지문: Django가 넘기는 SQL은 이미 %s 파라미터화돼 있으므로
+    IN (...) 길이와 공백만 정규화하면 같은 코드 위치의 쿼리가 같은 지문이 됨
+    """
+    return _WS.sub(" ", _IN_LIST.sub("IN (...)", sql)).strip()
+
+
+def fingerprint_id(fp: str) -> str:
+    return hashlib.sha1(fp.encode()).hexdigest()[:12]
+
+
+def app_stack(limit: int = 6):
+    """프로젝트 코드 프레임만 (site-packages/계측 모듈 제외) 최근 limit개"""
+    base = str(settings.BASE_DIR)
+    frames = [
+        f"{os.path.relpath(fr.filename, base)}:{fr.lineno} in {fr.name}"
+        for fr in traceback.extract_stack()
+        if fr.filename.startswith(base)
+        and "site-packages" not in fr.filename
+        and os.path.abspath(fr.filename) != _THIS_FILE
+    ]
+    return frames[-limit:]
+
+
+class QueryCollector:
+    """
+    connection.execute_wrapper로 설치되는 요청 단위 수집기
+    - 쿼리 수, SQL 시간 합계, 지문별 횟수
+    - 같은 지문이 두 번째로 나올 때만 스택 캡처 (N+1 위치 추적, 평소 비용 최소화)
+    """
+
+    def __init__(self, capture_stacks: bool = True):
+        self.count = 0
+        self.sql_time = 0.0
+        self.fingerprints = Counter()
+        self.stacks = {}
+        self.capture_stacks = capture_stacks
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.count += 1
+            fp = fingerprint(sql)
+            self.fingerprints[fp] += 1
+            if self.capture_stacks and self.fingerprints[fp] == 2:
+                self.stacks[fp] = app_stack()
+
+    @property
+    def duplicates(self):
+        """(지문, 횟수) 중 2회 이상 실행된 것, 많은 순"""
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n > 1]
+
+
+def _observe(buckets, value, counts):
+    # 값이 들어가는 버킷(le 기준 첫 경계, 마지막은 +Inf) 카운트 증가
+    counts[bisect.bisect_left(buckets, value)] += 1
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.duration_sum = 0.0
+        self.queries_sum = 0
+        self.sql_time_sum = 0.0
+        self.duplicate_sum = 0
+        self.slow = 0
+        self.duration_counts = [0] * (len(DURATION_BUCKETS) + 1)
+        self.query_counts = [0] * (len(QUERY_BUCKETS) + 1)
+        self.samples = deque(maxlen=WINDOW_SIZE)  # (ts, duration, queries, sql_time, duplicates)
+        self.dup_fingerprints = Counter()
+
+
+class MetricsRegistry:
+    """엔드포인트별 누적 + 롤링 통계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(_EndpointStats)
+        self._sql = {}  # 지문 id → 지문 SQL (JSON/로그 표시용)
+
+    def record(self, endpoint, status, duration, collector, slow=False):
+        dup_total = sum(n - 1 for _, n in collector.duplicates)
+        with self._lock:
+            st = self._stats[(endpoint, status // 100)]
+            st.requests += 1
+            st.duration_sum += duration
+            st.queries_sum += collector.count
+            st.sql_time_sum += collector.sql_time
+            st.duplicate_sum += dup_total
+            st.slow += int(slow)
+            _observe(DURATION_BUCKETS, duration, st.duration_counts)
+            _observe(QUERY_BUCKETS, collector.count, st.query_counts)
+            st.samples.append((time.time(), duration, collector.count, collector.sql_time, dup_total))
+            for fp, n in collector.duplicates:
+                fid = fingerprint_id(fp)
+                st.dup_fingerprints[fid] += n - 1
+                self._sql.setdefault(fid, fp)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._sql.clear()
+
+    def snapshot(self):
+        """스태프 JSON용: 롤링 윈도우 분위수 + 누적값 + 상위 중복 지문"""
+        cutoff = time.time() - WINDOW_SECONDS
+        out = []
+        with self._lock:
+            for (endpoint, status_class), st in self._stats.items():
+                window = [s for s in st.samples if s[0] >= cutoff]
+                durations = sorted(s[1] for s in window)
+                queries = sorted(s[2] for s in window)
+                out.append({
+                    "endpoint": endpoint,
+                    "status": f"{status_class}xx",
+                    "requests": st.requests,
+                    "slow_requests": st.slow,
+                    "avg_ms": round(st.duration_sum / st.requests * 1000, 2),
+                    "avg_queries": round(st.queries_sum / st.requests, 2),
+                    "avg_sql_ms": round(st.sql_time_sum / st.requests * 1000, 2),
+                    "queries_total": st.queries_sum,
+                    "sql_ms_total": round(st.sql_time_sum * 1000, 2),
+                    "window": {
+                        "samples": len(window),
+                        "p50_ms": _ms(_percentile(durations, 0.5)),
+                        "p95_ms": _ms(_percentile(durations, 0.95)),
+                        "p99_ms": _ms(_percentile(durations, 0.99)),
+                        "p50_queries": _percentile(queries, 0.5),
+                        "p95_queries": _percentile(queries, 0.95),
+                        "max_queries": queries[-1] if queries else None,
+                        "avg_sql_ms": _ms(sum(s[3] for s in window) / len(window)) if window else None,
+                        "duplicates": sum(s[4] for s in window),
+                    },
+                    "top_duplicates": [
+                        {"id": fid, "extra_executions": n, "sql": self._sql.get(fid, "")[:500]}
+                        for fid, n in st.dup_fingerprints.most_common(TOP_FINGERPRINTS)
+                    ],
+                })
+        out.sort(key=lambda r: r["avg_queries"], reverse=True)
+        return {"window_seconds": WINDOW_SECONDS, "pid": os.getpid(), "endpoints": out}
+
+    def prometheus(self):
+        """Prometheus text exposition (0.0.4) — 누적 카운터/히스토그램만"""
+        lines = [
+            "# HELP challink_http_requests_total Requests handled.",
+            "# TYPE challink_http_requests_total counter",
+        ]
+        hist_dur = [
+            "# HELP challink_http_request_duration_seconds Request latency.",
+            "# TYPE challink_http_request_duration_seconds histogram",
+        ]
+        hist_q = [
+            "# HELP challink_db_queries_per_request DB queries executed per request.",
+            "# TYPE challink_db_queries_per_request histogram",
+        ]
+        sql_time = [
+            "# HELP challink_db_query_seconds_total Time spent executing SQL.",
+            "# TYPE challink_db_query_seconds_total counter",
+        ]
+        dups = [
+            "# HELP challink_db_duplicate_queries_total Repeated executions of an identical query fingerprint.",
+            "# TYPE challink_db_duplicate_queries_total counter",
+        ]
+        slow = [
+            "# HELP challink_http_slow_requests_total Requests over the configured query/latency threshold.",
+            "# TYPE challink_http_slow_requests_total counter",
+        ]
+        with self._lock:
+            for (endpoint, status_class), st in sorted(self._stats.items()):
+                labels = f'endpoint="{_escape(endpoint)}",status="{status_class}xx"'
+                lines.append(f"challink_http_requests_total{{{labels}}} {st.requests}")
+                hist_dur += _histogram_lines(
+                    "challink_http_request_duration_seconds", labels, DURATION_BUCKETS,
+                    st.duration_counts, st.duration_sum, st.requests,
+                )
+                hist_q += _histogram_lines(
+                    "challink_db_queries_per_request", labels, QUERY_BUCKETS,
+                    st.query_counts, st.queries_sum, st.requests,
+                )
+                sql_time.append(f"challink_db_query_seconds_total{{{labels}}} {st.sql_time_sum:.6f}")
+                dups.append(f"challink_db_duplicate_queries_total{{{labels}}} {st.duplicate_sum}")
+                slow.append(f"challink_http_slow_requests_total{{{labels}}} {st.slow}")
+        return "\n".join(lines + hist_dur + hist_q + sql_time + dups + slow) + "\n"
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name, labels, buckets, counts, total, n):
+    out, acc = [], 0
+    for bound, c in zip(buckets, counts):
+        acc += c
+        out.append(f'{name}_bucket{{{labels},le="{bound}"}} {acc}')
+    out.append(f'{name}_bucket{{{labels},le="+Inf"}} {n}')
+    out.append(f"{name}_sum{{{labels}}} {total:.6f}" if isinstance(total, float) else f"{name}_sum{{{labels}}} {total}")
+    out.append(f"{name}_count{{{labels}}} {n}")
+    return out
+
+
+registry = MetricsRegistry()
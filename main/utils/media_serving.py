@@ -0,0 +1,144 @@
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+# 미디어 파일 응답 (권한 확인은 호출하는 뷰에서)
+# - MEDIA_ACCEL_MODE="nginx"    → X-Accel-Redirect: MEDIA_ACCEL_PREFIX + 이름 (internal location이 MEDIA_ROOT를 alias)
+#   MEDIA_ACCEL_MODE="sendfile" → X-Sendfile: 절대 경로 (Apache mod_xsendfile / lighttpd)
+#   그 외("")                   → 워커가 직접 전송 (단일 bytes Range 지원)
+# - 로컬 경로가 없는 스토리지(S3ContentAddressedStorage)는 서명 GET URL로 302
+# - 조건부 요청(If-None-Match/If-Modified-Since)은 핸드오프 전에 여기서 304 처리
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_SHA1_STEM = re.compile(r"^[0-9a-f]{40}$")
+CHUNK_SIZE = 64 * 1024
+
+
+def clean_media_name(name):
+    """
+    URL에서 받은 미디어 이름 검증 → 정규화된 그대로의 이름만 허용, 아니면 404
+    - "..", ".", 빈 세그먼트, 선행 "/" 거절 (권한 판단용 접두사 검사를 우회하지 못하도록)
+    - 두 스토리지가 같은 MEDIA_ROOT를 쓰므로 "challenge_covers/../complete_images/..." 같은 경로가
+      공개 분기로 보호 파일에 닿는 것을 막음
+    """
+    if not name or "\\" in name or "\0" in name:
+        raise Http404("File not found.")
+    segments = name.split("/")
+    if name.startswith("/") or any(seg in ("", ".", "..") for seg in segments):
+        raise Http404("File not found.")
+    if posixpath.normpath(name) != name:
+        raise Http404("File not found.")
+    return name
+
+
+def content_etag(name, stat):
+    """
+    strong ETag
+    - 내용 주소 기반 이름(<sha1>.<ext>)이면 SHA-1 그대로 (원본은 CompleteImage.file_sha1과 같은 값)
+    - 그 외는 mtime/size (nginx 정적 파일 ETag와 같은 방식)
+    """
+    stem = os.path.splitext(os.path.basename(name))[0]
+    if _SHA1_STEM.match(stem):
+        return f'"{stem}"'
+    return f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+
+
+def _parse_range(header, size):
+    """단일 bytes 범위만 (start, end) 반환, 형식이 다르거나 다중 범위면 None(전체 응답), 만족 불가면 False"""
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # 뒤에서 N바이트
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read_range(path, start, end):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = fh.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_media(request, storage, name, *, cache_control):
+    name = clean_media_name(name)
+    try:
+        path = storage.path(name)  # safe_join: MEDIA 밖 경로는 SuspiciousFileOperation
+    except NotImplementedError:
+        # 원격 스토리지(S3 등): 권한 확인은 호출한 뷰에서 끝났으므로 짧게 서명된 스토리지 URL로 넘김
+        response = HttpResponseRedirect(storage.url(name))
+        response.headers["Cache-Control"] = "private, no-store"
+        return response
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("File not found.")
+    if not os.path.isfile(path):
+        raise Http404("File not found.")
+
+    etag = content_etag(name, stat)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        not_modified.headers["Cache-Control"] = cache_control
+        return not_modified
+
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    mode = getattr(settings, "MEDIA_ACCEL_MODE", "")
+    if mode == "nginx":
+        response = HttpResponse(content_type=content_type)
+        response.headers["X-Accel-Redirect"] = getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/") + quote(name)
+    elif mode == "sendfile":
+        response = HttpResponse(content_type=content_type)
+        response.headers["X-Sendfile"] = path
+    else:
+        response = _local_response(request, path, stat.st_size, etag, content_type)
+
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(stat.st_mtime)
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def _local_response(request, path, size, etag, content_type):
+    byte_range = None
+    header = request.META.get("HTTP_RANGE")
+    if header and size:
+        if_range = request.META.get("HTTP_IF_RANGE")
+        # If-Range가 현재 ETag와 다르면(파일이 바뀜) 범위 무시하고 전체 전송
+        if not if_range or if_range.strip() == etag:
+            byte_range = _parse_range(header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response.headers["Content-Range"] = f"bytes */{size}"
+        return response
+
+    start, end = byte_range or (0, size - 1)
+    response = StreamingHttpResponse(_read_range(path, start, end), content_type=content_type)
+    if byte_range:
+        response.status_code = 206
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response.headers["Content-Length"] = str(end - start + 1 if size else 0)
+    response.headers["Accept-Ranges"] = "bytes"
+    return response
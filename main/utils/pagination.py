@@ -1,5 +1,8 @@
+import base64
+
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 
 class StandardPagePagination(PageNumberPagination):
     page_size = 20
@@ -14,3 +17,25 @@ class StandardPagePagination(PageNumberPagination):
             "total": self.page.paginator.count,
             "items": data,
         })
+
+
+# 키셋(커서) 페이지네이션용 불투명 커서 인코딩/디코딩
+# - 정렬 키 값들을 "|"로 이어 urlsafe base64로 감싼다 (예: created_at, id)
+def encode_cursor(*values) -> str:
+    raw = "|".join(v.isoformat() if hasattr(v, "isoformat") else str(v) for v in values)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, size: int = 2) -> list:
+    """
+    커서 문자열 → 정렬 키 문자열 리스트
+    - 형식이 잘못되면 400 (ValidationError)
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        parts = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|")
+    except (ValueError, UnicodeError):
+        raise ValidationError({"cursor": "유효하지 않은 커서입니다."})
+    if len(parts) != size:
+        raise ValidationError({"cursor": "유효하지 않은 커서입니다."})
+    return parts
@@ -0,0 +1,27 @@
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from main.utils.renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    orjson 기반 JSON 파서 (REST_FRAMEWORK.DEFAULT_PARSER_CLASSES)
+    - orjson은 UTF-8만 받으므로 다른 charset 요청은 기존 JSONParser 경로로
+    - NaN/Infinity는 orjson이 거부 → STRICT_JSON과 같은 동작
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,122 @@
+import json
+import os
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.utils import timezone
+
+# 요청 프로파일 저장/로드 (main.middleware.ProfilingMiddleware, aggregate_profiles 커맨드)
+# - sample 모드: <stem>.collapsed  ("frame;frame;frame count" 줄 → flamegraph.pl / speedscope 입력)
+# - cprofile 모드: <stem>.prof     (pstats.Stats로 합치기)
+# - 공통: <stem>.json 메타데이터 (엔드포인트, challenge_id, 상태코드, 소요 시간 등)
+COLLAPSED_EXT = ".collapsed"
+PSTATS_EXT = ".prof"
+META_EXT = ".json"
+
+_SLUG = re.compile(r"[^A-Za-z0-9]+")
+
+
+def profile_dir() -> str:
+    return str(getattr(settings, "PROFILING_DIR", os.path.join(settings.BASE_DIR, "profiles")))
+
+
+def _frame_label(code, base):
+    filename = code.co_filename
+    if filename.startswith(base):
+        filename = os.path.relpath(filename, base)
+    elif "site-packages" in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    return f"{code.co_name} ({filename})"
+
+
+class StackSampler:
+    """
+    저부하 샘플링 프로파일러: 별도 스레드가 interval마다 대상 스레드의 스택을 읽어 집계
+    - 대상 코드에 훅을 걸지 않으므로 cProfile보다 오버헤드가 훨씬 작음
+    - 결과는 collapsed stacks (루트→리프, 줄번호 없이 함수+파일 기준으로 합침)
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+        self._skip = 0
+        self._base = str(settings.BASE_DIR) + os.sep
+
+    def start(self):
+        self._target = threading.get_ident()
+        # 호출자(미들웨어) 바깥 프레임(서버 루프 등)은 요청마다 같으므로 스택에서 제외
+        self._skip, frame = -1, sys._getframe(1)
+        while frame is not None:
+            self._skip += 1
+            frame = frame.f_back
+        self._thread = threading.Thread(target=self._run, name="profiling-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code, self._base))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels[: len(labels) - self._skip]))] += 1
+
+
+def save_profile(meta: dict, *, stacks: Counter = None, stats=None) -> str:
+    """프로파일 + 메타데이터 저장 후 stem(파일 이름 공통부) 반환"""
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    slug = _SLUG.sub("-", meta.get("endpoint", "")).strip("-").lower()[:60] or "unresolved"
+    tag = f"-c{meta['challenge_id']}" if meta.get("challenge_id") else ""
+    stem = f"{timezone.now():%Y%m%d-%H%M%S}-{slug}{tag}-{uuid.uuid4().hex[:8]}"
+    base = os.path.join(directory, stem)
+
+    if stacks is not None:
+        with open(base + COLLAPSED_EXT, "w", encoding="utf-8") as f:
+            for stack, n in stacks.most_common():
+                f.write(f"{stack} {n}\n")
+    if stats is not None:
+        stats.dump_stats(base + PSTATS_EXT)
+    with open(base + META_EXT, "w", encoding="utf-8") as f:
+        json.dump(dict(meta, id=stem), f, ensure_ascii=False)
+    return stem
+
+
+def iter_profiles(directory: str = None):
+    """(메타데이터, 프로파일 파일 경로) — 메타만 있고 프로파일이 없는 항목은 건너뜀"""
+    directory = directory or profile_dir()
+    if not os.path.isdir(directory):
+        return
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(META_EXT):
+            continue
+        base = os.path.join(directory, name[: -len(META_EXT)])
+        with open(base + META_EXT, encoding="utf-8") as f:
+            meta = json.load(f)
+        for ext in (COLLAPSED_EXT, PSTATS_EXT):
+            if os.path.exists(base + ext):
+                yield meta, base + ext
+
+
+def read_collapsed(path: str) -> Counter:
+    stacks = Counter()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, n = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(n)
+    return stacks
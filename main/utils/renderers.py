@@ -0,0 +1,40 @@
+import decimal
+
+import orjson
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# orjson 기반 JSON 렌더러 (REST_FRAMEWORK.DEFAULT_RENDERER_CLASSES)
+# - 출력은 DRF JSONRenderer(compact)와 같은 바이트: datetime ISO8601 + UTC는 "Z", Decimal은 float,
+#   지연 번역 문자열/QuerySet 등 나머지 타입은 DRF JSONEncoder.default에 위임
+# - 들여쓰기 요청(Accept: application/json; indent=4, Browsable API)과 orjson이 못 다루는 값
+#   (64비트 초과 정수 등)은 기존 JSONRenderer 경로로
+# - 동작 차이: NaN/Infinity는 orjson이 null로 출력 (JSONRenderer는 STRICT_JSON에서 ValueError → 500)
+#   렌더링 전에 float를 전부 훑으면 orjson 이득이 사라지므로 검사하지 않음
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+_fallback_encoder = JSONEncoder()
+
+
+def _default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    return _fallback_encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer와 같이 U+2028/2029는 이스케이프 (JS 문자열 안전)
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -1,3 +1,43 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.permissions import BasePermission, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from main.utils.instrumentation import registry
+
+
+class IsStaffOrMetricsToken(BasePermission):
+    """스태프 계정 또는 X-Metrics-Token 헤더(settings.METRICS_TOKEN) — Prometheus 스크레이퍼용"""
+
+    def has_permission(self, request, view):
+        token = getattr(settings, "METRICS_TOKEN", "")
+        sent = request.headers.get("X-Metrics-Token", "")
+        if token and sent and hmac.compare_digest(token, sent):
+            return True
+        return bool(request.user and request.user.is_staff)
+
+
+class MetricsView(APIView):
+    """
+    GET /metrics/
+    - 엔드포인트별 쿼리 수/SQL 시간/응답 시간(롤링 분위수)과 상위 중복 쿼리 지문 (스태프 전용)
+    - ?reset=1 이면 조회 후 현재 워커의 통계 초기화
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        data = registry.snapshot()
+        if request.query_params.get("reset") == "1":
+            registry.reset()
+        return Response(data, status=200)
+
+
+class PrometheusMetricsView(APIView):
+    """GET /metrics/prometheus/ — Prometheus text exposition (워커 프로세스별 값)"""
+    permission_classes = [IsStaffOrMetricsToken]
+
+    def get(self, request):
+        return HttpResponse(registry.prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
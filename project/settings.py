@@ -59,6 +59,14 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = "accounts.Profile"  # 커스텀 유저
 
 MIDDLEWARE = [
+    # 요청별 쿼리 수/SQL 시간/응답 시간 계측 (가장 바깥에서 전체 구간 측정)
+    "main.middleware.QueryMetricsMiddleware",
+    # opt-in 프로파일링 (PROFILING_ENABLED일 때만 동작)
+    "main.middleware.ProfilingMiddleware",
+    # 읽기 복제본 라우팅 상태 (쓰기 추적/쓰기 후 primary 고정, 복제본 없으면 통과)
+    "main.middleware.ReplicaRoutingMiddleware",
+    # 응답 brotli/gzip 압축 (본문을 읽고 쓰는 다른 미들웨어보다 바깥)
+    "main.middleware.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -92,11 +100,59 @@ WSGI_APPLICATION = "project.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# 환경변수로 DB 프로파일 선택
+# - DATABASE_URL 미설정: 로컬 SQLite (SQLITE_TUNING이면 WAL 등 PRAGMA를 연결마다 적용, main.utils.db_profile)
+# - DATABASE_URL=postgres://...: 영구 연결(CONN_MAX_AGE + health check) 또는 psycopg pool(DB_POOL)
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": env.db("DATABASE_URL", default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+}
+
+# 읽기 전용 복제본 (main.utils.db_router.PrimaryReplicaRouter)
+# - DATABASE_REPLICA_URLS=postgres://...,postgres://... (콤마 구분) → replica1, replica2, ...
+# - 로컬에서는 두 번째 SQLite 파일/Postgres 인스턴스를 복제본 자리에 둘 수 있음
+#   (테스트 시에는 TEST.MIRROR로 primary 테스트 DB를 그대로 공유)
+DATABASE_REPLICAS = []
+for _i, _url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), start=1):
+    DATABASES[f"replica{_i}"] = dict(environ.Env.db_url_config(_url), TEST={"MIRROR": "default"})
+    DATABASE_REPLICAS.append(f"replica{_i}")
+DATABASE_ROUTERS = ["main.utils.db_router.PrimaryReplicaRouter"]
+REPLICA_STICKY_SECONDS = env.int("REPLICA_STICKY_SECONDS", default=5)  # 쓰기 후 primary 고정 시간
+
+SQLITE_TUNING = env.bool("SQLITE_TUNING", default=True)
+SQLITE_BUSY_TIMEOUT_MS = env.int("SQLITE_BUSY_TIMEOUT_MS", default=5000)
+SQLITE_MMAP_SIZE = env.int("SQLITE_MMAP_SIZE", default=256 * 1024 * 1024)
+
+for _db in DATABASES.values():
+    _db.setdefault("OPTIONS", {})
+    if _db["ENGINE"] == "django.db.backends.sqlite3" and SQLITE_TUNING:
+        # 쓰기 트랜잭션을 BEGIN IMMEDIATE로 시작: 읽기 → 쓰기 승격 시점의 즉시 "database is locked" 대신
+        # busy_timeout 동안 대기 후 순서대로 처리 (join_challenge처럼 조회 후 갱신하는 atomic 블록)
+        _db["OPTIONS"].setdefault("transaction_mode", "IMMEDIATE")
+    elif _db["ENGINE"] == "django.db.backends.postgresql":
+        _db["CONN_HEALTH_CHECKS"] = True
+        if env.bool("DB_POOL", default=False):
+            # psycopg[binary,pool] (requirements.txt 고정), 풀은 Django 영구 연결과 함께 쓸 수 없음 (CONN_MAX_AGE=0)
+            _db["CONN_MAX_AGE"] = 0
+            _db["OPTIONS"]["pool"] = {
+                "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+                "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+                "timeout": env.int("DB_POOL_TIMEOUT", default=10),
+            }
+        else:
+            _db["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
+
+
+# Cache
+# 운영에서는 CACHE_URL=redis://... 로 워커 간 공유 캐시 사용 (초대코드 해석/실패 횟수 등)
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+    # 응답 압축 결과 전용 (main.utils.compression)
+    # - 큰 압축 본문이 default의 JWT 사용자/초대코드/복제본 sticky 항목을 밀어내지 않도록 분리
+    "compression": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "compression",
+        "OPTIONS": {"MAX_ENTRIES": env.int("COMPRESSION_CACHE_MAX_ENTRIES", default=1000)},
+    },
 }
 
 
@@ -139,6 +195,25 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# 미디어 전송 (challenges.views.MediaView): ""=워커 직접 전송(Range 지원) / "nginx"=X-Accel-Redirect / "sendfile"=X-Sendfile
+MEDIA_ACCEL_MODE = env("MEDIA_ACCEL_MODE", default="")
+MEDIA_ACCEL_PREFIX = env("MEDIA_ACCEL_PREFIX", default="/protected-media/")  # nginx internal location (MEDIA_ROOT alias)
+MEDIA_IMMUTABLE_MAX_AGE = env.int("MEDIA_IMMUTABLE_MAX_AGE", default=31536000)  # 내용 주소 기반 인증 이미지
+MEDIA_PUBLIC_MAX_AGE = env.int("MEDIA_PUBLIC_MAX_AGE", default=86400)          # 커버 등 공개 파일
+MEDIA_SIGNED_URL_TTL = env.int("MEDIA_SIGNED_URL_TTL", default=3600)           # 인증 이미지 서명 URL 윈도우(초)
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    # 인증 이미지: 내용(SHA-1) 주소 기반 + 중복 제거 (challenges.utils.content_storage)
+    "complete_images": {"BACKEND": "challenges.utils.content_storage.ContentAddressedStorage"},
+}
+
+# 업로드 수신 중 SHA-1 동시 계산 (기본 메모리/임시파일 핸들러 + 해시)
+FILE_UPLOAD_HANDLERS = [
+    "aiauthentications.utils.upload_handlers.HashingMemoryFileUploadHandler",
+    "aiauthentications.utils.upload_handlers.HashingTemporaryFileUploadHandler",
+]
 
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOW_CREDENTIALS = True
@@ -162,17 +237,93 @@ CSRF_TRUSTED_ORIGINS = [
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# AI 판정 stub (부하 테스트/로컬 개발용, Gemini 호출 없이 승인)
+AI_JUDGE_STUB = env.bool("AI_JUDGE_STUB", default=False)
+AI_JUDGE_STUB_LATENCY_MS = env.int("AI_JUDGE_STUB_LATENCY_MS", default=0)
+
+# 인증 사진 직접 업로드 (aiauthentications.utils.presigned, 검증은 process_proof_uploads 워커)
+AIAUTH_UPLOAD_BACKEND = env("AIAUTH_UPLOAD_BACKEND", default="local")  # "s3"(운영) / "local"(테스트/로컬 개발)
+AIAUTH_UPLOAD_URL_TTL = env.int("AIAUTH_UPLOAD_URL_TTL", default=300)    # 업로드 URL 유효 시간(초)
+AIAUTH_UPLOAD_STAGING_DIR = env("AIAUTH_UPLOAD_STAGING_DIR", default=str(BASE_DIR / "upload_staging"))
+AIAUTH_S3_BUCKET = env("AIAUTH_S3_BUCKET", default="")
+AIAUTH_S3_ENDPOINT_URL = env("AIAUTH_S3_ENDPOINT_URL", default="")      # S3 호환 스토리지(MinIO/R2 등)면 지정
+AIAUTH_S3_REGION = env("AIAUTH_S3_REGION", default="")
+AIAUTH_S3_MEDIA_PREFIX = env("AIAUTH_S3_MEDIA_PREFIX", default="media")  # 버킷 안 complete_images 위치
+if AIAUTH_UPLOAD_BACKEND == "s3":
+    # 직접 업로드를 서버 측 복사로 확정하도록 인증 이미지도 같은 버킷에 (자격 증명은 boto3 기본 체인: AWS_* 환경변수/IAM 역할)
+    STORAGES["complete_images"] = {
+        "BACKEND": "challenges.utils.s3_storage.S3ContentAddressedStorage",
+        "OPTIONS": {
+            "bucket_name": AIAUTH_S3_BUCKET,
+            "endpoint_url": AIAUTH_S3_ENDPOINT_URL or None,
+            "region_name": AIAUTH_S3_REGION or None,
+            "location": AIAUTH_S3_MEDIA_PREFIX,
+            "default_acl": None,          # 비공개 객체 (열람은 MediaView 권한 확인 후 서명 URL)
+            "querystring_expire": 300,    # 서명 GET URL 유효 시간(초)
+        },
+    }
+# 이어받기 업로드 (조각은 AIAUTH_UPLOAD_STAGING_DIR/resumable/, 만료분은 purge_resumable_uploads로 정리)
+AIAUTH_RESUMABLE_TTL = env.int("AIAUTH_RESUMABLE_TTL", default=86400)                   # 마지막 조각 이후 유지 시간(초)
+AIAUTH_RESUMABLE_MAX_CHUNK = env.int("AIAUTH_RESUMABLE_MAX_CHUNK", default=4 * 1024 * 1024)  # PATCH 1회 최대 바이트
+
+# 앱 앞단 리버스 프록시 수 (X-Forwarded-For를 오른쪽에서 이만큼만 신뢰, 0이면 REMOTE_ADDR)
+# - 초대코드 조회 실패 횟수를 클라이언트 IP별로 집계할 때 사용 (challenges.utils.invite_cache.client_ip)
+TRUSTED_PROXY_COUNT = env.int("TRUSTED_PROXY_COUNT", default=0)
+
+# 요청 계측 (main.middleware.QueryMetricsMiddleware, /metrics/)
+QUERY_METRICS_ENABLED = env.bool("QUERY_METRICS_ENABLED", default=True)
+SLOW_REQUEST_QUERY_THRESHOLD = env.int("SLOW_REQUEST_QUERY_THRESHOLD", default=30)
+SLOW_REQUEST_DUPLICATE_THRESHOLD = env.int("SLOW_REQUEST_DUPLICATE_THRESHOLD", default=5)
+SLOW_REQUEST_MS_THRESHOLD = env.int("SLOW_REQUEST_MS_THRESHOLD", default=1000)
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
+# 요청 프로파일링 (main.middleware.ProfilingMiddleware, 기본 꺼짐)
+# - PROFILING_SAMPLE_RATE 비율로 무작위 샘플링, 또는 스태프/토큰이 X-Profile 헤더를 보낸 요청
+# - PROFILING_MODE: "sample"(스택 샘플링, 저부하 → collapsed stacks) / "cprofile"(pstats)
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", default=False)
+PROFILING_SAMPLE_RATE = env.float("PROFILING_SAMPLE_RATE", default=0.0)
+PROFILING_MODE = env("PROFILING_MODE", default="sample")
+PROFILING_INTERVAL_MS = env.float("PROFILING_INTERVAL_MS", default=5.0)
+PROFILING_DIR = env("PROFILING_DIR", default=str(BASE_DIR / "profiles"))
+PROFILING_TOKEN = env("PROFILING_TOKEN", default="")
+
+# 응답 압축 (main.middleware.CompressionMiddleware, brotli 패키지가 있으면 br 우선)
+COMPRESSION_ENABLED = env.bool("COMPRESSION_ENABLED", default=True)
+COMPRESSION_MIN_BYTES = env.int("COMPRESSION_MIN_BYTES", default=512)       # 이보다 작은 본문은 그대로
+COMPRESSION_GZIP_LEVEL = env.int("COMPRESSION_GZIP_LEVEL", default=6)
+COMPRESSION_BROTLI_QUALITY = env.int("COMPRESSION_BROTLI_QUALITY", default=5)
+COMPRESSION_CACHE_TTL = env.int("COMPRESSION_CACHE_TTL", default=300)       # 압축 결과 캐시 (CACHES["compression"], 0이면 끔)
+
 # DRF
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWTAuthentication + 짧은 TTL 사용자 캐시 (AUTH_USER_CACHE_TTL)
+        "accounts.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
+    # orjson 기반 JSON 렌더러/파서 (출력 바이트는 DRF JSONRenderer와 동일)
+    "DEFAULT_RENDERER_CLASSES": (
+        "main.utils.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "main.utils.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
 }
 
+AUTH_USER_CACHE_TTL = env.int("AUTH_USER_CACHE_TTL", default=60)  # 초
+
+# 로그아웃 토큰 폐기 목록 (accounts.revocation: DB denylist + 워커별 Bloom 필터)
+REVOCATION_REFRESH_SECONDS = env.int("REVOCATION_REFRESH_SECONDS", default=10)   # 증분 로딩 주기 (다른 워커의 폐기 반영 지연)
+REVOCATION_REBUILD_SECONDS = env.int("REVOCATION_REBUILD_SECONDS", default=600)  # 전체 재구성 주기 (만료 jti 제거)
+REVOCATION_BLOOM_FP_RATE = env.float("REVOCATION_BLOOM_FP_RATE", default=0.001)   # 오탐 시에만 DB 확인
+REVOCATION_BLOOM_MIN_CAPACITY = env.int("REVOCATION_BLOOM_MIN_CAPACITY", default=10_000)
+
 SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "ACCESS_TOKEN_LIFETIME": timedelta(days=30),  # 연장
@@ -0,0 +1,29 @@
+"""
+pytest-django용 설정 (pytest.ini의 DJANGO_SETTINGS_MODULE)
+- 기본 settings를 그대로 쓰고, 필수 환경변수 기본값과 테스트 속도용 설정만 덮어씀
+"""
+import os
+import tempfile
+
+# settings.py가 필수로 읽는 환경변수 (실제 값이 있으면 그대로 사용)
+os.environ.setdefault("SECRET_KEY", "test-secret-key-not-for-production-use-0123456789")
+os.environ.setdefault("GOOGLE_API_KEY", "test-google-api-key")
+
+from .settings import *  # noqa: E402,F401,F403
+
+# 시드 유저 수백 명 생성/로그인 속도용 (운영 해셔와 무관)
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "compression": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "compression"},
+}
+
+# 업로드 테스트가 작업 트리에 파일을 남기지 않도록
+MEDIA_ROOT = tempfile.mkdtemp(prefix="challink_test_media_")
+AIAUTH_UPLOAD_STAGING_DIR = tempfile.mkdtemp(prefix="challink_test_staging_")
+
+# 쿼리 예산 테스트 중 느린 요청 경고 로그 끄기 (계측 자체는 유지)
+SLOW_REQUEST_QUERY_THRESHOLD = 10 ** 6
+SLOW_REQUEST_DUPLICATE_THRESHOLD = 10 ** 6
+SLOW_REQUEST_MS_THRESHOLD = 10 ** 6
@@ -15,17 +15,21 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
+from challenges.views import MediaView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("accounts.urls")),
     path("challenges/", include("challenges.urls")),
     path("aiauth/", include("aiauthentications.urls")),
     path("challenges/", include("settlements.urls")),
+    path("metrics/", include("main.urls")),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)    
\ No newline at end of file
+# 미디어: 권한 확인 후 프록시 핸드오프(X-Accel-Redirect/X-Sendfile) 또는 직접 전송 (DEBUG 여부와 무관)
+urlpatterns += [
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:name>", MediaView.as_view()),
+]    
\ No newline at end of file
@@ -3,6 +3,7 @@ from typing import List, Tuple
 from dataclasses import dataclass
 from datetime import date, timedelta, datetime
 
+from django.db.models import Count
 from django.utils import timezone
 from challenges.models import Challenge, ChallengeMember, CompleteImage
 
@@ -52,21 +53,23 @@ def _required_days(ch: Challenge, *, weekly_bucket: bool = True) -> int:
 
     return weeks * 7
 
-def _count_success_days(cm: ChallengeMember, start, end) -> int:
-    qs = (CompleteImage.objects
-        .filter(challenge_member=cm, status="approved")
-        .values("date")
-        .distinct())
+def _success_days_by_member(ch: Challenge, start, end) -> dict:
+    """참가자별 승인된 인증 일수 {challenge_member_id: days} (GROUP BY 쿼리 1번)"""
+    qs = CompleteImage.objects.filter(challenge_id=ch.id, status="approved")
     if start: qs = qs.filter(date__gte=start)
     if end:   qs = qs.filter(date__lte=end)
-    return qs.count()
+    rows = (qs.order_by()
+            .values("challenge_member_id")
+            .annotate(days=Count("date", distinct=True)))
+    return {r["challenge_member_id"]: r["days"] for r in rows}
 
 def collect_progress(ch: Challenge) -> List[MemberProgress]:
     req = _required_days(ch, weekly_bucket=True)
     members = (ChallengeMember.objects.select_related("user").filter(challenge=ch))
+    days = _success_days_by_member(ch, ch.start_date, ch.end_date)
     res: List[MemberProgress] = []
     for cm in members:
-        sd = _count_success_days(cm, ch.start_date, ch.end_date)
+        sd = days.get(cm.id, 0)
         res.append(MemberProgress(cm=cm, success_days=sd, required_days=req, is_success=(sd >= req)))
     return res
 
@@ -124,15 +124,19 @@ def run_settlement(ch: Challenge) -> Settlement:
         rewards, meta = _distribute_method_4(ch, progress)
 
     existed = {d.challenge_member_id: d for d in SettlementDetail.objects.filter(settlement=st)}
+    to_create, to_update = [], []
     for p in progress:
         rp = int(rewards.get(p.cm.id, 0))
         d = existed.get(p.cm.id)
         if d:
             if d.reward_point != rp:
                 d.reward_point = rp
-                d.save(update_fields=["reward_point"])
+                to_update.append(d)
         else:
-            SettlementDetail.objects.create(settlement=st, challenge_member=p.cm, reward_point=rp)
+            to_create.append(SettlementDetail(settlement=st, challenge_member=p.cm, reward_point=rp))
+    # 참가자 수만큼 INSERT/UPDATE 하지 않도록 한 번에 반영
+    SettlementDetail.objects.bulk_create(to_create, batch_size=500)
+    SettlementDetail.objects.bulk_update(to_update, ["reward_point"], batch_size=500)
 
     st.total_pool_point = _pot_total(ch)
     st.status = Settlement.Status.READY
@@ -1,3 +1,54 @@
-from django.test import TestCase
+import pytest
 
-# Create your tests here.
+from challenges.models import Challenge
+from settlements.services import run_settlement
+
+
+# ─────────────────────────────────────────────────────────────────
+# 엔드포인트별 쿼리 예산 (pytest, 시드: conftest.py)
+# ─────────────────────────────────────────────────────────────────
+@pytest.mark.django_db
+def test_budget_reward_status_first_run(seed, api, query_budget):
+    # 종료 다음날이 지난 챌린지 첫 조회 → 정산 계산까지 포함
+    client = api(seed.owner_id)
+    with query_budget("GET /challenges/{id}/rewards/ (settle on read)", 18):
+        res = client.get(f"/challenges/{seed.ended_challenge_id}/rewards/")
+    assert res.status_code == 200
+    assert len(res.json()["allocations"]) == len(seed.member_ids)
+
+
+@pytest.mark.django_db
+def test_budget_reward_status_ready(seed, api, query_budget):
+    run_settlement(Challenge.objects.get(pk=seed.ended_challenge_id))
+    client = api(seed.owner_id)
+    with query_budget("GET /challenges/{id}/rewards/ (ready)", 7):
+        res = client.get(f"/challenges/{seed.ended_challenge_id}/rewards/")
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_budget_reward_status_scheduled(seed, api, query_budget):
+    client = api(seed.owner_id)
+    with query_budget("GET /challenges/{id}/rewards/ (scheduled)", 3):
+        res = client.get(f"/challenges/{seed.challenge_id}/rewards/")
+    assert res.status_code == 200
+    assert res.json()["status"] == "scheduled"
+
+
+@pytest.mark.django_db
+def test_budget_reward_claim(seed, api, query_budget):
+    run_settlement(Challenge.objects.get(pk=seed.ended_challenge_id))
+    client = api(seed.member_ids[1])
+    # 인증 캐시가 비어 있는 첫 요청 기준 (+1: 잔액 변경 전 select_fresh_user 행 잠금)
+    with query_budget("POST /challenges/{id}/rewards/claim/", 9):
+        res = client.post(f"/challenges/{seed.ended_challenge_id}/rewards/claim/")
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_budget_wallet_charge(seed, api, query_budget):
+    client = api(seed.owner_id)
+    # 인증 캐시가 비어 있는 첫 요청 기준 (+1: 잔액 변경 전 select_fresh_user 행 잠금)
+    with query_budget("POST /challenges/wallet/charge/", 6):
+        res = client.post("/challenges/wallet/charge/", {"amount": 5000}, format="json")
+    assert res.status_code == 201
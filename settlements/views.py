@@ -11,7 +11,9 @@ from rest_framework import serializers
 from rest_framework import status, permissions
 
 from challenges.models import Challenge, ChallengeMember
+from main.utils.db_router import replica_reads
 from accounts.models import PointHistory
+from accounts.selectors import select_fresh_user
 
 from .models import Settlement, SettlementDetail
 from .selectors import get_or_create_settlement, collect_progress, _required_days
@@ -20,6 +22,8 @@ from .services import run_settlement
 class RewardStatusView(APIView):
     permission_classes = [IsAuthenticated]
 
+    # 정산이 필요하면 run_settlement(atomic) 안의 읽기/쓰기는 primary, 이후 읽기도 primary
+    @replica_reads()
     def get(self, request, challenge_id: int):
         ch, st, st_status, sched = get_or_create_settlement(challenge_id)
         if not ch:
@@ -42,10 +46,11 @@ class RewardStatusView(APIView):
                 .select_related("challenge_member__user")
                 .filter(settlement=st))
 
+        progress_by_cm = {p.cm.id: p for p in progress}
         allocations, me_reward, claimed_at = [], 0, None
         for d in details:
             cm = d.challenge_member
-            pg = next((p for p in progress if p.cm.id == cm.id), None)
+            pg = progress_by_cm.get(cm.id)
             sd = pg.success_days if pg else 0
             is_success = pg.is_success if pg else False
             allocations.append({
@@ -104,6 +109,8 @@ class RewardClaimView(APIView):
 
         detail = (SettlementDetail.objects.select_for_update()
                 .filter(settlement=st, challenge_member=cm).first())
+        # request.user는 인증 캐시일 수 있으므로 잔액 변경은 잠근 최신 행으로
+        user = select_fresh_user(request.user, for_update=True)
         if not detail:
             return Response({"error": "NOT_ASSIGNED", "message": "분배 대상이 아닙니다."}, status=400)
         if detail.claimed_at:
@@ -118,12 +125,12 @@ class RewardClaimView(APIView):
                 "settlement_method": int(ch.settle_method),
                 "credited_points": 0,
                 "claimed_at": detail.claimed_at,
-                "wallet_after": request.user.point_balance,
+                "wallet_after": user.point_balance,
                 "message": "수령할 보상이 없습니다."
             }, status=200)
 
         # 지갑에 적립 (PointHistory 생성)
-        ph = request.user.apply_points(
+        ph = user.apply_points(
             delta=credited,
             description=f"[정산] {ch.title}",
             challenge=ch,
@@ -142,7 +149,7 @@ class RewardClaimView(APIView):
             "settlement_method": int(ch.settle_method),
             "credited_points": credited,
             "claimed_at": detail.claimed_at,
-            "wallet_after": request.user.point_balance,
+            "wallet_after": user.point_balance,
             "message": "정산 보상이 지갑에 적립되었습니다."
         }, status=200)
 
@@ -177,9 +184,9 @@ class WalletChargeView(APIView):
         if amount <= 0:
             raise ValidationError({"amount": "0보다 큰 값만 허용됩니다."})
 
-        user = request.user
-
         with transaction.atomic():
+            # request.user는 인증 캐시일 수 있으므로 잠근 최신 행에 적립
+            user = select_fresh_user(request.user, for_update=True)
             history = user.apply_points(
                 delta=amount,
                 description=description,